@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Time to wrap model objects that are already built.
+
+    python benchmarks/bench_adopt.py [entries ...]
+
+"entries" builds a HarEntry from every entry of a log, "log" a HarLog from
+the log, "file" a HarFile from the log, and "to_har" is the export of a
+session that recorded the entries.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import sys
+import time
+from harlib.objects import HarEntry, HarFile, HarLog
+from harlib.sessions import HarSessionMixin
+from synthetic import make_har
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def copy_entries(log):
+    return [HarEntry(entry) for entry in log.entries]
+
+
+def main(sizes):
+    print('%10s %10s %10s %10s %10s' % ('entries', 'entries s', 'log s',
+                                        'file s', 'to_har s'))
+    for n in sizes:
+        log = HarLog(make_har(n, body_size=32)['log'])
+        session = HarSessionMixin('/dev/null')
+        session._entries = list(log.entries)
+        print('%10d %10.3f %10.3f %10.3f %10.3f' % (
+            n, timed(copy_entries, log), timed(HarLog, log),
+            timed(HarFile, log), timed(session.to_har)))
+        del log, session
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Metadata-only analysis of a capture with large bodies, with the bodies in
+the HAR file and out of line in a pack of blobs.
+
+    python benchmarks/bench_blobs.py [entries ...]
+
+One entry in 20 has a distinct 512 KB body, as downloads or base64 images.
+"file MB" is the size of the HAR file, "load s" the time to load it lazily
+and compute its waterfall, "MB" the memory then held (tracemalloc, PY3),
+and "text s" the time to then read one large body.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import harlib.api
+from synthetic import make_har
+
+LARGE_EVERY = 20
+LARGE_SIZE = 512 * 1024
+
+
+def analyze(path):
+    har = harlib.api.load(path, lazy=True)
+    har.log.waterfall()
+    return har
+
+
+def main(sizes):
+    print('%10s %8s %10s %10s %10s %10s' % (
+        'entries', 'mode', 'file MB', 'load s', 'MB', 'text s'))
+    tmp = tempfile.mkdtemp()
+    try:
+        for n in sizes:
+            har = make_har(n, body_size=64)
+            for i, entry in enumerate(har['log']['entries']):
+                if not i % LARGE_EVERY:
+                    content = entry['response']['content']
+                    content['text'] = ('%06d' % i) * (LARGE_SIZE // 6)
+                    content['size'] = LARGE_SIZE
+            har = harlib.api.loadd(har, lazy=True)
+            for mode, blobs in (('inline', None), ('blobs', True)):
+                path = os.path.join(tmp, '%s.har' % mode)
+                harlib.api.dump(har, path, blobs=blobs)
+
+                gc.collect()
+                tracemalloc.start()
+                start = time.time()
+                loaded = analyze(path)
+                loading = time.time() - start
+                gc.collect()
+                size = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+
+                start = time.time()
+                loaded.log.entries[LARGE_EVERY].response.content.text
+                reading = time.time() - start
+                print('%10d %8s %10.1f %10.3f %10.1f %10.4f' % (
+                    n, mode, os.path.getsize(path) / 1e6, loading,
+                    size / 1e6, reading))
+                del loaded
+            del har
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000])
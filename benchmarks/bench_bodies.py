@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Memory and file size of logs whose bodies repeat, as in API crawls, with
+tracemalloc (PY3).
+
+    python benchmarks/bench_bodies.py [entries ...]
+
+Every entry has one of 50 distinct 8 KB bodies. "plain" loads the HAR
+text as is, "shared" with a BodyStore, "compact" loads the compact
+variant. "MB" is the memory of the loaded log, "file MB" the size of the
+HAR or compact text, and "s" the time to load it.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import gc
+import io
+import json
+import sys
+import time
+import tracemalloc
+import harlib.api
+from harlib.bodies import BodyStore, dumps_compact
+from synthetic import make_har
+
+DISTINCT = 50
+BODY_SIZE = 8192
+
+
+def measure(func, *args, **kwargs):
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    began = time.time()
+    result = func(*args, **kwargs)
+    elapsed = time.time() - began
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return size, elapsed, result
+
+
+def loads_compact(s, **kwargs):
+    return harlib.api.load_compact(io.StringIO(s), **kwargs)
+
+
+def main(sizes):
+    print('%10s %8s %10s %10s %10s' % (
+        'entries', 'mode', 'MB', 'file MB', 's'))
+    for n in sizes:
+        har = make_har(n, body_size=0)
+        for i, entry in enumerate(har['log']['entries']):
+            content = entry['response']['content']
+            content['text'] = ('%02d' % (i % DISTINCT)) * (BODY_SIZE // 2)
+            content['size'] = BODY_SIZE
+        text = json.dumps(har)
+        del har
+        compact = dumps_compact(harlib.api.loads(text, lazy=True))
+        for mode, s, load, kwargs in (
+                ('plain', text, harlib.api.loads, {}),
+                ('shared', text, harlib.api.loads, {'bodies': BodyStore()}),
+                ('compact', compact, loads_compact, {})):
+            size, elapsed, log = measure(load, s, lazy=True, **kwargs)
+            print('%10d %8s %10.1f %10.1f %10.3f' % (
+                n, mode, size / 1e6, len(s) / 1e6, elapsed))
+            del log
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000])
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Per-entry cost of decoding requests responses, without a network.
+
+    python benchmarks/bench_codecs.py [entries]
+
+"decode" builds a HarEntry from each response, "dispatch" only looks up
+the codec methods such a decode goes through.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import datetime
+import io
+import sys
+import time
+import requests
+import urllib3
+import harlib
+import harlib.codecs
+
+
+def make_response(i):
+    req = requests.Request(
+        'GET', 'http://example.com/items/%d?page=%d' % (i, i % 7),
+        headers={'Accept': '*/*', 'Cookie': 'session=abc'}).prepare()
+    raw = urllib3.HTTPResponse(
+        body=io.BytesIO(b'{"ok": true}'), status=200,
+        headers={'Content-Type': 'application/json',
+                 'Content-Length': '12'},
+        preload_content=False)
+    resp = requests.adapters.HTTPAdapter().build_response(req, raw)
+    resp.elapsed = datetime.timedelta(milliseconds=12)
+    resp.content
+    return resp
+
+
+def dispatch(responses):
+    for resp in responses:
+        for raw in (resp, resp.request, resp.raw):
+            for har_class in (harlib.HarEntry, harlib.HarRequest,
+                              harlib.HarResponse):
+                harlib.codecs.find_decoder(raw.__class__, har_class)
+
+
+def main(n):
+    responses = [make_response(i) for i in range(n)]
+    for name, func in (('decode', lambda: [harlib.HarEntry(resp)
+                                           for resp in responses]),
+                       ('dispatch', lambda: dispatch(responses))):
+        start = time.time()
+        func()
+        print('%10s %10.1f us/entry' % (
+            name, (time.time() - start) * 1e6 / n))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if sys.argv[1:] else 10000)
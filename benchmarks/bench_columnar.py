@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Time to compute summary statistics of a log, from objects and columns.
+
+    python benchmarks/bench_columnar.py [entries ...]
+
+"objects" is the median time and total response size per host, read
+entry by entry from a built log, "build" the conversion of the same log to
+columns and "columns" the same statistics from the columns.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import sys
+import time
+from harlib.objects import HarLog
+from synthetic import make_har
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2] if values else float('nan')
+
+
+def from_objects(log):
+    times = {}
+    sizes = {}
+    for entry in log.entries:
+        host = entry.request.url.split('/')[2]
+        times.setdefault(host, []).append(entry.time)
+        sizes[host] = sizes.get(host, 0) + entry.response.bodySize
+    return dict((host, median(values)) for host, values in times.items()), \
+        sizes
+
+
+def from_columns(columns):
+    return (columns.aggregate('host', 'time', median),
+            columns.aggregate('host', 'responseBodySize', sum))
+
+
+def main(sizes):
+    print('%10s %10s %10s %10s' % ('entries', 'objects s', 'build s',
+                                   'columns s'))
+    for n in sizes:
+        log = HarLog(make_har(n, body_size=32)['log'])
+        objects = timed(from_objects, log)
+        start = time.time()
+        columns = log.to_columns()
+        build = time.time() - start
+        print('%10d %10.3f %10.3f %10.3f' % (
+            n, objects, build, timed(from_columns, columns)))
+        del log, columns
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Memory of a capture session as entries are kept, with and without a
+flush policy.
+
+    python benchmarks/bench_flush.py [entries ...]
+
+Every entry has a 16 KB body. "peak MB" is the most memory held by the
+session while keeping the entries and dumping them (tracemalloc, PY3),
+"s" the time this takes, and "file MB" the size of the HAR file written.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from harlib.sessions import HarSessionMixin
+from synthetic import make_entry
+
+BODY_SIZE = 16 * 1024
+POLICIES = (('none', {}),
+            ('entries', {'flush_entries': 100}),
+            ('bytes', {'flush_bytes': 1 << 20}))
+
+
+def capture(path, n, policy):
+    session = HarSessionMixin(path)
+    session.with_content = True
+    for name, value in policy.items():
+        setattr(session, name, value)
+    rng = random.Random(0)
+    for i in range(n):
+        # as requests are captured, one entry each
+        session._keep_entries({'entries': [make_entry(i, BODY_SIZE, rng)]})
+    session.dump(cache=False)
+
+
+def main(sizes):
+    print('%10s %8s %10s %10s %10s' % (
+        'entries', 'policy', 'peak MB', 's', 'file MB'))
+    tmp = tempfile.mkdtemp()
+    try:
+        for n in sizes:
+            for name, policy in POLICIES:
+                path = os.path.join(tmp, '%s.har' % name)
+                gc.collect()
+                tracemalloc.start()
+                start = time.time()
+                capture(path, n, policy)
+                elapsed = time.time() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print('%10d %8s %10.1f %10.3f %10.1f' % (
+                    n, name, peak / 1e6, elapsed,
+                    os.path.getsize(path) / 1e6))
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000])
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Time to dump a session again after a few new entries.
+
+    python benchmarks/bench_fragments.py [entries ...]
+
+"first" is the first dump of a session, "again" a dump after 10 entries
+were added, and "edited" one after a header of every 100th entry was
+changed.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import sys
+import time
+from harlib.objects import HarLog
+from harlib.sessions import HarSessionMixin
+from synthetic import make_har
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def main(sizes):
+    print('%10s %10s %10s %10s' % ('entries', 'first s', 'again s',
+                                   'edited s'))
+    for n in sizes:
+        entries = HarLog(make_har(n + 10, body_size=32)['log']).entries
+        session = HarSessionMixin('/dev/null')
+        session._entries = list(entries[:n])
+        first = timed(session.dumps)
+        session._entries.extend(entries[n:])
+        again = timed(session.dumps)
+        for entry in session._entries[::100]:
+            entry.response.headers[0].value = 'edited'
+        edited = timed(session.dumps)
+        print('%10d %10.3f %10.3f %10.3f' % (n, first, again, edited))
+        del entries, session
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Import time of harlib modules in fresh interpreters (PY3.7+).
+
+    python benchmarks/bench_import.py [module ...]
+
+For each module, prints the median cumulative import time of a few runs
+and the slowest modules it imports, from python -X importtime. Then the
+median wall time of whole interpreter runs, with and without resolving
+harlib.__version__ (from the metadata of an installed harlib, or else the
+git checkout).
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import subprocess
+import sys
+import time
+
+RUNS = 7
+TOP = 8
+
+
+STARTUP = [
+    'pass',
+    'import harlib',
+    'import harlib; harlib.__version__',
+]
+
+
+def environ():
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(
+        [root] + [path for path in [env.get('PYTHONPATH')] if path])
+    return env
+
+
+def startup_time(statement):
+    times = []
+    for _ in range(RUNS):
+        start = time.time()
+        subprocess.check_call([sys.executable, '-c', statement],
+                              env=environ())
+        times.append(time.time() - start)
+    return sorted(times)[len(times) // 2]
+
+
+def import_times(module):
+    err = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', 'import %s' % module],
+        stderr=subprocess.PIPE, env=environ()).communicate()[1]
+    times = {}
+    for line in err.decode('utf-8', 'replace').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(modules):
+    for module in modules:
+        runs = sorted((import_times(module) for _ in range(RUNS)),
+                      key=lambda times: times.get(module, 0))
+        times = runs[len(runs) // 2]
+        print('%-20s %8.1f ms' % (module, times.get(module, 0) / 1000.0))
+        others = sorted((t, name) for name, t in times.items()
+                        if name != module and '.' not in name)
+        for t, name in reversed(others[-TOP:]):
+            print('    %-16s %8.1f ms' % (name, t / 1000.0))
+    print()
+    for statement in STARTUP:
+        print('%-36s %8.1f ms' % (statement, startup_time(statement) * 1e3))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or ['harlib', 'harlib.api'])
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Time of lookups of the entries of a page, and of a time window, in a
+lazy log.
+
+    python benchmarks/bench_indexes.py [entries ...]
+
+"scan" is the time of 10000 lookups by pageref as linear scans over the
+entry dicts, extrapolated from 20 of them, "build" the time to build the
+indexes on pageref and startedDateTime, "index" the time of 10000 lookups
+by pageref and 10000 of 10 ms windows with them, and "append" the time to
+append 1000 entries, each followed by one lookup in both indexes.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import random
+import sys
+import time
+from harlib.objects import HarEntry, HarLog
+from harlib.utils import parse_iso_datetime_ns
+from synthetic import make_har
+
+LOOKUPS = 10000
+SCANS = 20
+
+
+def scan(log, pageref):
+    entries = log.entries
+    return [pos for pos in range(len(entries))
+            if entries.raw(pos).get('pageref') == pageref]
+
+
+def main(sizes):
+    print('%10s %10s %10s %10s %10s' % ('entries', 'scan s', 'build s',
+                                        'index s', 'append s'))
+    for n in sizes:
+        har = make_har(n, body_size=0)
+        log = HarLog(har['log'], lazy=True)
+        pages = [page['id'] for page in har['log']['pages']]
+        rng = random.Random(n)
+        queries = [rng.choice(pages) for _ in range(LOOKUPS)]
+        started = [e['startedDateTime'] for e in har['log']['entries']]
+        windows = [rng.choice(started) for _ in range(LOOKUPS)]
+
+        start = time.time()
+        for pageref in queries[:SCANS]:
+            scan(log, pageref)
+        scanned = (time.time() - start) * LOOKUPS / SCANS
+
+        start = time.time()
+        by_page = log.index('pageref')
+        by_time = log.range_index('startedDateTime')
+        by_page.update()
+        by_time.update()
+        build = time.time() - start
+
+        start = time.time()
+        for pageref in queries:
+            by_page.positions(pageref)
+        for low in windows:
+            low = parse_iso_datetime_ns(low)
+            by_time.between(low, low + 10000000)
+        indexed = time.time() - start
+
+        entry = har['log']['entries'][-1]
+        start = time.time()
+        for _ in range(1000):
+            log.entries.append(HarEntry(entry))
+            by_page.positions(queries[0])
+            by_time.between(windows[0], windows[0])
+        appended = time.time() - start
+
+        print('%10d %10.3f %10.3f %10.3f %10.3f' % (
+            n, scanned, build, indexed, appended))
+        del har, log
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Load and dump times of each installed harlib.jsonlib backend.
+
+    python benchmarks/bench_json.py [entries ...]
+
+Dump times count the stdlib fallback, and every dump is checked against
+json.dumps for byte identity.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import json
+import sys
+import time
+from harlib import jsonlib
+from synthetic import make_har
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    result = func(*args, **kwargs)
+    return time.time() - start, result
+
+
+def main(sizes):
+    backends = jsonlib.available_backends()
+    print('%10s %10s %10s %10s %10s' % (
+        'entries', 'backend', 'loads s', 'dumps s', 'identical'))
+    for n in sizes:
+        har = make_har(n, body_size=32)
+        for kwargs in ({'indent': 2}, {'separators': (',', ':')}):
+            expected = json.dumps(har, **kwargs)
+            for name, backend in backends.items():
+                load_time, _ = timed(backend.loads, expected)
+                dump_time, s = timed(backend.dumps, har, **kwargs)
+                if s is None:
+                    dump_time, s = timed(json.dumps, har, **kwargs)
+                print('%10d %10s %10.3f %10.3f %10s' % (
+                    n, name, load_time, dump_time, s == expected))
+            del expected
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 100000, 1000000])
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Scaling of harlib.api.load_many with the number of worker processes.
+
+    python benchmarks/bench_load_many.py [files [entries per file]]
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from multiprocessing import cpu_count
+import os
+import shutil
+import sys
+import tempfile
+import time
+import harlib.api
+from synthetic import write_har
+
+
+def main(files=64, entries=2000):
+    tmpdir = tempfile.mkdtemp()
+    try:
+        paths = []
+        for i in range(files):
+            path = os.path.join(tmpdir, '%d.har' % i)
+            write_har(path, entries, seed=i)
+            paths.append(path)
+        print('%10s %10s %10s' % ('workers', 'load s', 'speedup'))
+        base = None
+        workers = 1
+        while workers <= cpu_count():
+            start = time.time()
+            # the files were just written here, as trusted callers do
+            harlib.api.load_many(paths, workers=workers, trusted=True)
+            elapsed = time.time() - start
+            base = base or elapsed
+            print('%10d %10.3f %10.2f' % (workers, elapsed, base / elapsed))
+            workers *= 2
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
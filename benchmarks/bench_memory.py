@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Memory footprint of the model objects, measured with tracemalloc (PY3).
+
+    python benchmarks/bench_memory.py [entries]
+
+"pairs" compares the compact name/value classes with HarObject classes of
+the same declarations, for the headers, cookies and query parameters of
+every entry; the compact headers and cookies also share their name (and
+common value) strings. "log" is the footprint per entry of a whole HarLog.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import gc
+import json
+import sys
+import tracemalloc
+from harlib.objects import (
+    HarCookie, HarHeader, HarLog, HarObject, HarQueryStringParam)
+from synthetic import make_har
+
+
+class DictHeader(HarObject):
+    _required = HarHeader._required
+    _optional = HarHeader._optional
+
+
+class DictCookie(HarObject):
+    _required = HarCookie._required
+    _optional = HarCookie._optional
+    _ordered = HarCookie._ordered
+
+
+class DictQueryStringParam(HarObject):
+    _required = HarQueryStringParam._required
+    _optional = HarQueryStringParam._optional
+
+
+def measure(func, *args):
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = func(*args)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return size, result
+
+
+def build_pairs(entries, header_class, cookie_class, param_class):
+    objects = []
+    for entry in entries:
+        for message in (entry['request'], entry['response']):
+            objects.extend(header_class(dict(h)) for h in message['headers'])
+            objects.extend(cookie_class(dict(c)) for c in message['cookies'])
+        objects.extend(param_class(dict(q))
+                       for q in entry['request']['queryString'])
+    return objects
+
+
+def main(n):
+    entries = json.loads(json.dumps(make_har(n, body_size=32)))
+    entries = entries['log']['entries']
+    print('%10s %12s %14s' % ('what', 'bytes/entry', 'objects'))
+    for name, classes in (
+            ('pairs dict', (DictHeader, DictCookie, DictQueryStringParam)),
+            ('pairs slot', (HarHeader, HarCookie, HarQueryStringParam))):
+        size, objects = measure(build_pairs, entries, *classes)
+        print('%10s %12.0f %14d' % (name, size / float(n), len(objects)))
+        del objects
+    size, log = measure(HarLog, {'entries': entries})
+    print('%10s %12.0f %14d' % ('log', size / float(n), len(log.entries)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if sys.argv[1:] else 100000)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Serialization time of a fully built log.
+
+    python benchmarks/bench_serialize.py [entries ...]
+
+"items" orders the fields of every entry, request and response, "to_json"
+converts the whole log to dicts and "dumps" to a JSON string.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import sys
+import time
+from harlib.objects import HarLog
+from synthetic import make_har
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    func(*args, **kwargs)
+    return time.time() - start
+
+
+def order_items(log):
+    for entry in log.entries:
+        entry.items()
+        entry.request.items()
+        entry.response.items()
+
+
+def main(sizes):
+    print('%10s %10s %10s %10s' % ('entries', 'items s', 'to_json s',
+                                   'dumps s'))
+    for n in sizes:
+        log = HarLog(make_har(n, body_size=32)['log'])
+        print('%10d %10.3f %10.3f %10.3f' % (
+            n, timed(order_items, log), timed(log.to_json),
+            timed(log.dumps)))
+        del log
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Peak RSS of harlib.api.iter_entries versus harlib.api.load as files grow.
+
+    python benchmarks/bench_streaming.py [entries ...]
+
+Each measurement runs in a fresh interpreter, so ru_maxrss is per method.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import os
+import subprocess
+import sys
+import tempfile
+from synthetic import write_har
+
+CHILD = '''
+import resource, sys, harlib.api
+method, path = sys.argv[1:]
+with open(path) as reader:
+    if method == 'load':
+        count = len(harlib.api.load(reader).log.entries)
+    else:
+        count = sum(1 for _ in harlib.api.iter_entries(reader))
+print(count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def peak_rss(method, path):
+    out = subprocess.check_output(
+        [sys.executable, '-c', CHILD, method, path],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    count, rss = out.split()
+    return int(count), int(rss)
+
+
+def main(sizes):
+    print('%10s %10s %14s %14s' % ('entries', 'file MB', 'load KB', 'iter KB'))
+    tmpdir = tempfile.mkdtemp()
+    for n in sizes:
+        path = write_har(os.path.join(tmpdir, '%d.har' % n), n)
+        size = os.path.getsize(path) / 1e6
+        _, load_rss = peak_rss('load', path)
+        _, iter_rss = peak_rss('iter', path)
+        print('%10d %10.1f %14d %14d' % (n, size, load_rss, iter_rss))
+        os.remove(path)
+    os.rmdir(tmpdir)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
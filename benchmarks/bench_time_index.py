@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Time of queries of 5 second windows of startedDateTime in a lazy log.
+
+    python benchmarks/bench_time_index.py [entries ...]
+
+"scan" is the time of 1000 windows found by parsing every startedDateTime
+for each, extrapolated from 5 of them, "build" the time to build the
+time index, "index" the time of the 1000 windows and of 1000 nearest
+queries with it, and "append" the time to update the index after each
+of 10000 entries appended in time order.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import random
+import sys
+import time
+from harlib.objects import HarLog
+from harlib.utils import parse_iso_datetime_ns
+from synthetic import make_entry, make_har
+
+QUERIES = 1000
+SCANS = 5
+WINDOW = 5 * 10 ** 9
+
+
+def scan(log, low, high):
+    entries = log.entries
+    found = []
+    for pos in range(len(entries)):
+        ns = parse_iso_datetime_ns(entries.raw(pos)['startedDateTime'])
+        if low <= ns <= high:
+            found.append(pos)
+    return found
+
+
+def main(sizes):
+    print('%10s %10s %10s %10s %10s' % ('entries', 'scan s', 'build s',
+                                        'index s', 'append s'))
+    for n in sizes:
+        har = make_har(n, body_size=0)
+        log = HarLog(har['log'], lazy=True)
+        rng = random.Random(n)
+        lows = [parse_iso_datetime_ns(rng.choice(
+            har['log']['entries'])['startedDateTime'])
+            for _ in range(QUERIES)]
+
+        start = time.time()
+        for low in lows[:SCANS]:
+            scan(log, low, low + WINDOW)
+        scanned = (time.time() - start) * QUERIES / SCANS
+
+        start = time.time()
+        index = log.time_index()
+        index.update()
+        build = time.time() - start
+
+        start = time.time()
+        for low in lows:
+            index.between(low, low + WINDOW)
+            index.nearest(low + 1)
+        indexed = time.time() - start
+
+        appended = 0.0
+        for i in range(n, n + 10000):
+            log.entries.append(make_entry(i, 0, rng))
+            start = time.time()
+            index.update()
+            appended += time.time() - start
+
+        print('%10d %10.3f %10.3f %10.3f %10.3f' % (
+            n, scanned, build, indexed, appended))
+        del har, log
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000])
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Construction time of validated versus trusted model objects.
+
+    python benchmarks/bench_trusted.py [entries ...]
+
+Both paths get the same freshly parsed input. "touch" reads one header of
+every entry, and "to_json" converts the whole file back.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import json
+import sys
+import time
+import harlib.api
+from synthetic import make_har
+
+
+def timed(func, *args, **kwargs):
+    start = time.time()
+    result = func(*args, **kwargs)
+    return time.time() - start, result
+
+
+def touch(har):
+    for entry in har.log.entries:
+        entry.request.headers[0].name
+
+
+def main(sizes):
+    print('%10s %10s %10s %10s %10s' % (
+        'entries', 'mode', 'load s', 'touch s', 'to_json s'))
+    for n in sizes:
+        text = json.dumps(make_har(n, body_size=32))
+        for trusted in (False, True):
+            d = json.loads(text)
+            load_time, har = timed(harlib.api.loadd, d, trusted=trusted)
+            touch_time, _ = timed(touch, har)
+            json_time, _ = timed(har.to_json)
+            print('%10d %10s %10.3f %10.3f %10.3f' % (
+                n, 'trusted' if trusted else 'validated',
+                load_time, touch_time, json_time))
+            del d, har
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Time to validate raw HAR dicts with harlib.validate.
+
+    python benchmarks/bench_validate.py [entries ...]
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import sys
+import time
+from harlib.validate import validate
+from synthetic import make_har
+
+
+def main(sizes):
+    print('%10s %10s %10s' % ('entries', 'errors', 'validate s'))
+    for n in sizes:
+        har = make_har(n, body_size=16)
+        start = time.time()
+        errors = validate(har)
+        print('%10d %10d %10.3f' % (n, len(errors), time.time() - start))
+        del har
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 100000, 1000000])
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Time to compute the waterfall of every page of a lazy log.
+
+    python benchmarks/bench_waterfall.py [entries ...]
+
+"scan" joins each page to its entries by scanning the entry dicts, and
+parses the start of the page again for each entry, as a viewer that
+draws one page at a time does, "waterfall" is HarLog.waterfall, and
+"stream" harlib.waterfall.from_file over the log written to a file.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from harlib.objects import HarLog
+from harlib.utils import parse_iso_datetime_us
+from harlib.waterfall import SEQUENTIAL_PHASES, from_file
+from synthetic import make_har
+
+
+def scan(har):
+    pages = []
+    entries = har['log']['entries']
+    for page in har['log']['pages']:
+        rows = []
+        for entry in entries:
+            if entry.get('pageref') != page['id']:
+                continue
+            start = (parse_iso_datetime_us(entry['startedDateTime']) -
+                     parse_iso_datetime_us(page['startedDateTime'])) / 1000.0
+            segments = []
+            end = start
+            for phase in SEQUENTIAL_PHASES:
+                duration = entry['timings'].get(phase, -1)
+                if duration >= 0:
+                    segments.append([phase, end, end + duration])
+                    end += duration
+            rows.append({'start': start, 'end': end, 'segments': segments})
+        pages.append(rows)
+    return pages
+
+
+def main(sizes):
+    print('%10s %10s %12s %10s' % ('entries', 'scan s', 'waterfall s',
+                                   'stream s'))
+    tmp = tempfile.mkdtemp()
+    try:
+        for n in sizes:
+            har = make_har(n, body_size=0)
+            path = os.path.join(tmp, 'bench.har')
+            with open(path, 'w') as writer:
+                json.dump(har, writer)
+
+            start = time.time()
+            scan(har)
+            scanned = time.time() - start
+
+            log = HarLog(har['log'], lazy=True)
+            start = time.time()
+            log.waterfall()
+            built = time.time() - start
+
+            start = time.time()
+            from_file(path)
+            streamed = time.time() - start
+            print('%10d %10.3f %12.3f %10.3f' % (n, scanned, built, streamed))
+            del har, log
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
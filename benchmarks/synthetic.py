@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+Synthetic HAR documents for the benchmarks in this directory.
+'''
+from __future__ import absolute_import
+import json
+import random
+
+HOSTS = ['api.example.com', 'cdn.example.com', 'www.example.com']
+METHODS = ['GET', 'GET', 'GET', 'POST']
+STATUSES = [200, 200, 200, 204, 304, 404, 500]
+MIME_TYPES = ['application/json', 'text/html', 'text/css',
+              'application/javascript']
+
+
+def make_entry(i, body_size=256, rng=random):
+    host = rng.choice(HOSTS)
+    mime_type = rng.choice(MIME_TYPES)
+    timings = dict(
+        blocked=rng.randint(-1, 5), dns=-1, connect=-1, ssl=-1,
+        send=rng.randint(0, 3), wait=rng.randint(5, 500),
+        receive=rng.randint(0, 50))
+    return {
+        'startedDateTime': '2017-07-28T17:%02d:%02d.%03dZ' % (
+            (i // 60000) % 60, (i // 1000) % 60, i % 1000),
+        'time': float(sum(v for v in timings.values() if v > 0)),
+        'request': {
+            'method': rng.choice(METHODS),
+            'url': 'https://%s/items/%d?page=%d' % (host, i % 997, i % 7),
+            'httpVersion': 'HTTP/1.1',
+            'cookies': [{'name': 'session', 'value': 'abc%d' % (i % 13)}],
+            'headers': [
+                {'name': 'Host', 'value': host},
+                {'name': 'Accept', 'value': '*/*'},
+                {'name': 'User-Agent', 'value': 'harlib-bench/1.0'},
+            ],
+            'queryString': [{'name': 'page', 'value': str(i % 7)}],
+            'headersSize': -1,
+            'bodySize': 0,
+        },
+        'response': {
+            'status': rng.choice(STATUSES),
+            'statusText': 'OK',
+            'httpVersion': 'HTTP/1.1',
+            'cookies': [],
+            'headers': [
+                {'name': 'Content-Type', 'value': mime_type},
+                {'name': 'Content-Length', 'value': str(body_size)},
+                {'name': 'Cache-Control', 'value': 'no-cache'},
+            ],
+            'content': {
+                'size': body_size,
+                'mimeType': mime_type,
+                'text': 'x' * body_size,
+            },
+            'redirectURL': '',
+            'headersSize': -1,
+            'bodySize': body_size,
+        },
+        'cache': {},
+        'timings': timings,
+        'pageref': 'page_%d' % (i // 100),
+    }
+
+
+def make_header(n):
+    return {
+        'version': '1.2',
+        'creator': {'name': 'harlib-bench', 'version': '1.0'},
+        'pages': [{
+            'startedDateTime': '2017-07-28T17:%02d:%02d.%03dZ' % (
+                (i // 60000) % 60, (i // 1000) % 60, i % 1000),
+            'id': 'page_%d' % (i // 100),
+            'title': 'page %d' % (i // 100),
+            'pageTimings': {'onContentLoad': -1, 'onLoad': -1},
+        } for i in range(0, n, 100)],
+    }
+
+
+def make_har(n, body_size=256, seed=0):
+    rng = random.Random(seed)
+    log = make_header(n)
+    log['entries'] = [make_entry(i, body_size, rng) for i in range(n)]
+    return {'log': log}
+
+
+def write_har(path, n, body_size=256, seed=0):
+    '''
+    Writes a synthetic HAR of n entries one entry at a time, so that the
+    generator itself stays small for large n.
+    '''
+    rng = random.Random(seed)
+    with open(path, 'w') as writer:
+        writer.write('{"log": {')
+        for name, value in make_header(n).items():
+            writer.write('%s: %s, ' % (json.dumps(name), json.dumps(value)))
+        writer.write('"entries": [')
+        for i in range(n):
+            if i:
+                writer.write(',\n')
+            writer.write(json.dumps(make_entry(i, body_size, rng)))
+        writer.write(']}}\n')
+    return path
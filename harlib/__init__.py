@@ -12,21 +12,66 @@ harlib - HTTP Archive (HAR) format library
 '''
 from __future__ import absolute_import
 from __future__ import print_function
-from metaobject import parse_commit
+import importlib
 import os.path
 import logging
+import sys
 logger = logging.getLogger(__name__)
 
-__repo_path__ = os.path.realpath(os.path.dirname(os.path.dirname(__file__)))
-__title__ = os.path.basename(__repo_path__)
-(_, _, __version__, __version_tag__) = parse_commit(__repo_path__)
-__homepage_url__ = 'https://github.com/andydude/%s/blob/%s/README.md' % (
-    __title__, __version_tag__)
-__download_url__ = 'https://github.com/andydude/%s/archive/%s.zip' % (
-    __title__, __version_tag__)
+# names resolved by _version_metadata, see __getattr__
+VERSION_NAMES = frozenset([
+    '__repo_path__', '__title__', '__version__', '__version_tag__',
+    '__homepage_url__', '__download_url__'])
+
+
+def _distribution_version():
+    '''
+    Returns the version pbr recorded in the metadata of the installed
+    distribution, or None if harlib is not installed.
+    '''
+    try:
+        from importlib import metadata
+    except ImportError:
+        import pkg_resources
+        try:
+            return pkg_resources.get_distribution('harlib').version
+        except pkg_resources.DistributionNotFound:
+            return None
+    try:
+        return metadata.version('harlib')
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _version_metadata():
+    '''
+    Returns the version names, from the metadata of the installed
+    distribution, or else from the git checkout harlib is in.
+    '''
+    repo_path = os.path.realpath(os.path.dirname(os.path.dirname(__file__)))
+    version = _distribution_version()
+    if version is not None:
+        title, version_tag = 'harlib', version
+    else:
+        from metaobject import parse_commit
+        title = os.path.basename(repo_path)
+        (_, _, version, version_tag) = parse_commit(repo_path)
+    return {
+        '__repo_path__': repo_path,
+        '__title__': title,
+        '__version__': version,
+        '__version_tag__': version_tag,
+        '__homepage_url__':
+            'https://github.com/andydude/%s/blob/%s/README.md' % (
+                title, version_tag),
+        '__download_url__':
+            'https://github.com/andydude/%s/archive/%s.zip' % (
+                title, version_tag),
+    }
+
 
 if __name__ == '__main__':
-    print("version:", __version__)
+    print("version:", _version_metadata()['__version__'])
 
 else:
     # flake9: noqa
@@ -41,18 +86,45 @@ else:
     except ImportError as err:
         pass
 
-    # only import HarSession if requests is installed
-    try:
-        import requests
-        from .sessions import (
-            HarSessionMixin,
-            HarSession)  # noqa: F401
-    except ImportError as err:
-        pass
+    # HarSession needs requests and middleware needs django, so where
+    # modules can have __getattr__ (PY3.7+) they are imported on first use
+    _lazy = {
+        'HarSessionMixin': 'harlib.sessions',
+        'HarSession': 'harlib.sessions',
+        'middleware': 'harlib_viewer.middleware',
+    }
 
-    # only import if django is installed
-    try:
-        import django
-        from harlib_viewer import middleware
-    except ImportError as err:
-        pass
+    if sys.version_info >= (3, 7):
+        def __getattr__(name):
+            if name in VERSION_NAMES:
+                globals().update(_version_metadata())
+                return globals()[name]
+            if name not in _lazy:
+                raise AttributeError('module %s has no attribute %s' % (
+                    __name__, repr(name)))
+            try:
+                module = importlib.import_module(_lazy[name])
+            except ImportError as err:
+                raise AttributeError('%s needs %s' % (name, err))
+            value = getattr(module, name, module)
+            globals()[name] = value
+            return value
+
+    else:
+        globals().update(_version_metadata())
+
+        # only import HarSession if requests is installed
+        try:
+            import requests
+            from .sessions import (
+                HarSessionMixin,
+                HarSession)  # noqa: F401
+        except ImportError as err:
+            pass
+
+        # only import if django is installed
+        try:
+            import django
+            from harlib_viewer import middleware
+        except ImportError as err:
+            pass
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Latency statistics of the entries of a log, grouped by any columns of
+harlib.columnar, such as host, method and status:
+
+    python -m harlib.analysis [--by host,method,status] file.har ...
+
+Timings of -1 mean "not available" in HAR, so negative values are left
+out of the statistics of their phase, and each phase counts the entries
+it has a value for.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+import math
+import six
+from six.moves import range
+from . import columnar, compression
+from .compat import OrderedDict
+from .streaming import HarStreamReader
+
+try:
+    from typing import Any, Dict, Iterator, List, Sequence, Tuple
+except ImportError:
+    pass
+
+PHASES = ['time'] + columnar.TIMING_PHASES
+
+DEFAULT_BY = ('host', 'method', 'status')
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+
+def to_columns(source):
+    # type: (Any) -> columnar.HarColumns
+    '''
+    Columns of a HarColumns, HarFile, HarLog, or path to a HAR file
+    '''
+    if isinstance(source, columnar.HarColumns):
+        return source
+    if isinstance(source, six.string_types):
+        return columnar.HarColumns.from_file(source)
+    log = getattr(source, 'log', source)
+    return columnar.HarColumns.from_log(log)
+
+
+def _percentile(ordered, q):
+    # type: (List[float], float) -> float
+    # linear interpolation between closest ranks, as numpy.percentile
+    if not ordered:
+        return float('nan')
+    pos = (len(ordered) - 1) * q / 100.0
+    low = int(math.floor(pos))
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def _decode(columns, by, key):
+    # type: (columnar.HarColumns, Sequence[str], Tuple) -> Tuple
+    values = []
+    for name, value in zip(by, key):
+        categories = columns.categories.get(name)
+        if categories is not None:
+            value = categories[value]
+        elif hasattr(value, 'item'):  # NumPy scalars
+            value = value.item()
+        values.append(value)
+    return tuple(values)
+
+
+def _groups(columns, by):
+    # type: (columnar.HarColumns, Sequence[str]) -> List[Tuple[Tuple, Any]]
+    '''
+    (key, indices) of each group of entries with the same values of the
+    columns named in by, in the order of their codes
+    '''
+    keys = list(zip(*[columns[name] for name in by])) if by else \
+        [()] * len(columns)
+    indices = {}  # type: Dict[Tuple, List[int]]
+    for pos, key in enumerate(keys):
+        indices.setdefault(key, []).append(pos)
+    return [(_decode(columns, by, key), group)
+            for key, group in sorted(indices.items())]
+
+
+def _group_order(columns, by):
+    # type: (columnar.HarColumns, Sequence[str]) -> Tuple[Any, Any, List]
+    '''
+    Positions of the entries sorted by group, the offsets at which each
+    group starts and ends in them, and the key of each group
+    '''
+    numpy = columnar.numpy
+    # one int64 code per distinct combination of values
+    key = numpy.zeros(len(columns), dtype=numpy.int64)
+    size = 1
+    for name in by:
+        codes = columns[name]
+        if name in columns.categories:
+            count = len(columns.categories[name])
+        else:
+            _, codes = numpy.unique(codes, return_inverse=True)
+            count = int(codes.max()) + 1 if len(codes) else 1
+        if size * count >= 1 << 62:
+            _, key = numpy.unique(key, return_inverse=True)
+            size = int(key.max()) + 1
+        key = key * count + codes
+        size *= count
+    # entries of a group may come in any order
+    order = numpy.argsort(key)
+    ordered = key[order]
+    bounds = numpy.concatenate((
+        [0], numpy.flatnonzero(ordered[1:] != ordered[:-1]) + 1,
+        [len(order)]))
+    keys = [_decode(columns, by, tuple(columns[name][order[start]]
+                                       for name in by))
+            for start in bounds[:-1]]
+    return order, bounds, keys
+
+
+def _stats_numpy(matrix, percentiles):
+    # type: (Any, Sequence[float]) -> List[Dict[str, Any]]
+    '''
+    Statistics of each column of the matrix of a group, from one sort of
+    all columns, which puts NaN last, as numpy.nanpercentile would give
+    '''
+    numpy = columnar.numpy
+    ordered = numpy.sort(matrix, axis=0)
+    counts = numpy.count_nonzero(~numpy.isnan(ordered), axis=0)
+    last = numpy.maximum(counts - 1, 0)
+    cols = numpy.arange(matrix.shape[1])
+    results = []
+    for q in percentiles:
+        pos = last * (q / 100.0)
+        low = numpy.floor(pos).astype(numpy.intp)
+        high = numpy.minimum(low + 1, last)
+        below = ordered[low, cols]
+        results.append(below + (ordered[high, cols] - below) * (pos - low))
+    results.append(ordered[last, cols])
+    empty = counts == 0
+    stats = []
+    for col in range(matrix.shape[1]):
+        phase = OrderedDict([('count', int(counts[col]))])
+        for name, values in zip(['p%g' % q for q in percentiles] + ['max'],
+                                results):
+            phase[name] = float('nan') if empty[col] else float(values[col])
+        stats.append(phase)
+    return stats
+
+
+def _stats_python(columns, indices, percentiles):
+    # type: (Any, List[int], Sequence[float]) -> List[Dict[str, Any]]
+    stats = []
+    for column in columns:
+        ordered = sorted(v for v in (column[i] for i in indices)
+                         if v >= 0)  # also leaves out NaN
+        phase = OrderedDict([('count', len(ordered))])
+        for q in percentiles:
+            phase['p%g' % q] = _percentile(ordered, q)
+        phase['max'] = ordered[-1] if ordered else float('nan')
+        stats.append(phase)
+    return stats
+
+
+def timings(source, by=DEFAULT_BY, percentiles=DEFAULT_PERCENTILES,
+            phases=PHASES):
+    # type: (Any, Sequence[str], Sequence[float], Sequence[str]) -> List[Dict]
+    '''
+    Returns a row for each group of entries with the same values of the
+    columns in by, with those values, the number of entries, and for
+    each phase a dict of count, p50, p90, p99 and max, by default:
+
+        {'host': 'example.com', 'method': 'GET', 'status': 200,
+         'count': 12, 'time': {'count': 12, 'p50': 81.5, ...}, ...}
+
+    source is anything to_columns takes. Rows are ordered by group.
+    '''
+    columns = to_columns(source)
+    by = list(by)
+    percentiles = list(percentiles)
+    numpy = columnar.numpy
+    rows = []
+    if numpy is None:
+        phase_columns = [columns[phase] for phase in phases]
+        for key, indices in _groups(columns, by):
+            row = OrderedDict(zip(by, key))
+            row['count'] = len(indices)
+            row.update(zip(phases, _stats_python(phase_columns, indices,
+                                                 percentiles)))
+            rows.append(row)
+        return rows
+
+    order, bounds, keys = _group_order(columns, by)
+    # a row per entry in group order, with sentinels and missing values as
+    # NaN, and each phase contiguous for sorting
+    matrix = numpy.empty((len(order), len(phases)), order='F')
+    for col, phase in enumerate(phases):
+        matrix[:, col] = columns[phase][order]
+    matrix[matrix < 0] = numpy.nan
+    for key, start, end in zip(keys, bounds[:-1], bounds[1:]):
+        row = OrderedDict(zip(by, key))
+        row['count'] = int(end - start)
+        row.update(zip(phases, _stats_numpy(matrix[start:end], percentiles)))
+        rows.append(row)
+    return rows
+
+
+def format_table(rows, by, phases=PHASES):
+    # type: (List[Dict], Sequence[str], Sequence[str]) -> str
+    '''
+    One line per group and phase, with aligned columns
+    '''
+    if not rows:
+        return ''
+    stats = [name for name in rows[0][phases[0]]]
+    header = list(by) + ['phase'] + stats
+    lines = [header]
+    for row in rows:
+        for phase in phases:
+            values = row[phase]
+            lines.append([six.text_type(row[name]) for name in by] + [
+                phase, str(values['count'])] + [
+                '-' if values[name] != values[name] else '%.1f' % values[name]
+                for name in stats[1:]])
+    widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+    text = []
+    for line in lines:
+        text.append('  '.join(
+            value.ljust(width) if i < len(by) + 1 else value.rjust(width)
+            for i, (value, width) in enumerate(zip(line, widths))).rstrip())
+    return '\n'.join(text)
+
+
+def _iter_dicts(paths):
+    # type: (Sequence[str]) -> Iterator[Dict[str, Any]]
+    for path in paths:
+        with compression.open_reader(path) as stream:
+            for d in HarStreamReader(stream).iter_dicts():
+                yield d
+
+
+def main(argv=None):
+    # type: (List[str]) -> None
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog='python -m harlib.analysis',
+        description='Latency percentiles of HAR files by group')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--by', default=','.join(DEFAULT_BY),
+                        help='columns of harlib.columnar to group by')
+    parser.add_argument('--percentiles', default=','.join(
+        str(q) for q in DEFAULT_PERCENTILES))
+    parser.add_argument('--phases', default=','.join(PHASES),
+                        help='time and timings phases')
+    options = parser.parse_args(argv)
+    by = [name for name in options.by.split(',') if name]
+    phases = [name for name in options.phases.split(',') if name]
+    percentiles = [float(q) for q in options.percentiles.split(',') if q]
+    columns = columnar.HarColumns.from_entries(_iter_dicts(options.files))
+    rows = timings(columns, by, percentiles, phases)
+    print(format_table(rows, by, phases))
+
+
+if __name__ == '__main__':
+    main()
@@ -11,48 +11,225 @@ from __future__ import absolute_import
 from .objects import (
     HarObject, HarFile, HarLog, HarEntry,
     HarResponse, HarRequest)
+from .objects.compact import MODEL_TYPES
+from .streaming import HarStreamReader
+from . import bodies as _bodies
+from . import compression as _compression
+from . import indexed
+from . import jsonl
+from . import jsonlib
+from . import utils
 import collections
-import json
+import logging
+import os
 import six
 
+logger = logging.getLogger(__name__)
+
+
+def _blobs_for(writer, blobs):
+    if blobs is True:
+        if not isinstance(writer, six.string_types):
+            raise ValueError('blobs=True needs the path of the HAR file')
+        blobs = _bodies.blobs_path(writer)
+    return blobs
 
-def dump(o, writer):
-    assert isinstance(o, HarObject)
-    o.dump(writer)
+
+def dump(o, writer, compression=None, level=None, blobs=None,
+         threshold=_bodies.BLOB_THRESHOLD):
+    '''
+    Given blobs, True for the pack next to the file (see blobs_path), or
+    a BodyStore or path (see open_blobs), body texts of threshold
+    characters or more are written there, and only referenced in the file
+    '''
+    assert isinstance(o, MODEL_TYPES)
+    blobs = _blobs_for(writer, blobs)
+    with _compression.open_writer(writer, compression, level) as stream:
+        if blobs is None:
+            o.dump(stream)
+        else:
+            _bodies.dump_compact(o, stream, blobs=blobs,
+                                 threshold=threshold, inline=True)
 
 
 def dumps(o):
-    assert isinstance(o, HarObject)
+    assert isinstance(o, MODEL_TYPES)
     return o.dumps()
 
 
 def dumpd(o):
-    assert isinstance(o, HarObject)
+    assert isinstance(o, MODEL_TYPES)
     return o.to_json()
 
 
-def loadd(d):
+def dump_compact(o, writer, compression=None, level=None, blobs=None,
+                 threshold=_bodies.BLOB_THRESHOLD):
+    '''
+    Writes a HarFile or HarLog with each distinct body text once, see
+    harlib.bodies.to_compact, and large texts to blobs as in dump
+    '''
+    assert isinstance(o, HarObject)
+    blobs = _blobs_for(writer, blobs)
+    with _compression.open_writer(writer, compression, level) as stream:
+        _bodies.dump_compact(o, stream, blobs=blobs, threshold=threshold)
+
+
+def loadd(d, lazy=False, trusted=False, bodies=None):
     assert isinstance(d, collections.Mapping)
+    if bodies is not None:
+        # equal body texts become one string, held in the BodyStore
+        _bodies.share_texts(d, bodies)
     if 'log' in d:
-        return HarFile(d)
+        return HarFile(d, lazy=lazy, trusted=trusted)
     elif 'entries' in d:
-        return HarLog(d)
+        return HarLog(d, lazy=lazy, trusted=trusted)
     elif 'time' in d:
-        return HarEntry(d)
+        return HarEntry(d, trusted=trusted)
     elif 'status' in d or 'statusText' in d or 'content' in d:
+        if trusted:
+            return HarResponse.from_trusted(d)
         return HarResponse(d)
     elif 'method' in d or 'url' in d or 'queryString' in d:
+        if trusted:
+            return HarRequest.from_trusted(d)
         return HarRequest(d)
     else:
         raise ValueError("unrecognized HAR content", d)
 
 
-def loads(s):
+def loads(s, lazy=False, trusted=False, bodies=None):
     assert isinstance(s, six.string_types)
-    d = json.loads(s)
-    return loadd(d)
+    d = jsonlib.loads(s)
+    return loadd(d, lazy=lazy, trusted=trusted, bodies=bodies)
+
+
+def _load_with_blobs(reader, blobs):
+    with _compression.open_reader(reader) as stream:
+        d = jsonlib.load(stream)
+    if blobs is None and isinstance(reader, six.string_types):
+        path = _bodies.blobs_path(reader)
+        if os.path.exists(path):
+            blobs = path
+    return d, blobs
+
+
+def load(reader, lazy=False, trusted=False, bodies=None, blobs=None):
+    '''
+    Texts written out of line by dump are read from blobs, by default the
+    pack next to the file if there is one, when they are first used
+    '''
+    d, blobs = _load_with_blobs(reader, blobs)
+    if blobs is not None:
+        _bodies.from_compact(d, blobs=blobs)
+    return loadd(d, lazy=lazy, trusted=trusted, bodies=bodies)
+
+
+def load_compact(reader, lazy=False, trusted=False, bodies=None,
+                 blobs=None):
+    '''
+    Reads a file written by dump_compact, or any HAR file. Each body text
+    that was written once is one string shared by its bodies, and is added
+    to bodies if that is a BodyStore. Blobs are read as in load.
+    '''
+    d, blobs = _load_with_blobs(reader, blobs)
+    _bodies.from_compact(d, bodies, blobs)
+    return loadd(d, lazy=lazy, trusted=trusted)
+
+
+def load_header(reader):
+    with _compression.open_reader(reader) as stream:
+        return HarStreamReader(stream).read_header(complete=True)
+
+
+def iter_entries(reader):
+    with _compression.open_reader(reader) as stream:
+        for entry in HarStreamReader(stream).iter_entries():
+            yield entry
+
+
+def open_indexed(path, index_path=None):
+    return indexed.open_indexed(path, index_path)
+
+
+def dump_jsonl(o, writer, header=True):
+    return jsonl.dump_jsonl(o, writer, header=header)
+
+
+def iter_jsonl(reader):
+    return jsonl.iter_jsonl(reader)
+
+
+def _load_raw(path):
+    # runs in a worker: only plain dicts (or the error) are sent back
+    try:
+        with _compression.open_reader(path) as stream:
+            return path, jsonlib.load(stream), None
+    except Exception as err:
+        return path, None, '%s: %s' % (type(err).__name__, err)
+
+
+def _started_key(entry):
+    # parsed, as times with different UTC offsets compare wrong as strings
+    ns = utils.parse_iso_datetime_ns(entry.get('startedDateTime'))
+    return (ns is not None, ns or 0)
+
+
+def load_many(paths, workers=None, merge=False, errors=None, trusted=False):
+    '''
+    Loads HAR files in a pool of worker processes, returning a list with
+    the HarFile of each path, or None where it failed to load, or with
+    merge=True one HarLog of all entries ordered by startedDateTime (those
+    without a valid one first). Failures are logged and stored by path in
+    errors, if given, without stopping the batch. The files are validated
+    as by load() unless trusted is true, and with merge=True a file that
+    is not valid raises ValueError.
+    '''
+    # imported here, as most callers never start a pool
+    from multiprocessing import Pool, cpu_count
+    paths = list(paths)
+    workers = min(workers or cpu_count(), len(paths))
+    if workers > 1:
+        pool = Pool(workers)
+        try:
+            results = pool.map(_load_raw, paths, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_load_raw(path) for path in paths]
+
+    loaded = []
+    for path, d, error in results:
+        if error is None and not (isinstance(d, dict) and 'log' in d):
+            error = 'ValueError: not a HAR file'
+        if error is None and not merge:
+            try:
+                d = HarFile(d, trusted=trusted)
+            except ValueError as err:
+                error = 'ValueError: %s' % err
+        if error is not None:
+            logger.warning('could not load %s: %s' % (path, error))
+            if errors is not None:
+                errors[path] = error
+            d = None
+        loaded.append(d)
 
+    if not merge:
+        return loaded
 
-def load(reader):
-    d = json.load(reader)
-    return loadd(d)
+    log = collections.OrderedDict()
+    pages = []
+    entries = []
+    for d in loaded:
+        if d is None:
+            continue
+        for name, value in d['log'].items():
+            log.setdefault(name, value)
+        pages.extend(d['log'].get('pages') or [])
+        entries.extend(d['log'].get('entries') or [])
+    for name, value in HarLog().header_to_json().items():
+        log.setdefault(name, value)
+    entries.sort(key=_started_key)
+    log['pages'] = pages
+    log['entries'] = entries
+    return HarLog(log, trusted=trusted)
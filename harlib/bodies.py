@@ -0,0 +1,471 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Content-addressed storage of body texts. A BodyStore keeps each distinct
+text once, by the SHA-256 of its UTF-8, in memory or in the files of a
+directory, a BodyPack in one pack file, and bodies hold a BodyRef to it
+in place of their text:
+
+    store = BodyStore()  # or BodyStore('bodies/'), BodyPack('x.blobs')
+    log.store_bodies(store)
+    har = harlib.api.load(path, bodies=store)
+
+Model objects read and write the text as before, so their JSON is still
+standard HAR. In the compact variant of HAR, see to_compact, each distinct
+text is written once, in "_bodies" of the log by digest, and bodies have a
+"_textRef" to it in place of their "text". Large texts may be written out
+of line instead, to a store of blobs, with the "_textSize" of their UTF-8,
+and are read from it when first used:
+
+    harlib.api.dump(har, 'x.har', blobs=True)  # to x.har.blobs
+    har = harlib.api.load('x.har')  # which reads no body
+'''
+from __future__ import absolute_import
+import hashlib
+import mmap
+import os
+import six
+from . import jsonlib
+from .compat import JSON_DICT
+from .utils import get_attr
+
+try:
+    from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+except ImportError:
+    pass
+
+HASH_NAME = 'sha256'
+
+# texts of at least this many characters are written out of line, if the
+# blobs to write them to are given
+BLOB_THRESHOLD = 64 * 1024
+
+# fields of an entry that hold a body
+BODY_FIELDS = (('request', 'postData'), ('response', 'content'))
+
+# JSON strings may hold lone surrogates, which are kept as they are
+_ERRORS = 'surrogatepass' if six.PY3 else 'strict'
+
+_replace = getattr(os, 'replace', os.rename)
+
+_default_store = None  # type: Optional[BodyStore]
+
+
+class BodyRef(object):
+    '''
+    Reference to a text in a BodyStore, with the digest and size in bytes
+    of its UTF-8. A store gives one reference per text, which all bodies
+    with that text share.
+    '''
+    __slots__ = ('store', 'digest', 'size')
+
+    def __init__(self, store, digest, size):
+        # type: (BodyStore, str, int) -> None
+        self.store = store
+        self.digest = digest
+        self.size = size
+
+    def __repr__(self):
+        # type: () -> str
+        return '<%s %s of %d bytes>' % (
+            self.__class__.__name__, self.digest[:12], self.size)
+
+    # references are never copied, as the text they refer to never changes
+    def __copy__(self):
+        # type: () -> BodyRef
+        return self
+
+    def __deepcopy__(self, memo):
+        # type: (Dict) -> BodyRef
+        return self
+
+    def read(self):
+        # type: () -> str
+        return self.store.get(self.digest)
+
+    def to_json(self, dict_class=None, **kwargs):
+        # type: (Any, **Any) -> str
+        # the text, so that bodies holding references write standard HAR
+        return self.read()
+
+
+class BodyStore(object):
+    '''
+    Texts by the digest of their UTF-8, each kept once, in memory, or given
+    a path in files of that directory named by digest, which may be shared
+    by several stores and processes
+    '''
+
+    def __init__(self, path=None):
+        # type: (Optional[str]) -> None
+        self.path = path
+        self._texts = {}  # type: Dict[str, str]
+        self._refs = {}  # type: Dict[str, BodyRef]
+
+    def __repr__(self):
+        # type: () -> str
+        return '<%s of %d texts%s>' % (
+            self.__class__.__name__, len(self._refs),
+            '' if self.path is None else ' in %s' % self.path)
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._refs)
+
+    def __contains__(self, digest):
+        # type: (str) -> bool
+        return digest in self._refs or self.path is not None and \
+            os.path.exists(self._file(digest))
+
+    def ref(self, digest, size=-1):
+        # type: (str, int) -> BodyRef
+        '''
+        The reference to a text by digest, which is only read when used,
+        for texts that were stored before, as by another process
+        '''
+        ref = self._refs.get(digest)
+        if ref is None:
+            ref = self._refs[digest] = BodyRef(self, digest, size)
+        return ref
+
+    def put(self, text):
+        # type: (str) -> BodyRef
+        '''
+        Hashes a text, adds it unless it is already stored, and returns the
+        reference to it
+        '''
+        data = text.encode('utf-8', _ERRORS)
+        digest = hashlib.new(HASH_NAME, data).hexdigest()
+        ref = self._refs.get(digest)
+        if ref is None:
+            if self.path is None:
+                self._texts[digest] = text
+            else:
+                self._write(digest, data)
+            ref = self._refs[digest] = BodyRef(self, digest, len(data))
+        return ref
+
+    def get(self, digest):
+        # type: (str) -> str
+        if self.path is None:
+            return self._texts[digest]
+        try:
+            with open(self._file(digest), 'rb') as reader:
+                return reader.read().decode('utf-8', _ERRORS)
+        except (IOError, OSError):
+            raise KeyError(digest)
+
+    def _shared(self, text):
+        # type: (str) -> Tuple[BodyRef, str]
+        # the reference, and the text held in memory if it is, for sharing
+        ref = self.put(text)
+        return ref, self._texts.get(ref.digest, text)
+
+    def _file(self, digest):
+        # type: (str) -> str
+        return os.path.join(self.path, digest[:2], digest[2:])
+
+    def _write(self, digest, data):
+        # type: (str, bytes) -> None
+        path = self._file(digest)
+        if os.path.exists(path):
+            return
+        dirname = os.path.dirname(path)
+        if not os.path.isdir(dirname):
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                if not os.path.isdir(dirname):
+                    raise
+        # renamed when complete, so readers never see part of a file
+        temp = '%s.%d.tmp' % (path, os.getpid())
+        with open(temp, 'wb') as writer:
+            writer.write(data)
+        _replace(temp, path)
+
+
+class BodyPack(BodyStore):
+    '''
+    Texts appended once to one pack file, each after a line of its digest
+    and size in bytes, and read through a memory map of the file, which is
+    only opened when a text is first read or added. A pack has a single
+    writer at a time.
+    '''
+
+    def __init__(self, path):
+        # type: (str) -> None
+        super(BodyPack, self).__init__(path)
+        self._offsets = None  # type: Optional[Dict[str, Tuple[int, int]]]
+        self._end = 0  # where the last scan of the file stopped
+        self._map = None  # type: Any
+
+    def __contains__(self, digest):
+        # type: (str) -> bool
+        return digest in self._refs or digest in self._index()
+
+    def close(self):
+        # type: () -> None
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._map = None
+        self._offsets = None
+
+    def _remap(self):
+        # type: () -> Any
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._map = b''  # an empty file cannot be mapped
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            with open(self.path, 'rb') as reader:
+                self._map = mmap.mmap(reader.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+        return self._map
+
+    def _index(self):
+        # type: () -> Dict[str, Tuple[int, int]]
+        # (offset, size) of each text, from the lines before them
+        if self._offsets is None:
+            self._offsets = {}
+            self._end = 0
+            self._scan()
+        return self._offsets
+
+    def _scan(self):
+        # type: () -> None
+        # indexes the texts appended since the last scan
+        offsets = self._offsets
+        data = self._remap()
+        pos = self._end
+        end = len(data)
+        while pos < end:
+            eol = data.find(b'\n', pos)
+            try:
+                digest, size = data[pos:eol].split() if eol != -1 else ()
+                size = int(size)
+            except ValueError:
+                break  # the last text was not written in full
+            start = eol + 1
+            if start + size > end:
+                break
+            offsets[digest.decode('ascii')] = (start, size)
+            pos = start + size
+        self._end = pos
+
+    def get(self, digest):
+        # type: (str) -> str
+        offsets = self._index()
+        if digest not in offsets:
+            self._scan()  # appended by another pack on the file
+        start, size = offsets[digest]
+        data = self._map
+        if start + size > len(data):
+            data = self._remap()
+        return data[start:start + size].decode('utf-8', _ERRORS)
+
+    def _write(self, digest, data):
+        # type: (str, bytes) -> None
+        offsets = self._index()
+        if digest in offsets:
+            return
+        header = ('%s %d\n' % (digest, len(data))).encode('ascii')
+        with open(self.path, 'ab') as writer:
+            writer.seek(0, os.SEEK_END)
+            start = writer.tell() + len(header)
+            writer.write(header + data)
+        offsets[digest] = (start, len(data))
+
+
+def blobs_path(path):
+    # type: (str) -> str
+    '''
+    Path of the pack of blobs that goes with a HAR file
+    '''
+    return path + '.blobs'
+
+
+def open_blobs(blobs):
+    # type: (Any) -> BodyStore
+    '''
+    A store of blobs: a BodyStore as it is, a directory as a BodyStore of
+    its files, or another path as a BodyPack
+    '''
+    if isinstance(blobs, BodyStore):
+        return blobs
+    if os.path.isdir(blobs) or blobs.endswith(('/', os.sep)):
+        return BodyStore(blobs)
+    return BodyPack(blobs)
+
+
+def default_store():
+    # type: () -> BodyStore
+    '''
+    The in-memory store of the bodies stored without one
+    '''
+    global _default_store
+    if _default_store is None:
+        _default_store = BodyStore()
+    return _default_store
+
+
+def _entry_dicts(d):
+    # type: (Dict) -> Any
+    log = d.get('log', d)
+    return log.get('entries') or () if isinstance(log, dict) else ()
+
+
+def _body_dicts(entry):
+    # type: (Dict) -> Iterator[Dict]
+    for message, name in BODY_FIELDS:
+        parent = entry.get(message)
+        body = parent.get(name) if isinstance(parent, dict) else None
+        if isinstance(body, dict):
+            yield body
+
+
+def share_texts(d, store=None):
+    # type: (Dict, Optional[BodyStore]) -> int
+    '''
+    Adds the body texts of the entries of a HAR or log dict to store, the
+    default store if None, and replaces each with an equal string shared
+    by every body with that text. Returns the number of distinct texts.
+    '''
+    if store is None:
+        store = default_store()
+    shared = {}  # type: Dict[BodyRef, str]
+    for entry in _entry_dicts(d):
+        for body in _body_dicts(entry):
+            text = body.get('text')
+            if isinstance(text, six.text_type) and text:
+                ref, text = store._shared(text)
+                body['text'] = shared.setdefault(ref, text)
+    return len(shared)
+
+
+def _text_fields(text, body, texts, blobs, threshold, inline):
+    # type: (str, Any, Dict[str, str], Any, int, bool) -> tuple
+    # the fields that replace the text of a body, none to keep it
+    ref = getattr(body, '__dict__', {}).get('_body')
+    if blobs is not None and len(text) >= threshold:
+        if ref is None or ref.store is not blobs:
+            ref = blobs.put(text)
+        return (('_textRef', ref.digest), ('_textSize', ref.size))
+    if inline:
+        return ()
+    digest = ref.digest if ref is not None else hashlib.new(
+        HASH_NAME, text.encode('utf-8', _ERRORS)).hexdigest()
+    texts.setdefault(digest, text)
+    return (('_textRef', digest),)
+
+
+def to_compact(o, dict_class=JSON_DICT, blobs=None,
+               threshold=BLOB_THRESHOLD, inline=False):
+    # type: (Any, type, Any, int, bool) -> Dict
+    '''
+    JSON of a HarFile or HarLog in the compact variant, which has each
+    distinct body text once, or with inline=True has the texts as in HAR.
+    Given blobs, see open_blobs, texts of threshold characters or more are
+    written there instead. Texts held in a store are not hashed again.
+    '''
+    if blobs is not None:
+        blobs = open_blobs(blobs)
+    d = dict_class(o.to_json(dict_class=dict_class))
+    if 'log' in d:
+        o = o.log
+        log = d['log'] = dict_class(d['log'])
+    else:
+        log = d
+    entries = getattr(o, 'entries', None)
+    if entries is None:
+        raise ValueError('%s has no entries' % o.__class__.__name__)
+    read = getattr(entries, 'raw', entries.__getitem__)
+    texts = dict_class()  # type: Dict[str, str]
+    replaced = {}  # type: Dict[int, tuple]
+    compact = []
+    # dicts are copied before they are changed, as unbuilt or trusted
+    # entries emit the dicts they hold
+    for pos, entry in enumerate(log.get('entries') or ()):
+        for message, name in BODY_FIELDS:
+            parent = entry.get(message)
+            body = parent.get(name) if isinstance(parent, dict) else None
+            text = body.get('text') if isinstance(body, dict) else None
+            if not isinstance(text, six.text_type) or not text:
+                continue
+            fields = replaced.get(id(text))
+            if fields is None:
+                fields = replaced[id(text)] = _text_fields(
+                    text, get_attr(get_attr(read(pos), message), name),
+                    texts, blobs, threshold, inline)
+            if not fields:
+                continue
+            entry = dict_class(entry)
+            entry[message] = parent = dict_class(parent)
+            parent[name] = compact_body = dict_class()
+            for key, value in body.items():
+                if key == 'text':
+                    compact_body.update(fields)
+                else:
+                    compact_body[key] = value
+        compact.append(entry)
+    log['entries'] = compact
+    if texts:
+        log['_bodies'] = texts
+    return d
+
+
+def from_compact(d, store=None, blobs=None):
+    # type: (Dict, Optional[BodyStore], Any) -> Dict
+    '''
+    Puts back the "text" of the bodies of a HAR or log dict in the compact
+    variant, in place, as one string shared by every body with that text,
+    and adds the texts to store if given. Texts written out of line are
+    references to blobs, see open_blobs, read when first used. Returns d.
+    '''
+    if blobs is not None:
+        blobs = open_blobs(blobs)
+    log = d.get('log', d)
+    texts = log.pop('_bodies', None) or {}
+    if store is not None:
+        texts = dict((digest, store._shared(text)[1])
+                     for digest, text in texts.items())
+    for entry in _entry_dicts(d):
+        for body in _body_dicts(entry):
+            digest = body.get('_textRef')
+            if digest is None:
+                continue
+            text = texts.get(digest)
+            if text is None:
+                if blobs is None:
+                    raise ValueError('no body text %s in _bodies' % digest)
+                text = blobs.ref(digest, body.get('_textSize', -1))
+            # in place, so the fields keep their order
+            items = list(body.items())
+            body.clear()
+            for key, value in items:
+                if key == '_textRef':
+                    body['text'] = text
+                elif key != '_textSize':
+                    body[key] = value
+    return d
+
+
+def dumps_compact(o, blobs=None, threshold=BLOB_THRESHOLD, inline=False,
+                  **kwargs):
+    # type: (Any, Any, int, bool, **Any) -> str
+    return jsonlib.dumps(to_compact(o, blobs=blobs, threshold=threshold,
+                                    inline=inline), **kwargs)
+
+
+def dump_compact(o, writer, blobs=None, threshold=BLOB_THRESHOLD,
+                 inline=False, **kwargs):
+    # type: (Any, TextIO, Any, int, bool, **Any) -> None
+    jsonlib.dump(to_compact(o, blobs=blobs, threshold=threshold,
+                            inline=inline), writer, **kwargs)
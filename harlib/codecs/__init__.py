@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Registry of codecs, which convert between HAR model objects and the objects
+of other libraries. A codec handles the classes defined in its modules
+attribute, and decodes with decode_<HAR class>_from_<raw class> methods or
+encodes with encode_<HAR class>_to_<raw class> methods (or, failing those,
+its own decode(raw, har_class) and encode(har, raw_class)).
+
+The first codec registered for a module wins. The method found for each
+pair of classes is cached, so it is only looked up once. Codecs registered
+by name are imported when an object of one of their modules is first seen.
+'''
+from __future__ import absolute_import
+import functools
+import importlib
+import logging
+
+try:
+    from typing import Any, Callable, Dict, List, Optional, Tuple
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+# (codec class, modules of the objects it converts), see initialize_codecs;
+# the codec classes take their modules from here, see builtin_modules
+BUILTIN_CODECS = [
+    ('harlib.codecs.requests:Urllib3Codec', [
+        'urllib3.response',
+        'requests.packages.urllib3.response',
+        'botocore.vendored.requests.packages.urllib3.response']),
+    ('harlib.codecs.requests:RequestsCodec', [
+        'requests.models',
+        'botocore.awsrequest',
+        'botocore.vendored.requests.models',
+        'one.web.http.objects']),
+    ('harlib.codecs.httplib:Urllib2Codec', [
+        'urllib2',
+        'urllib',
+        'urllib.request']),
+    ('harlib.codecs.httplib:HttplibCodec', [
+        'cookielib',
+        'httplib',
+        'http.client',
+        'http.cookiejar']),
+    ('harlib.codecs.django:DjangoCodec', [
+        'django.http.request',
+        'django.http.response',
+        'django.core.handlers.wsgi',
+        'django.template.response',
+        'rest_framework.request',
+        'rest_framework.response']),
+    ('harlib.codecs.default:DefaultCodec', [
+        '__builtin__',  # PY2
+        'builtins']),  # PY3
+]
+
+_codecs = []  # type: List[Any]
+_decoders = {}  # type: Dict[Tuple[type, type], Optional[Callable]]
+_encoders = {}  # type: Dict[Tuple[type, type], Optional[Callable]]
+
+
+def builtin_modules(path):
+    # type: (str) -> List[str]
+    '''
+    Returns the modules of the builtin codec class named by path
+    '''
+    return list(dict(BUILTIN_CODECS)[path])
+
+
+def register_codec(codec, first=False):
+    # type: (Any, bool) -> Any
+    '''
+    Adds a codec, after those already registered unless first is true.
+    Returns the codec, so this can decorate a codec class's instance.
+    '''
+    if first:
+        _codecs.insert(0, codec)
+    else:
+        _codecs.append(codec)
+    _decoders.clear()
+    _encoders.clear()
+    return codec
+
+
+def unregister_codec(codec):
+    # type: (Any) -> None
+    _codecs.remove(codec)
+    _decoders.clear()
+    _encoders.clear()
+
+
+class LazyCodec(object):
+    '''
+    Stands in for the codec class named by path, as in "package.module:Class",
+    until an object of one of its modules is decoded or encoded.
+    '''
+
+    def __init__(self, path, modules):
+        # type: (str, List[str]) -> None
+        self.path = path
+        self.modules = list(modules)
+
+    def load(self):
+        # type: () -> Any
+        module_name, class_name = self.path.split(':')
+        return getattr(importlib.import_module(module_name), class_name)()
+
+    def __repr__(self):
+        # type: () -> str
+        return 'LazyCodec(%s)' % repr(self.path)
+
+
+def register_lazy_codec(path, modules, first=False):
+    # type: (str, List[str], bool) -> LazyCodec
+    '''
+    Registers the codec class named by path for objects of modules, which
+    is not imported before it is needed.
+    '''
+    return register_codec(LazyCodec(path, modules), first=first)
+
+
+def get_codecs():
+    # type: () -> List[Any]
+    '''
+    Returns the registered codecs, in the order they are tried
+    '''
+    return list(_codecs)
+
+
+def _find_codec(raw_class):
+    # type: (type) -> Any
+    mod = raw_class.__module__
+    for codec in list(_codecs):
+        if mod not in codec.modules:
+            continue
+        if not isinstance(codec, LazyCodec):
+            return codec
+        try:
+            loaded = codec.load()
+        except Exception as err:
+            logger.warning("no %s: %s" % (codec.path, repr(err)),
+                           exc_info=True)
+            _codecs.remove(codec)
+            continue
+        _codecs[_codecs.index(codec)] = loaded
+        if mod in loaded.modules:
+            return loaded
+    return None
+
+
+def find_decoder(raw_class, har_class):
+    # type: (type, type) -> Optional[Callable]
+    '''
+    Returns decoder(raw) that converts instances of raw_class to a dict or
+    list har_class can be built from, or None if no codec handles them.
+    '''
+    key = (raw_class, har_class)
+    try:
+        return _decoders[key]
+    except KeyError:
+        pass
+    codec = _find_codec(raw_class)
+    decoder = None
+    if codec is not None:
+        decoder = getattr(codec, 'decode_%s_from_%s' % (
+            har_class.__name__, raw_class.__name__), None)
+        if decoder is None:
+            decoder = functools.partial(_decode, codec, har_class)
+    _decoders[key] = decoder
+    return decoder
+
+
+def find_encoder(har_class, raw_class):
+    # type: (type, type) -> Optional[Callable]
+    '''
+    Returns encoder(har) that converts instances of har_class to instances
+    of raw_class, or None if no codec handles them.
+    '''
+    key = (har_class, raw_class)
+    try:
+        return _encoders[key]
+    except KeyError:
+        pass
+    codec = _find_codec(raw_class)
+    encoder = None
+    if codec is not None:
+        encoder = getattr(codec, 'encode_%s_to_%s' % (
+            har_class.__name__, raw_class.__name__), None)
+        if encoder is None:
+            encoder = functools.partial(_encode, codec, raw_class)
+    _encoders[key] = encoder
+    return encoder
+
+
+def _decode(codec, har_class, raw):
+    # type: (Any, type, Any) -> Any
+    return codec.decode(raw, har_class)
+
+
+def _encode(codec, raw_class, har):
+    # type: (Any, type, Any) -> Any
+    return codec.encode(har, raw_class)
@@ -8,6 +8,7 @@
 # will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
 # modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
 from __future__ import absolute_import
+from harlib.codecs import builtin_modules
 from harlib.objects.messages import HarHeader
 from six.moves import map
 
@@ -15,8 +16,7 @@ from six.moves import map
 class DefaultCodec(object):
 
     dict_class = dict
-    modules = ['__builtin__',  # PY2
-               'builtins']     # PY3
+    modules = builtin_modules('harlib.codecs.default:DefaultCodec')
 
     def __init__(self):
         pass
@@ -13,7 +13,7 @@ import wsgiref.handlers
 import django.http.request
 import django.http.response
 import os
-from . import utils
+from . import builtin_modules, utils
 
 
 class DjangoCodec(object):
@@ -21,14 +21,7 @@ class DjangoCodec(object):
     dict_class = dict
     request_class = django.http.request.HttpRequest
     response_class = django.http.response.HttpResponse
-    modules = [
-        'django.http.request',
-        'django.http.response',
-        'django.core.handlers.wsgi',
-        'django.template.response',
-        'rest_framework.request',
-        'rest_framework.response',
-    ]
+    modules = builtin_modules('harlib.codecs.django:DjangoCodec')
 
     def __init__(self):
         object.__init__(self)
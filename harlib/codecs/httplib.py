@@ -13,18 +13,14 @@ from six.moves import http_client
 from six.moves import urllib
 import six
 from harlib import utils
+from harlib.codecs import builtin_modules
 
 
 class HttplibCodec(object):
 
     dict_class = dict
     response_class = http_client.HTTPResponse
-    modules = [
-        'cookielib',
-        'httplib',
-        'http.client',
-        'http.cookiejar'
-    ]
+    modules = builtin_modules('harlib.codecs.httplib:HttplibCodec')
 
     def __init__(self):
         pass
@@ -192,10 +188,7 @@ class Urllib2Codec(object):
     dict_class = dict
     request_class = urllib.request.Request
     response_class = urllib.response.addinfourl
-    modules = [
-        'urllib2',
-        'urllib',
-        'urllib.request']
+    modules = builtin_modules('harlib.codecs.httplib:Urllib2Codec')
     httplib_codec = HttplibCodec()
     http_version = 'HTTP/1.1'
 
@@ -14,6 +14,7 @@ import harlib
 import json
 import six
 from six.moves import http_client
+from harlib.codecs import builtin_modules
 from harlib.codecs.httplib import HttplibCodec
 from ..compat import OrderedDict
 from ..compat import requests
@@ -45,9 +46,7 @@ class Urllib3Codec(object):
 
     dict_class = dict
     response_class = urllib3r.response.HTTPResponse
-    modules = ['urllib3.response',
-               'requests.packages.urllib3.response',
-               'botocore.vendored.requests.packages.urllib3.response']
+    modules = builtin_modules('harlib.codecs.requests:Urllib3Codec')
     httplib_codec = HttplibCodec()
 
     def __init__(self):
@@ -181,10 +180,7 @@ class RequestsCodec(object):
 
     dict_class = dict
     response_class = requests.Response
-    modules = ['requests.models',
-               'botocore.awsrequest',
-               'botocore.vendored.requests.models',
-               'one.web.http.objects']
+    modules = builtin_modules('harlib.codecs.requests:RequestsCodec')
     urllib3_codec = Urllib3Codec()
 
     def __init__(self):
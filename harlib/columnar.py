@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Columnar view of the entries of a log, for analytics. Fixed fields of each
+entry are appended to one contiguous array per column, in a single pass
+over entry dicts or model objects, so a file can be read with a streaming
+reader without building its object tree.
+
+Columns are NumPy arrays when NumPy is installed and array.array objects
+otherwise. Strings (url, host, method, mimeType) are dictionary encoded:
+the column holds integer codes into a list of distinct values.
+
+Missing numbers are -1, as in HAR, except time, which is NaN, and
+startedDateTime (microseconds since the epoch), which is NAT.
+'''
+from __future__ import absolute_import
+from array import array
+from six.moves import range
+from . import compression
+from .compat import INT64, OrderedDict
+from .streaming import HarStreamReader
+from .utils import get_attr, get_item, parse_iso_datetime_us, url_host
+
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    numpy = None
+    HAS_NUMPY = False
+
+try:
+    from typing import (
+        Any, Callable, Dict, Iterable, List, Optional, Tuple)
+except ImportError:
+    pass
+
+# int64 minimum, as NumPy's NaT, for times that could not be parsed
+NAT = -(1 << 63)
+
+TIMING_PHASES = ['blocked', 'dns', 'connect', 'ssl', 'send', 'wait',
+                 'receive']
+
+# (name, array typecode) of the number columns, in order
+NUMBER_COLUMNS = [
+    ('startedDateTime', INT64),
+    ('time', 'd'),
+] + [(phase, 'd') for phase in TIMING_PHASES] + [
+    ('status', 'i'),
+    ('requestHeadersSize', INT64),
+    ('requestBodySize', INT64),
+    ('responseHeadersSize', INT64),
+    ('responseBodySize', INT64),
+]
+
+# dictionary encoded string columns
+CATEGORY_COLUMNS = ['url', 'host', 'method', 'mimeType']
+
+
+def _number(value, default):
+    # type: (Any, Any) -> Any
+    if value is None or value == '':
+        return default
+    return value
+
+
+class ColumnBuilder(object):
+    '''
+    Appends entries to growing arrays, see HarColumns.from_entries
+    '''
+
+    def __init__(self):
+        self.numbers = OrderedDict(
+            (name, array(typecode)) for name, typecode in NUMBER_COLUMNS)
+        self.codes = OrderedDict(
+            (name, array('i')) for name in CATEGORY_COLUMNS)
+        self.categories = dict(
+            (name, []) for name in CATEGORY_COLUMNS)  # type: Dict[str, List]
+        self._lookup = dict(
+            (name, {}) for name in CATEGORY_COLUMNS)  # type: Dict[str, Dict]
+
+    def _encode(self, name, value):
+        # type: (str, Any) -> None
+        lookup = self._lookup[name]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(lookup)
+            self.categories[name].append(value)
+        self.codes[name].append(code)
+
+    def append(self, entry):
+        # type: (Any) -> None
+        '''
+        Appends an entry dict or HarEntry
+        '''
+        get = get_item if isinstance(entry, dict) else get_attr
+        request = get(entry, 'request')
+        response = get(entry, 'response')
+        timings = get(entry, 'timings')
+        content = get(response, 'content')
+        numbers = self.numbers
+
+        started = parse_iso_datetime_us(get(entry, 'startedDateTime'))
+        numbers['startedDateTime'].append(NAT if started is None else started)
+        numbers['time'].append(float(_number(get(entry, 'time'),
+                                             float('nan'))))
+        for phase in TIMING_PHASES:
+            numbers[phase].append(float(_number(get(timings, phase), -1)))
+        numbers['status'].append(int(_number(get(response, 'status'), -1)))
+        numbers['requestHeadersSize'].append(
+            int(_number(get(request, 'headersSize'), -1)))
+        numbers['requestBodySize'].append(
+            int(_number(get(request, 'bodySize'), -1)))
+        numbers['responseHeadersSize'].append(
+            int(_number(get(response, 'headersSize'), -1)))
+        numbers['responseBodySize'].append(
+            int(_number(get(response, 'bodySize'), -1)))
+
+        url = get(request, 'url') or ''
+        self._encode('url', url)
+        self._encode('host', url_host(url))
+        self._encode('method', (get(request, 'method') or '').upper())
+        mime_type = get(content, 'mimeType') or ''
+        self._encode('mimeType', mime_type.split(';', 1)[0].strip().lower())
+
+    def build(self):
+        # type: () -> HarColumns
+        columns = OrderedDict()  # type: Dict[str, Any]
+        for name, column in list(self.numbers.items()) + list(
+                self.codes.items()):
+            if numpy is not None:
+                # a view of the array, which is no longer appended to
+                column = numpy.frombuffer(column, dtype=column.typecode)
+            columns[name] = column
+        return HarColumns(columns, self.categories, self._lookup)
+
+
+def _compress(column, mask):
+    # type: (Any, Any) -> Any
+    if numpy is not None:
+        return column[numpy.asarray(mask, dtype=bool)]
+    return array(column.typecode, [
+        value for value, keep in zip(column, mask) if keep])
+
+
+def _take(column, indices):
+    # type: (Any, Any) -> Any
+    if numpy is not None:
+        return column[numpy.asarray(indices, dtype=numpy.intp)]
+    return array(column.typecode, [column[i] for i in indices])
+
+
+class HarColumns(object):
+    '''
+    Fixed fields of a sequence of entries, one array per column. Indexing
+    by name returns the array, which for string columns holds codes into
+    the list of distinct values in categories, see code() and decode().
+    '''
+
+    def __init__(self, columns, categories, lookup=None):
+        # type: (Dict[str, Any], Dict[str, List], Optional[Dict]) -> None
+        self.columns = columns
+        self.categories = categories
+        # the code of each value of categories, by column name
+        self._lookup = lookup
+
+    @classmethod
+    def from_entries(cls, entries):
+        # type: (Iterable[Any]) -> HarColumns
+        '''
+        Builds columns from entry dicts or HarEntry objects, which are not
+        kept, so entries may be a generator over a large file.
+        '''
+        builder = ColumnBuilder()
+        for entry in entries:
+            builder.append(entry)
+        return builder.build()
+
+    @classmethod
+    def from_file(cls, path):
+        # type: (Any) -> HarColumns
+        '''
+        Builds columns from a HAR file, which may be compressed, holding one
+        entry dict in memory at a time.
+        '''
+        with compression.open_reader(path) as stream:
+            return cls.from_entries(HarStreamReader(stream).iter_dicts())
+
+    @classmethod
+    def from_log(cls, log):
+        # type: (Any) -> HarColumns
+        '''
+        Builds columns from a HarLog, in which unbuilt entries of a lazy
+        list are read from their dicts without building them.
+        '''
+        entries = log.entries
+        raw = getattr(entries, 'raw', None)
+        if raw is not None:
+            entries = (raw(pos) for pos in range(len(entries)))
+        return cls.from_entries(entries)
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.columns['time'])
+
+    def __getitem__(self, name):
+        # type: (str) -> Any
+        return self.columns[name]
+
+    def __contains__(self, name):
+        # type: (str) -> bool
+        return name in self.columns
+
+    def __repr__(self):
+        # type: () -> str
+        return '<%s of %d entries>' % (self.__class__.__name__, len(self))
+
+    def code(self, name, value):
+        # type: (str, Any) -> int
+        '''
+        Code of a value in a string column, or -1 if no entry has it
+        '''
+        if self._lookup is None:
+            self._lookup = dict(
+                (column, dict((v, code) for code, v in enumerate(values)))
+                for column, values in self.categories.items())
+        return self._lookup[name].get(value, -1)
+
+    def decode(self, name):
+        # type: (str) -> List[Any]
+        '''
+        The values of a string column, one per entry
+        '''
+        values = self.categories[name]
+        return [values[code] for code in self.columns[name]]
+
+    def mask(self, name, value):
+        # type: (str, Any) -> Any
+        '''
+        Which entries have the value in a column, as a boolean array with
+        NumPy and a list otherwise. String columns compare values, not
+        codes.
+        '''
+        column = self.columns[name]
+        if name in self.categories:
+            value = self.code(name, value)
+        if numpy is not None:
+            return column == value
+        return [v == value for v in column]
+
+    def filter(self, mask):
+        # type: (Any) -> HarColumns
+        '''
+        The entries at which mask is true, which may be a boolean array,
+        as from comparing columns, or a sequence of booleans.
+        '''
+        return HarColumns(
+            OrderedDict((name, _compress(column, mask))
+                        for name, column in self.columns.items()),
+            self.categories, self._lookup)
+
+    def take(self, indices):
+        # type: (Any) -> HarColumns
+        return HarColumns(
+            OrderedDict((name, _take(column, indices))
+                        for name, column in self.columns.items()),
+            self.categories, self._lookup)
+
+    def where(self, **conditions):
+        # type: (**Any) -> HarColumns
+        '''
+        The entries equal to every value given by column name, as in
+        columns.where(method='GET', status=200)
+        '''
+        mask = None
+        for name, value in sorted(conditions.items()):
+            matches = self.mask(name, value)
+            if mask is None:
+                mask = matches
+            elif numpy is not None:
+                mask = mask & matches
+            else:
+                mask = [a and b for a, b in zip(mask, matches)]
+        return self if mask is None else self.filter(mask)
+
+    def group_indices(self, name):
+        # type: (str) -> List[Tuple[Any, Any]]
+        '''
+        (value, indices of the entries with it) for each distinct value of
+        a column, by increasing value, or code for string columns
+        '''
+        column = self.columns[name]
+        if numpy is not None:
+            order = numpy.argsort(column, kind='stable')
+            ordered = column[order]
+            starts = numpy.flatnonzero(ordered[1:] != ordered[:-1]) + 1
+            keys = ordered[numpy.concatenate(([0], starts))] \
+                if len(column) else ordered
+            groups = list(zip(keys.tolist(), numpy.split(order, starts)))
+        else:
+            indices = {}  # type: Dict[Any, List[int]]
+            for pos, key in enumerate(column):
+                indices.setdefault(key, []).append(pos)
+            groups = sorted(indices.items())
+        values = self.categories.get(name)
+        if values is not None:
+            groups = [(values[code], group) for code, group in groups]
+        return groups
+
+    def group_by(self, name):
+        # type: (str) -> OrderedDict
+        '''
+        HarColumns of the entries of each distinct value of a column
+        '''
+        return OrderedDict((key, self.take(indices))
+                           for key, indices in self.group_indices(name))
+
+    def aggregate(self, by, name, func):
+        # type: (str, str, Callable) -> OrderedDict
+        '''
+        func of the values of column name in each group of column by, as in
+        columns.aggregate('host', 'time', numpy.median)
+        '''
+        column = self.columns[name]
+        return OrderedDict((key, func(_take(column, indices)))
+                           for key, indices in self.group_indices(by))
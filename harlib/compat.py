@@ -7,74 +7,112 @@
 # This library ("it") is free software; it is distributed in the hope that it
 # will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
 # modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Names that differ between Python versions and vendored packages. The HTTP
+libraries are only imported when one of their names is first used (PY3.7+,
+see PEP 562), so reading HAR files does not pay for importing them.
+'''
 from __future__ import absolute_import
+import sys
+from array import array
 
 # OrderedDict
 try:
     from collections import OrderedDict
 except ImportError:
     from ordereddict import OrderedDict
-    
-# requestsb (requests, but prioritize botocore)
-try:
-    from botocore.vendored import requests as requestsb
-except ImportError:
-    import requests as requestsb
 
-# requests
-try:
-    import requests
-except ImportError:
-    from botocore.vendored import requests
+# dict class of plain JSON output, a dict wherever it keeps insertion order
+JSON_DICT = dict if sys.version_info >= (3, 7) else OrderedDict
 
-# requests.RequestException
+# array typecode of 64-bit integers
 try:
-    from requests.exceptions import RequestException
-except ImportError:
-    from botocore.vendored.requests.exceptions import RequestException
+    array('q')
+    INT64 = 'q'
+except ValueError:  # Python 2
+    INT64 = 'l'
 
-# requests.Request, Response
-try:
-    from requests.models import Request, Response
-except ImportError:
-    from botocore.vendored.requests.models import Request, Response
+HTTP_NAMES = frozenset([
+    'requestsb', 'requests', 'RequestException', 'Request', 'Response',
+    'Session', 'DEFAULT_STREAM', 'urllib3', 'urllib3r', 'urllib3rb'])
 
-# requests.Session
-try:
-    from requests.sessions import Session
-except ImportError:
-    from botocore.vendored.requests.sessions import Session
 
-# requests.adapters.DEFAULT_STREAM
-try:
-    from requests.adapters import DEFAULT_STREAM
-except ImportError:
-    DEFAULT_STREAM = False
+def _import_http():
+    # requestsb (requests, but prioritize botocore)
+    try:
+        from botocore.vendored import requests as requestsb
+    except ImportError:
+        import requests as requestsb
 
-# urllib3
-try:
-    import urllib3
-except ImportError:
+    # requests
     try:
-        from requests.packages import urllib3
+        import requests
     except ImportError:
-        from botocore.vendored.requests.packages import urllib3
+        from botocore.vendored import requests
 
-# urllib3r (urllib3, but prioritize requests)
-try:
-    from requests.packages import urllib3 as urllib3r
-except ImportError:
+    # requests.RequestException
     try:
-        import urllib3 as urllib3r
+        from requests.exceptions import RequestException
     except ImportError:
-        from botocore.vendored.requests.packages import urllib3 as urllib3r
+        from botocore.vendored.requests.exceptions import RequestException
 
-# urllib3rb (urllib3, but prioritize botocore)
-try:
-    from botocore.vendored.requests.packages import urllib3 as urllib3rb
-except ImportError:
+    # requests.Request, Response
+    try:
+        from requests.models import Request, Response
+    except ImportError:
+        from botocore.vendored.requests.models import Request, Response
+
+    # requests.Session
+    try:
+        from requests.sessions import Session
+    except ImportError:
+        from botocore.vendored.requests.sessions import Session
+
+    # requests.adapters.DEFAULT_STREAM
+    try:
+        from requests.adapters import DEFAULT_STREAM
+    except ImportError:
+        DEFAULT_STREAM = False
+
+    # urllib3
     try:
-        from requests.packages import urllib3 as urllib3rb
+        import urllib3
     except ImportError:
-        import urllib3 as urllib3rb
-        
+        try:
+            from requests.packages import urllib3
+        except ImportError:
+            from botocore.vendored.requests.packages import urllib3
+
+    # urllib3r (urllib3, but prioritize requests)
+    try:
+        from requests.packages import urllib3 as urllib3r
+    except ImportError:
+        try:
+            import urllib3 as urllib3r
+        except ImportError:
+            from botocore.vendored.requests.packages import urllib3 as urllib3r
+
+    # urllib3rb (urllib3, but prioritize botocore)
+    try:
+        from botocore.vendored.requests.packages import urllib3 as urllib3rb
+    except ImportError:
+        try:
+            from requests.packages import urllib3 as urllib3rb
+        except ImportError:
+            import urllib3 as urllib3rb
+
+    return dict((name, value) for name, value in locals().items()
+                if name in HTTP_NAMES)
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in HTTP_NAMES:
+            globals().update(_import_http())
+            return globals()[name]
+        raise AttributeError('module %s has no attribute %s' % (
+            __name__, repr(name)))
+else:
+    globals().update(_import_http())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Transparent gzip, bz2, xz and zlib compression of HAR files. Readers detect
+the format from magic bytes (or the file name when they cannot peek), and
+writers from the file name; both stream chunk by chunk. The default level
+comes from HARLIB_COMPRESSLEVEL.
+'''
+from __future__ import absolute_import
+import bz2
+import codecs
+import contextlib
+import gzip
+import io
+import os
+import zlib
+import six
+
+try:
+    import lzma
+except ImportError:  # PY2
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+
+try:
+    from typing import Any, Iterator, Optional, TextIO
+except ImportError:
+    pass
+
+CHUNK_SIZE = 1 << 16
+
+COMPRESS_LEVEL = int(os.environ.get('HARLIB_COMPRESSLEVEL') or 6)
+
+EXTENSIONS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'xz',
+    '.zz': 'zlib',
+    '.zlib': 'zlib',
+}
+
+MAGIC_SIZE = 6
+
+
+def detect_compression(head=None, filename=None):
+    # type: (Optional[bytes], Optional[str]) -> Optional[str]
+    '''
+    Returns gzip, bz2, xz, zlib or None, from the first bytes of a file if
+    given, otherwise from its file name.
+    '''
+    if head is not None:
+        head = bytearray(head[:MAGIC_SIZE])
+        if head.startswith(b'\x1f\x8b'):
+            return 'gzip'
+        if head.startswith(b'BZh'):
+            return 'bz2'
+        if head.startswith(b'\xfd7zXZ\x00'):
+            return 'xz'
+        # CMF 8 (deflate, 32K window) with a valid FCHECK; a JSON document
+        # never starts with "x"
+        if (len(head) >= 2 and head[0] == 0x78 and
+                (head[0] << 8 | head[1]) % 31 == 0):
+            return 'zlib'
+        return None
+    if isinstance(filename, six.string_types):
+        return EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+    return None
+
+
+class _DecompressingReader(io.RawIOBase):
+    '''
+    Binary reader that feeds fileobj through a decompressor object.
+    '''
+
+    def __init__(self, fileobj, decompressor):
+        self._fileobj = fileobj
+        self._decompressor = decompressor
+        self._pending = b''
+        self._eof = False
+
+    def readable(self):
+        # type: () -> bool
+        return True
+
+    def readinto(self, b):
+        while not self._pending and not self._eof:
+            chunk = self._fileobj.read(CHUNK_SIZE)
+            if chunk:
+                self._pending = self._decompressor.decompress(chunk)
+            else:
+                self._eof = True
+                flush = getattr(self._decompressor, 'flush', None)
+                self._pending = flush() if flush else b''
+        size = min(len(b), len(self._pending))
+        b[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class _CompressingWriter(io.RawIOBase):
+    '''
+    Binary writer that feeds a compressor object into fileobj.
+    '''
+
+    def __init__(self, fileobj, compressor):
+        self._fileobj = fileobj
+        self._compressor = compressor
+
+    def writable(self):
+        # type: () -> bool
+        return True
+
+    def write(self, b):
+        data = self._compressor.compress(b)
+        if data:
+            self._fileobj.write(data)
+        return len(b)
+
+    def close(self):
+        # type: () -> None
+        if not self.closed:
+            self._fileobj.write(self._compressor.flush())
+            self._fileobj.flush()
+        super(_CompressingWriter, self).close()
+
+
+def _lzma():
+    if lzma is None:
+        raise ValueError('xz compression needs the lzma module')
+    return lzma
+
+
+def _decompressing(fileobj, compression):
+    # type: (Any, str) -> Any
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=fileobj, mode='rb')
+    if compression == 'xz':
+        return _lzma().LZMAFile(fileobj, 'rb')
+    if compression == 'bz2':
+        if six.PY3:
+            return bz2.BZ2File(fileobj, 'rb')
+        decompressor = bz2.BZ2Decompressor()
+    elif compression == 'zlib':
+        decompressor = zlib.decompressobj()
+    else:
+        raise ValueError('unknown compression %s' % repr(compression))
+    return io.BufferedReader(_DecompressingReader(fileobj, decompressor),
+                             CHUNK_SIZE)
+
+
+def _compressing(fileobj, compression, level=None):
+    # type: (Any, str, Optional[int]) -> Any
+    level = COMPRESS_LEVEL if level is None else level
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=level)
+    if compression == 'xz':
+        return _lzma().LZMAFile(fileobj, 'wb', preset=level)
+    if compression == 'bz2':
+        level = max(level, 1)
+        if six.PY3:
+            return bz2.BZ2File(fileobj, 'wb', compresslevel=level)
+        compressor = bz2.BZ2Compressor(level)
+    elif compression == 'zlib':
+        compressor = zlib.compressobj(level)
+    else:
+        raise ValueError('unknown compression %s' % repr(compression))
+    return _CompressingWriter(fileobj, compressor)
+
+
+def _peek(fileobj):
+    # type: (Any) -> Optional[bytes]
+    peek = getattr(fileobj, 'peek', None)
+    if peek is not None:
+        return peek(MAGIC_SIZE)[:MAGIC_SIZE]
+    try:
+        pos = fileobj.tell()
+        head = fileobj.read(MAGIC_SIZE)
+        fileobj.seek(pos)
+        return head
+    except (AttributeError, IOError, OSError, ValueError):
+        return None
+
+
+@contextlib.contextmanager
+def open_reader(source):
+    # type: (Any) -> Iterator[Any]
+    '''
+    Yields a reader of the decompressed contents of source, a file name or
+    a file object. Only what was opened here is closed afterwards; text
+    file objects are passed through as they are.
+    '''
+    fileobj = source
+    if isinstance(source, six.string_types):
+        fileobj = open(source, 'rb')
+    try:
+        if isinstance(fileobj.read(0), six.text_type):
+            yield fileobj
+            return
+        head = _peek(fileobj)
+        compression = detect_compression(
+            head, None if head is not None else getattr(fileobj, 'name', None))
+        if compression is None:
+            yield fileobj
+            return
+        reader = _decompressing(fileobj, compression)
+        try:
+            yield reader
+        finally:
+            reader.close()
+    finally:
+        if fileobj is not source:
+            fileobj.close()
+
+
+@contextlib.contextmanager
+def open_writer(target, compression=None, level=None):
+    # type: (Any, Optional[str], Optional[int]) -> Iterator[TextIO]
+    '''
+    Yields a text writer that compresses into target, a file name or a
+    binary file object. With compression=None it follows the file name,
+    so text file objects and plain names are written uncompressed.
+    '''
+    is_name = isinstance(target, six.string_types)
+    # a file object opened in text mode by the caller is written as is
+    if compression is None and (
+            is_name or 'b' in str(getattr(target, 'mode', ''))):
+        compression = detect_compression(
+            filename=target if is_name else getattr(target, 'name', None))
+    if compression is None and not is_name:
+        yield target
+        return
+
+    fileobj = open(target, 'wb') if is_name else target
+    try:
+        stream = fileobj
+        if compression is not None:
+            stream = _compressing(fileobj, compression, level)
+        try:
+            yield codecs.getwriter('utf-8')(stream)
+        finally:
+            if stream is not fileobj:
+                stream.close()
+    finally:
+        if fileobj is not target:
+            fileobj.close()
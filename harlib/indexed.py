@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Random access into large HAR files through a sidecar index (.harx) of the
+byte offsets of every element of log.entries. The index is rebuilt whenever
+the size or mtime of the HAR file no longer matches the one it was built for.
+'''
+from __future__ import absolute_import
+from array import array
+from collections import Sequence
+import logging
+import mmap
+import os
+import struct
+import sys
+from . import jsonlib
+from .compat import OrderedDict
+from .streaming import HarStreamReader
+
+try:
+    from typing import Any, Dict, Optional, Tuple
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+HARX_SUFFIX = '.harx'
+HARX_MAGIC = b'HARX'
+HARX_VERSION = 1
+
+# magic, version, offset itemsize, HAR size, HAR mtime (ns), entry count,
+# header length
+_HARX_HEADER = struct.Struct('<4sHHQQQQ')
+
+try:
+    _OFFSET_TYPECODE = 'Q'
+    array(_OFFSET_TYPECODE)
+except ValueError:  # PY2
+    _OFFSET_TYPECODE = 'L'
+
+
+def _stat_key(path):
+    # type: (str) -> Tuple[int, int]
+    st = os.stat(path)
+    mtime_ns = getattr(st, 'st_mtime_ns', None)
+    if mtime_ns is None:
+        mtime_ns = int(st.st_mtime * 1e9)
+    return st.st_size, mtime_ns
+
+
+class HarIndex(object):
+    '''
+    Offsets of log.entries in a HAR file, plus the other log fields.
+    '''
+
+    def __init__(self, offsets, header, size, mtime_ns):
+        # type: (array, Dict[str, Any], int, int) -> None
+        self.offsets = offsets  # start0, end0, start1, end1, ...
+        self.header = header
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.offsets) // 2
+
+    def span(self, index):
+        # type: (int) -> Tuple[int, int]
+        return self.offsets[2 * index], self.offsets[2 * index + 1]
+
+    @classmethod
+    def build(cls, path):
+        # type: (str) -> HarIndex
+        size, mtime_ns = _stat_key(path)
+        offsets = array(_OFFSET_TYPECODE)
+        with open(path, 'rb') as reader:
+            stream = HarStreamReader(reader, decode=False)
+            for start, end in stream.iter_spans():
+                offsets.append(start)
+                offsets.append(end)
+            header = stream.read_header(complete=True)
+        return cls(offsets, header, size, mtime_ns)
+
+    @classmethod
+    def load(cls, index_path):
+        # type: (str) -> HarIndex
+        with open(index_path, 'rb') as reader:
+            (magic, version, itemsize, size, mtime_ns, count,
+             header_size) = _HARX_HEADER.unpack(
+                 reader.read(_HARX_HEADER.size))
+            offsets = array(_OFFSET_TYPECODE)
+            if (magic != HARX_MAGIC or version != HARX_VERSION or
+                    itemsize != offsets.itemsize):
+                raise ValueError('%s is not a usable index' % index_path)
+            offsets.fromfile(reader, 2 * count)
+            if sys.byteorder != 'little':
+                offsets.byteswap()
+            header = jsonlib.loads(reader.read(header_size).decode('utf-8'),
+                                   ordered=True)
+        return cls(offsets, header, size, mtime_ns)
+
+    def save(self, index_path):
+        # type: (str) -> None
+        offsets = array(_OFFSET_TYPECODE, self.offsets)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        header = jsonlib.dumps(self.header).encode('utf-8')
+        temp_path = '%s.%d.tmp' % (index_path, os.getpid())
+        with open(temp_path, 'wb') as writer:
+            writer.write(_HARX_HEADER.pack(
+                HARX_MAGIC, HARX_VERSION, offsets.itemsize,
+                self.size, self.mtime_ns, len(self), len(header)))
+            offsets.tofile(writer)
+            writer.write(header)
+        os.rename(temp_path, index_path)
+
+    def is_current(self, path):
+        # type: (str) -> bool
+        return (self.size, self.mtime_ns) == _stat_key(path)
+
+
+class HarIndexedEntries(Sequence):
+    '''
+    Sequence of entry dicts, each parsed from its own slice of the mmap,
+    which is held until close().
+    '''
+
+    def __init__(self, buf, index):
+        # type: (mmap.mmap, HarIndex) -> None
+        self._buf = buf
+        self._index = index
+
+    def __enter__(self):
+        # type: () -> HarIndexedEntries
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        if self._buf is not None:
+            self._buf.close()
+        self._buf = None
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._index)
+
+    def __getitem__(self, index):
+        # type: (int) -> Dict[str, Any]
+        if index < 0:
+            index += len(self._index)
+        if not 0 <= index < len(self._index):
+            raise IndexError('entry index out of range')
+        if self._buf is None:
+            raise ValueError('entries of a closed HAR file')
+        start, end = self._index.span(index)
+        return jsonlib.loads(self._buf[start:end])
+
+
+def get_index(path, index_path=None):
+    # type: (str, Optional[str]) -> HarIndex
+    '''
+    Returns the index of path, reusing the sidecar file if it is current.
+    '''
+    index_path = index_path or path + HARX_SUFFIX
+    if os.path.exists(index_path):
+        try:
+            index = HarIndex.load(index_path)
+            if index.is_current(path):
+                return index
+        except (EOFError, IOError, OSError, ValueError, struct.error) as err:
+            logger.debug('rebuilding %s: %s' % (index_path, repr(err)))
+
+    index = HarIndex.build(path)
+    try:
+        index.save(index_path)
+    except (IOError, OSError) as err:
+        logger.warning('could not write %s: %s' % (index_path, repr(err)))
+    return index
+
+
+def open_indexed(path, index_path=None):
+    # type: (str, Optional[str]) -> Any
+    '''
+    Returns a lazy HarFile whose entries are read through a memory map of
+    path, until it is closed with HarFile.close() or a with block.
+    '''
+    from .objects import HarFile
+    index = get_index(path, index_path)
+    with open(path, 'rb') as reader:
+        buf = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+    log = OrderedDict(index.header)
+    log['entries'] = HarIndexedEntries(buf, index)
+    return HarFile({'log': log}, lazy=True)
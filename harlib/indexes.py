@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Secondary indexes on the entries of a log, see HarLog.index and
+HarLog.range_index:
+
+    log.index('host').positions('example.com')
+    log.index('host', 'status').entries(('example.com', 404))
+    log.range_index('time').between(1000, None)
+    log.time_index().nearest('2017-07-31T20:28:29.360Z')
+
+Keys are read from the entry dicts of lazy lists, so indexing does not
+build entries. An index is built on its first lookup, and each lookup
+first adds the entries appended to the log since the last one. After
+entries are removed, replaced or reordered in place, or their indexed
+fields changed, call HarLog.reindex. Replacing log.entries, or removing
+entries so that there are fewer than were indexed, is noticed.
+'''
+from __future__ import absolute_import
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Sequence
+import heapq
+import six
+from six.moves import range
+from .compat import INT64, OrderedDict
+from .utils import get_attr, get_item, parse_iso_datetime_ns, url_host
+
+try:
+    from typing import Any, Callable, Dict, List, Optional, Tuple
+except ImportError:
+    pass
+
+
+def _url(entry, get):
+    # type: (Any, Callable) -> str
+    return get(get(entry, 'request'), 'url') or ''
+
+
+def _host(entry, get):
+    # type: (Any, Callable) -> str
+    return url_host(_url(entry, get))
+
+
+def _method(entry, get):
+    # type: (Any, Callable) -> str
+    return (get(get(entry, 'request'), 'method') or '').upper()
+
+
+def _status(entry, get):
+    # type: (Any, Callable) -> Optional[int]
+    return get(get(entry, 'response'), 'status')
+
+
+def _pageref(entry, get):
+    # type: (Any, Callable) -> Optional[str]
+    return get(entry, 'pageref')
+
+
+def _mime_type(entry, get):
+    # type: (Any, Callable) -> str
+    content = get(get(entry, 'response'), 'content')
+    mime_type = get(content, 'mimeType') or ''
+    return mime_type.split(';', 1)[0].strip().lower()
+
+
+def _started(entry, get):
+    # type: (Any, Callable) -> Optional[int]
+    return parse_iso_datetime_ns(get(entry, 'startedDateTime'))
+
+
+def _time(entry, get):
+    # type: (Any, Callable) -> Optional[float]
+    time = get(entry, 'time')
+    return None if time is None or time == '' else float(time)
+
+
+# functions from an entry dict or HarEntry, and the function reading its
+# fields, to the key of the entry, normalized as in harlib.columnar
+KEY_FUNCTIONS = OrderedDict([
+    ('url', _url),
+    ('host', _host),
+    ('method', _method),
+    ('status', _status),
+    ('pageref', _pageref),
+    ('mimeType', _mime_type),
+    ('startedDateTime', _started),  # nanoseconds since the epoch
+    ('time', _time),
+])
+
+# array typecodes of the sorted keys of range indexes, lists otherwise
+_RANGE_TYPECODES = {'startedDateTime': INT64, 'time': 'd'}
+
+
+def _key_function(name):
+    # type: (str) -> Callable
+    try:
+        return KEY_FUNCTIONS[name]
+    except KeyError:
+        raise ValueError('cannot index entries by %s, only by %s' % (
+            repr(name), ', '.join(KEY_FUNCTIONS)))
+
+
+class EntryView(Sequence):
+    '''
+    Entries of a log at a sequence of positions, read as they are accessed,
+    so entries of a lazy list are only built if used
+    '''
+
+    def __init__(self, entries, positions):
+        # type: (Any, Any) -> None
+        self._entries = entries
+        self.positions = positions
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return EntryView(self._entries, self.positions[index])
+        return self._entries[self.positions[index]]
+
+    def __repr__(self):
+        # type: () -> str
+        return '<%s of %d entries>' % (self.__class__.__name__, len(self))
+
+
+class EntryIndex(object):
+    '''
+    Superclass of indexes on the entries of a log, which keeps them up to
+    date with appended entries
+    '''
+
+    def __init__(self, log, names):
+        # type: (Any, Tuple[str, ...]) -> None
+        self.log = log
+        self.names = tuple(names)
+        self._functions = [_key_function(name) for name in self.names]
+        self._entries = None  # the list that was indexed
+        self._count = 0
+        self._clear()
+
+    def __repr__(self):
+        # type: () -> str
+        return '<%s on %s of %d entries>' % (
+            self.__class__.__name__, ', '.join(self.names), self._count)
+
+    def _clear(self):
+        # type: () -> None
+        raise NotImplementedError
+
+    def _add(self, pos, key):
+        # type: (int, Any) -> None
+        raise NotImplementedError
+
+    def _added(self):
+        # type: () -> None
+        pass
+
+    def rebuild(self):
+        # type: () -> None
+        '''
+        Indexes every entry again on the next lookup
+        '''
+        self._entries = None
+
+    def update(self):
+        # type: () -> EntryIndex
+        '''
+        Indexes the entries appended since the last lookup, or every entry
+        if log.entries was replaced or shortened
+        '''
+        entries = self.log.entries
+        if entries is not self._entries or len(entries) < self._count:
+            self._entries = entries
+            self._count = 0
+            self._clear()
+        end = len(entries)
+        if end == self._count:
+            return self
+        read = getattr(entries, 'raw', entries.__getitem__)
+        functions = self._functions
+        function = functions[0] if len(functions) == 1 else None
+        for pos in range(self._count, end):
+            entry = read(pos)
+            get = get_item if isinstance(entry, dict) else get_attr
+            if function is not None:
+                key = function(entry, get)
+            else:
+                key = tuple(f(entry, get) for f in functions)
+            self._add(pos, key)
+        self._count = end
+        self._added()
+        return self
+
+    def view(self, positions):
+        # type: (Any) -> EntryView
+        return EntryView(self._entries, positions)
+
+
+class HashIndex(EntryIndex):
+    '''
+    Positions of the entries with each value of a key, or each tuple of
+    values of several keys, in the order of the log
+    '''
+
+    def _clear(self):
+        # type: () -> None
+        self._positions = {}  # type: Dict[Any, Any]
+
+    def _add(self, pos, key):
+        # type: (int, Any) -> None
+        positions = self._positions.get(key)
+        if positions is None:
+            positions = self._positions[key] = array('i')
+        positions.append(pos)
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.update()._positions)
+
+    def __contains__(self, key):
+        # type: (Any) -> bool
+        return key in self.update()._positions
+
+    def keys(self):
+        # type: () -> List[Any]
+        return list(self.update()._positions)
+
+    def counts(self):
+        # type: () -> Dict[Any, int]
+        '''
+        Number of entries with each key
+        '''
+        return dict((key, len(positions)) for key, positions in
+                    six.iteritems(self.update()._positions))
+
+    def positions(self, key):
+        # type: (Any) -> List[int]
+        '''
+        Positions of the entries with the key, a tuple for several names
+        '''
+        return list(self.update()._positions.get(key, ()))
+
+    def entries(self, key):
+        # type: (Any) -> EntryView
+        return self.view(self.positions(key))
+
+
+class RangeIndex(EntryIndex):
+    '''
+    Positions of the entries sorted by one key, for range queries. Entries
+    without the key are left out. Entries appended in order of the key,
+    as startedDateTime usually is, are added without sorting again, and
+    others are merged into the keys from the first that follows them.
+    '''
+
+    def __init__(self, log, names):
+        # type: (Any, Tuple[str, ...]) -> None
+        if len(names) != 1:
+            raise ValueError('range indexes have one key, not %d' % (
+                len(names)))
+        super(RangeIndex, self).__init__(log, names)
+
+    def _clear(self):
+        # type: () -> None
+        typecode = _RANGE_TYPECODES.get(self.names[0])
+        self._keys = [] if typecode is None else array(typecode)
+        self._positions = array('i')
+        self._pending = []  # type: List[Tuple[Any, int]]
+
+    def _add(self, pos, key):
+        # type: (int, Any) -> None
+        if key is None or key != key:  # missing or NaN
+            return
+        keys = self._keys
+        if self._pending or (keys and key < keys[-1]):
+            self._pending.append((key, pos))
+        else:
+            keys.append(key)
+            self._positions.append(pos)
+
+    def _added(self):
+        # type: () -> None
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+        # positions break ties, so equal keys stay in the order of the log
+        pending.sort()
+        keys = self._keys
+        positions = self._positions
+        start = bisect_right(keys, pending[0][0])
+        merged = list(heapq.merge(
+            list(zip(keys[start:], positions[start:])), pending))
+        del keys[start:]
+        del positions[start:]
+        keys.extend(key for key, _ in merged)
+        positions.extend(pos for _, pos in merged)
+
+    def __len__(self):
+        # type: () -> int
+        return len(self.update()._keys)
+
+    def _bound(self, value):
+        # type: (Any) -> Any
+        if self.names[0] != 'startedDateTime' or isinstance(
+                value, six.integer_types + (float,)):
+            return value
+        if not isinstance(value, six.string_types):
+            value = value.isoformat()  # datetime
+        bound = parse_iso_datetime_ns(value)
+        if bound is None:
+            raise ValueError('%s is not an ISO 8601 date and time' % (
+                repr(value)))
+        return bound
+
+    def between(self, low=None, high=None):
+        # type: (Any, Any) -> List[int]
+        '''
+        Positions of the entries with keys from low to high, both included
+        and either left out for no bound, by increasing key. Bounds of
+        startedDateTime may be nanoseconds since the epoch, ISO 8601
+        strings or datetimes, which are taken as UTC without a timezone.
+        '''
+        self.update()
+        keys = self._keys
+        start = 0 if low is None else bisect_left(keys, self._bound(low))
+        end = len(keys) if high is None else \
+            bisect_right(keys, self._bound(high))
+        return list(self._positions[start:end]) if start < end else []
+
+    def entries_between(self, low=None, high=None):
+        # type: (Any, Any) -> EntryView
+        return self.view(self.between(low, high))
+
+    def before(self, value, inclusive=False):
+        # type: (Any, bool) -> List[int]
+        '''
+        Positions of the entries with keys less than value, or up to it if
+        inclusive, by increasing key
+        '''
+        self.update()
+        find = bisect_right if inclusive else bisect_left
+        return list(self._positions[:find(self._keys, self._bound(value))])
+
+    def after(self, value, inclusive=False):
+        # type: (Any, bool) -> List[int]
+        '''
+        Positions of the entries with keys greater than value, or from it
+        if inclusive, by increasing key
+        '''
+        self.update()
+        find = bisect_left if inclusive else bisect_right
+        return list(self._positions[find(self._keys, self._bound(value)):])
+
+    def nearest(self, value):
+        # type: (Any) -> Optional[int]
+        '''
+        Position of the entry with the key closest to value, the first in
+        the log of those at the same distance, or None without entries
+        '''
+        self.update()
+        keys = self._keys
+        if not len(keys):
+            return None
+        value = self._bound(value)
+        pos = bisect_left(keys, value)
+        if pos == len(keys):
+            pos = bisect_left(keys, keys[pos - 1])
+        elif pos:
+            # the first entry with the lower key if it is closer, or as
+            # close and earlier in the log than the first with the higher
+            lower = bisect_left(keys, keys[pos - 1])
+            below = value - keys[pos - 1]
+            above = keys[pos] - value
+            if below < above or below == above and \
+                    self._positions[lower] < self._positions[pos]:
+                pos = lower
+        return self._positions[pos]
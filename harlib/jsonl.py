@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+JSON Lines variant of HAR: one compact entry per line, so files can be
+appended to, split and tailed. An optional line of the form {"log": {...}}
+carries the other log fields; entries never have a "log" key. Such lines
+after the first entry hold fields that followed "entries" in the HAR file.
+'''
+from __future__ import absolute_import
+from six.moves import range
+from . import jsonlib
+from .compat import OrderedDict
+from .objects import HarEntry, HarFile, HarLazyList, HarLog
+from .streaming import HarStreamReader, HarStreamWriter
+
+try:
+    from typing import Any, Dict, Iterable, Iterator, TextIO
+except ImportError:
+    pass
+
+SEPARATORS = (',', ':')
+
+
+def dumps_line(obj):
+    # type: (Any) -> str
+    if hasattr(obj, 'to_json'):
+        obj = obj.to_json()
+    return jsonlib.dumps(obj, separators=SEPARATORS) + u'\n'
+
+
+def _iter_entries(o):
+    # type: (Any) -> Iterator[Any]
+    entries = o.entries if isinstance(o, HarLog) else o
+    if isinstance(entries, HarLazyList):
+        # unbuilt entries are written from their dicts
+        for pos in range(len(entries)):
+            yield entries.raw(pos)
+    else:
+        for entry in entries:
+            yield entry
+
+
+def dump_jsonl(o, writer, header=True):
+    # type: (Any, TextIO, bool) -> int
+    '''
+    Writes a HarFile, HarLog or iterable of entries as JSON Lines, and
+    returns the number of entries written.
+    '''
+    if isinstance(o, HarFile):
+        o = o.log
+    if header and isinstance(o, HarLog):
+        writer.write(dumps_line({'log': o.header_to_json()}))
+    count = 0
+    for entry in _iter_entries(o):
+        writer.write(dumps_line(entry))
+        count += 1
+    return count
+
+
+def iter_jsonl_lines(reader):
+    # type: (Iterable[str]) -> Iterator[Dict[str, Any]]
+    '''
+    Yields every line as a dict, including {"log": ...} lines.
+    '''
+    for line in reader:
+        if line.strip():
+            yield jsonlib.loads(line, ordered=True)
+
+
+def iter_jsonl_dicts(reader):
+    # type: (Iterable[str]) -> Iterator[Dict[str, Any]]
+    for d in iter_jsonl_lines(reader):
+        if 'log' not in d:
+            yield d
+
+
+def iter_jsonl(reader):
+    # type: (Iterable[str]) -> Iterator[HarEntry]
+    for d in iter_jsonl_dicts(reader):
+        yield HarEntry(d)
+
+
+def har_to_jsonl(reader, writer):
+    # type: (TextIO, TextIO) -> int
+    '''
+    Converts a HAR file to JSON Lines, one entry at a time.
+    '''
+    stream = HarStreamReader(reader)
+    header = OrderedDict(stream.read_header())
+    if header:
+        writer.write(dumps_line({'log': header}))
+    count = 0
+    for d in stream.iter_dicts():
+        writer.write(dumps_line(d))
+        count += 1
+    # fields that followed "entries"
+    trailer = OrderedDict((name, value) for name, value in stream.log.items()
+                          if name not in header)
+    if trailer:
+        writer.write(dumps_line({'log': trailer}))
+    return count
+
+
+def jsonl_to_har(reader, writer, **kwargs):
+    # type: (Iterable[str], TextIO, **Any) -> int
+    '''
+    Converts JSON Lines to a HAR file, one entry at a time. A file without
+    a {"log": ...} line gets the header of an empty HarLog.
+    '''
+    lines = iter_jsonl_lines(reader)
+    first = next(lines, None)
+    if first is not None and 'log' in first:
+        header = first['log']
+        first = None
+    else:
+        header = HarLog().header_to_json()
+    trailer = OrderedDict()
+    stream = HarStreamWriter(writer, header, **kwargs)
+    if first is not None:
+        stream.write_entry(first)
+    for d in lines:
+        if 'log' in d:
+            trailer.update(d['log'])
+        else:
+            stream.write_entry(d)
+    stream.close(trailer)
+    return stream.count
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Pluggable JSON backend. The fastest installed library is used for loading
+and, where it can reproduce the stdlib output byte for byte, for dumping;
+everything else falls back to the stdlib json module. Set HARLIB_JSON or
+call set_backend() to pin a backend.
+'''
+from __future__ import absolute_import
+import json
+import os
+import sys
+from .compat import OrderedDict
+
+try:
+    from typing import Any, Dict, Optional, TextIO
+except ImportError:
+    pass
+
+# plain dicts keep insertion order, so ordered loads need no hook
+ORDERED_DICTS = sys.version_info >= (3, 7)
+
+
+class StdlibBackend(object):
+    name = 'json'
+
+    def loads(self, s):
+        # type: (Any) -> Any
+        return json.loads(s)
+
+    def dumps(self, obj, **kwargs):
+        # type: (Any, **Any) -> Optional[str]
+        '''
+        Returns exactly json.dumps(obj, **kwargs), or None if this backend
+        cannot guarantee that for the given arguments.
+        '''
+        return json.dumps(obj, **kwargs)
+
+
+_DIGITS = frozenset(bytearray(b'0123456789.'))
+_NUMBER_PREFIXES = frozenset(bytearray(b':,[ \n-'))
+_EXPONENT_MARKERS = [bytes(bytearray([digit, ord('e')]))
+                     for digit in bytearray(b'0123456789')]
+
+
+def _number_starts_before(out, pos):
+    # type: (bytes, int) -> bool
+    while pos > 0 and out[pos - 1] in _DIGITS:
+        pos -= 1
+    return pos == 0 or out[pos - 1] in _NUMBER_PREFIXES
+
+
+def _has_exponent_repr(out):
+    # type: (bytes) -> bool
+    '''
+    True if out may hold a float whose repr() is in exponent form, which
+    orjson writes differently (1e16 for 1e+16) or not at all (0.00001 for
+    1e-05). Strings that merely look like one only cost a fallback.
+    '''
+    for marker in _EXPONENT_MARKERS:
+        pos = out.find(marker)
+        while pos != -1:
+            if _number_starts_before(out, pos):
+                return True
+            pos = out.find(marker, pos + 1)
+    pos = out.find(b'0.0000')
+    while pos != -1:
+        if pos == 0 or out[pos - 1] in _NUMBER_PREFIXES:
+            return True
+        pos = out.find(b'0.0000', pos + 1)
+    return False
+
+
+class OrjsonBackend(StdlibBackend):
+    name = 'orjson'
+
+    passthrough_kwargs = ('indent', 'separators', 'sort_keys',
+                          'ensure_ascii', 'default')
+
+    def __init__(self):
+        import orjson
+        self.orjson = orjson
+        self.options = 0
+        for name in ('OPT_PASSTHROUGH_DATETIME', 'OPT_PASSTHROUGH_DATACLASS'):
+            self.options |= getattr(orjson, name, 0)
+
+    def loads(self, s):
+        # type: (Any) -> Any
+        try:
+            return self.orjson.loads(s)
+        except ValueError:  # NaN, big ints, lone surrogates...
+            return json.loads(s)
+
+    def dumps(self, obj, **kwargs):
+        # type: (Any, **Any) -> Optional[str]
+        if any(key not in self.passthrough_kwargs for key in kwargs):
+            return None
+        indent = kwargs.get('indent')
+        options = self.options
+        if indent is None:
+            # json.dumps defaults to ', ' and ': ' without an indent
+            if tuple(kwargs.get('separators') or ()) != (',', ':'):
+                return None
+        elif indent == 2 or indent == '  ':
+            if tuple(kwargs.get('separators') or (',', ': ')) != (',', ': '):
+                return None
+            options |= self.orjson.OPT_INDENT_2
+        else:
+            return None
+        if kwargs.get('sort_keys'):
+            options |= self.orjson.OPT_SORT_KEYS
+        try:
+            out = self.orjson.dumps(obj, default=kwargs.get('default'),
+                                    option=options)
+        except TypeError:  # non-str keys, big ints, unserializable...
+            return None
+        if kwargs.get('ensure_ascii', True):
+            # the stdlib escapes all of these, orjson does not
+            if b'\x7f' in out or not out.isascii():
+                return None
+        # NaN and Infinity come out as null instead of NaN and Infinity
+        if b'null' in out or _has_exponent_repr(out):
+            return None
+        return out.decode('utf-8')
+
+
+class UjsonBackend(StdlibBackend):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self.ujson = ujson
+
+    def loads(self, s):
+        # type: (Any) -> Any
+        try:
+            return self.ujson.loads(s)
+        except (ValueError, OverflowError):
+            return json.loads(s)
+
+    def dumps(self, obj, **kwargs):
+        # type: (Any, **Any) -> Optional[str]
+        return None  # escapes "/" and formats floats differently
+
+
+class RapidjsonBackend(StdlibBackend):
+    name = 'rapidjson'
+
+    def __init__(self):
+        import rapidjson
+        self.rapidjson = rapidjson
+
+    def loads(self, s):
+        # type: (Any) -> Any
+        try:
+            return self.rapidjson.loads(s)
+        except ValueError:
+            return json.loads(s)
+
+    def dumps(self, obj, **kwargs):
+        # type: (Any, **Any) -> Optional[str]
+        return None  # formats floats differently
+
+
+BACKENDS = OrderedDict([
+    ('orjson', OrjsonBackend),
+    ('rapidjson', RapidjsonBackend),
+    ('ujson', UjsonBackend),
+    ('json', StdlibBackend),
+])
+
+_stdlib = StdlibBackend()
+_backend = None  # type: Optional[StdlibBackend]
+
+
+def available_backends():
+    # type: () -> Dict[str, StdlibBackend]
+    backends = OrderedDict()
+    for name, backend_class in BACKENDS.items():
+        try:
+            backends[name] = backend_class()
+        except ImportError:
+            pass
+    return backends
+
+
+def set_backend(name=None):
+    # type: (Optional[str]) -> StdlibBackend
+    '''
+    Pins the named backend, or picks the fastest installed one if None.
+    '''
+    global _backend
+    if name is None:
+        _backend = list(available_backends().values())[0]
+    elif name not in BACKENDS:
+        raise ValueError('unknown JSON backend %s' % repr(name))
+    else:
+        try:
+            _backend = BACKENDS[name]()
+        except ImportError:
+            raise ValueError('JSON backend %s is not installed' % name)
+    return _backend
+
+
+def get_backend():
+    # type: () -> StdlibBackend
+    if _backend is None:
+        set_backend(os.environ.get('HARLIB_JSON') or None)
+    return _backend
+
+
+def loads(s, ordered=False, **kwargs):
+    # type: (Any, bool, **Any) -> Any
+    '''
+    With ordered=True objects keep their key order, as plain dicts where
+    those are ordered and as OrderedDicts elsewhere.
+    '''
+    if ordered and not ORDERED_DICTS:
+        kwargs.setdefault('object_pairs_hook', OrderedDict)
+    if kwargs:
+        return json.loads(s, **kwargs)
+    return get_backend().loads(s)
+
+
+def load(reader, ordered=False, **kwargs):
+    # type: (TextIO, bool, **Any) -> Any
+    return loads(reader.read(), ordered=ordered, **kwargs)
+
+
+def _to_json(value):
+    # type: (Any) -> Any
+    to_json = getattr(value, 'to_json', None)
+    if to_json is None:
+        raise TypeError('%s is not JSON serializable' % (
+            value.__class__.__name__))
+    return to_json()
+
+
+def dumps(obj, **kwargs):
+    # type: (Any, **Any) -> str
+    '''
+    Objects with a to_json method, such as the BodyRef a body dict may
+    hold in place of its text, are written as what it returns.
+    '''
+    try:
+        s = get_backend().dumps(obj, **kwargs)
+        if s is None:
+            s = _stdlib.dumps(obj, **kwargs)
+    except TypeError:
+        # only tried again after failing, so plain JSON costs nothing
+        if 'default' in kwargs:
+            raise
+        s = dumps(obj, default=_to_json, **kwargs)
+    return s
+
+
+def dump(obj, writer, **kwargs):
+    # type: (Any, TextIO, **Any) -> None
+    writer.write(dumps(obj, **kwargs))
@@ -9,6 +9,8 @@
 # modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
 from __future__ import absolute_import
 from .metamodel import HarObject
+from .lazy import HarLazyList
+from .compact import HarCompactObject
 from .messages import (
     HarCookie,
     HarHeader,
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Compact model classes for the small, numerous objects of a HAR file, such
+as headers and cookies. They take the same _required/_optional/_types
+declarations as HarObject, from which CompactMeta generates __slots__, so
+instances have no __dict__. Fields outside the declarations are kept in
+a dict that is only created when one is set.
+'''
+from __future__ import absolute_import
+import copy
+import six
+from harlib.compat import OrderedDict
+from harlib import jsonlib
+from .metamodel import (
+    SCALAR_TYPES, HarObject, _MISSING, _changed, _to_json_value,
+    shared_copy)
+
+try:
+    from typing import Any, Dict, List, TextIO, Tuple
+except ImportError:
+    pass
+
+# defaults of these types are shared between instances, not copied
+_IMMUTABLE = six.string_types + six.integer_types + (
+    float, bool, type(None), tuple, frozenset)
+
+
+def _inherited(name, namespace, bases, default):
+    if name in namespace:
+        return namespace[name]
+    for base in bases:
+        if hasattr(base, name):
+            return getattr(base, name)
+    return default
+
+
+class CompactMeta(type):
+    '''
+    Generates __slots__ and the field tables of compact model classes.
+    '''
+
+    def __new__(mcs, name, bases, namespace):
+        required = _inherited('_required', namespace, bases, [])
+        optional = _inherited('_optional', namespace, bases, {})
+        ordered = _inherited('_ordered', namespace, bases, ()) or required
+        fields = list(ordered) + [field for field in list(required) +
+                                  sorted(optional) if field not in ordered]
+        fields = list(OrderedDict.fromkeys(fields))
+        # slots declared by the class are kept, for attributes that are
+        # not fields
+        declared = tuple(namespace.get('__slots__', ()))
+        inherited = set(declared)
+        for base in bases:
+            for klass in base.__mro__:
+                inherited.update(getattr(klass, '__slots__', ()))
+        namespace['__slots__'] = declared + tuple(
+            field for field in fields if field not in inherited)
+        namespace['_all_slots'] = tuple(sorted(
+            inherited.union(namespace['__slots__']).difference(
+                ['_extra', '_parent'])))
+        namespace['_fields'] = tuple(fields)
+        namespace['_field_set'] = frozenset(fields)
+        # (name, value left out of JSON), required fields are always written
+        namespace['_json_fields'] = tuple(
+            (field, _MISSING if field in required
+             else optional.get(field, _MISSING)) for field in fields)
+        namespace['_missing'] = tuple(
+            field for field in required if field not in optional)
+        namespace['_defaults'] = tuple(
+            (field, value, not isinstance(value, _IMMUTABLE))
+            for field, value in sorted(optional.items()))
+        return super(CompactMeta, mcs).__new__(mcs, name, bases, namespace)
+
+
+@six.add_metaclass(CompactMeta)
+class HarCompactObject(object):
+    '''
+    Superclass for compact HAR model objects
+    '''
+    # _parent is the model object this one is in, see HarObject.dumps
+    __slots__ = ('_extra', '_parent')
+
+    _required = []  # type: List[str]
+    _optional = {}  # type: Dict[str, Any]
+    _types = {}  # type: Dict[str, Any]
+    _ordered = ()  # type: Tuple[str, ...]
+
+    def __init__(self, obj=None):
+        # type: (Dict) -> None
+        if obj is None:
+            obj = {}
+        elif isinstance(obj, HarCompactObject):
+            obj = obj.to_json()
+        for name in self._missing:
+            if name not in obj:
+                raise ValueError('%s requires %s' % (
+                    self.__class__.__name__, repr(name)))
+        setter = object.__setattr__
+        setter(self, '_extra', None)
+        setter(self, '_parent', None)
+        for name, value, mutable in self._defaults:
+            setter(self, name, copy.deepcopy(value) if mutable else value)
+        fields = self._field_set
+        types = self._types
+        for name, value in obj.items():
+            if name in types:
+                value = self._coerce(name, value)
+            if name in fields:
+                setter(self, name, value)
+            else:
+                self.__setattr__(name, value)
+
+    @classmethod
+    def from_trusted(cls, obj):
+        # type: (Dict) -> HarCompactObject
+        return cls(obj)
+
+    @classmethod
+    def adopt(cls, other):
+        # type: (HarCompactObject) -> HarCompactObject
+        '''
+        Copies another object slot by slot, see HarObject.adopt
+        '''
+        self = cls.__new__(cls)
+        setter = object.__setattr__
+        for name in other._all_slots:
+            try:
+                value = object.__getattribute__(other, name)
+            except AttributeError:  # deleted
+                continue
+            setter(self, name, shared_copy(value))
+        extra = other._extra
+        setter(self, '_extra', None if extra is None else OrderedDict(extra))
+        setter(self, '_parent', None)
+        return self
+
+    def _coerce(self, name, value):
+        # type: (str, Any) -> Any
+        kind = self._types[name]
+        if value is None:
+            return value
+        if isinstance(kind, list):
+            kind = kind[0]
+            return [v if isinstance(v, kind) else kind(v) for v in value]
+        if isinstance(value, kind):
+            return value
+        return kind(value)
+
+    def __setattr__(self, name, value):
+        # type: (str, Any) -> None
+        try:
+            object.__setattr__(self, name, value)
+        except AttributeError:
+            if self._extra is None:
+                object.__setattr__(self, '_extra', OrderedDict())
+            self._extra[name] = value
+        if self._parent is not None:
+            _changed(self._parent)
+
+    def __getattr__(self, name):
+        # type: (str) -> Any
+        # only called for names that are neither set slots nor methods
+        extra = object.__getattribute__(self, '_extra') \
+            if name != '_extra' else None
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError('%s has no attribute %s' % (
+            self.__class__.__name__, repr(name)))
+
+    def __delattr__(self, name):
+        # type: (str) -> None
+        if self._extra is not None and name in self._extra:
+            del self._extra[name]
+        else:
+            object.__delattr__(self, name)
+        if self._parent is not None:
+            _changed(self._parent)
+
+    def __eq__(self, other):
+        # type: (Any) -> bool
+        return (self.__class__ is other.__class__ and
+                self.items() == other.items())
+
+    def __ne__(self, other):
+        # type: (Any) -> bool
+        return not self == other
+
+    # compared by their mutable fields, so unhashable like a dict
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        # type: () -> str
+        return '%s(%s)' % (self.__class__.__name__,
+                           repr(dict(self.to_json(dict_class=dict))))
+
+    def __getstate__(self):
+        # type: () -> Dict[str, Any]
+        return self.to_json(dict_class=dict)
+
+    def __setstate__(self, state):
+        # type: (Dict[str, Any]) -> None
+        HarCompactObject.__init__(self, state)
+
+    def items(self):
+        # type: () -> List[Tuple[str, Any]]
+        '''
+        Fields in order, leaving out optional fields at their default.
+        '''
+        items = []
+        for name, default in self._json_fields:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING and value != default:
+                items.append((name, value))
+        if self._extra:
+            items.extend(self._extra.items())
+        return items
+
+    def to_json(self, dict_class=OrderedDict, with_content=True):
+        # type: (type, bool) -> Dict
+        d = dict_class()
+        for name, default in self._json_fields:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING and value != default:
+                d[name] = value if value.__class__ in SCALAR_TYPES else \
+                    _to_json_value(value, dict_class)
+        if self._extra:
+            for name, value in self._extra.items():
+                d[name] = _to_json_value(value, dict_class)
+        return d
+
+    def dumps(self, with_content=True, **kwargs):
+        # type: (bool, **Any) -> str
+        return jsonlib.dumps(self.to_json(), **kwargs)
+
+    def dump(self, writer, with_content=True, **kwargs):
+        # type: (TextIO, bool, **Any) -> None
+        writer.write(self.dumps(with_content, **kwargs))
+
+    # shared with HarObject, as codecs dispatch on the class name
+    decode = HarObject.__dict__['decode']
+    encode = HarObject.__dict__['encode']
+
+
+# every model class, for isinstance checks: compact objects are not
+# HarObject instances, so isinstance(x, HarObject) is false for headers,
+# cookies and params, which code outside harlib should check against this
+MODEL_TYPES = (HarObject, HarCompactObject)
@@ -12,9 +12,17 @@ harlib - HTTP Archive (HAR) format library
 '''
 from __future__ import absolute_import
 from collections import Mapping, Sequence
+import binascii
+import copy
+import os
 import six
+from harlib import jsonlib
+from harlib.bodies import BODY_FIELDS
+from harlib.compat import OrderedDict
 
-from .metamodel import HarObject
+from .metamodel import JSON_DICT, HarObject, shared_copy
+from .compact import MODEL_TYPES
+from .lazy import HarLazyList
 
 from .options import (
     HarClientOptions,
@@ -25,6 +33,11 @@ from .options import (
 from .request import HarRequest
 from .response import HarResponse
 
+try:
+    from typing import Any, Dict, Iterator, List, TextIO, Tuple
+except ImportError:
+    pass
+
 
 class HarCache(HarObject):
 
@@ -187,12 +200,20 @@ class HarEntry(HarObject):
         '_socketOptions',
     ]
 
-    def __init__(self, obj=None):
+    def __init__(self, obj=None, trusted=False):
+        if trusted and isinstance(obj, Mapping):
+            self._adopt(obj)
+            return
+
         har = obj or None
 
         if isinstance(obj, Mapping):
             har = obj
-        elif isinstance(obj, HarObject):
+        elif isinstance(obj, HarEntry):
+            # copied without serializing, see HarObject.adopt
+            self._adopt_object(obj)
+            return
+        elif isinstance(obj, MODEL_TYPES):
             har = obj.to_json()
         elif isinstance(obj, six.string_types):
             raise ValueError('HarEntry got %s' % repr(obj))
@@ -213,22 +234,108 @@ class HarEntry(HarObject):
         from datetime import datetime
         return datetime.utcnow().isoformat() + 'Z'
 
-    def to_json(self, with_content=True, dict_class=dict):
-        d = super(HarEntry, self).to_json()
+    def store_bodies(self, store=None):
+        # type: (Any) -> None
+        '''
+        Moves the texts of the request and response bodies into store, the
+        default store if None, see HarMessageBody.store_text
+        '''
+        for message, name in BODY_FIELDS:
+            body = getattr(getattr(self, message, None), name, None)
+            if hasattr(body, 'store_text'):
+                body.store_text(store)
+
+    def to_json(self, with_content=True, dict_class=OrderedDict):
+        d = super(HarEntry, self).to_json(dict_class=dict_class)
         if not with_content:
-            try:
-                del d['request']['postData']['text']
-                del d['request']['postData']['encoding']
-            except Exception:
-                pass
-            try:
-                del d['response']['content']['text']
-                del d['response']['content']['encoding']
-            except Exception:
-                pass
+            d = _without_content(d)
         return d
 
 
+def _without_content(d):
+    # type: (Dict) -> Dict
+    '''
+    Entry dict without the request and response bodies. Dicts are copied
+    before they are changed, as trusted entries emit their adopted dicts.
+    '''
+    d = copy.copy(d)
+    for message, body in (('request', 'postData'), ('response', 'content')):
+        try:
+            d[message] = parent = copy.copy(d[message])
+            parent[body] = body = copy.copy(parent[body])
+        except (KeyError, TypeError):
+            continue
+        body.pop('text', None)
+        body.pop('encoding', None)
+    return d
+
+
+def _entry_fragments(entries, with_content, kwargs):
+    # type: (Sequence, bool, Dict[str, Any]) -> Iterator[str]
+    # unbuilt entries of lazy lists are written from their dicts
+    raw = entries.raw if isinstance(entries, HarLazyList) else \
+        entries.__getitem__
+    for pos in range(len(entries)):
+        entry = raw(pos)
+        if isinstance(entry, MODEL_TYPES):
+            yield entry.dumps(with_content=with_content, **kwargs)
+        else:
+            if not with_content:
+                entry = _without_content(entry)
+            yield jsonlib.dumps(entry, **kwargs)
+
+
+def _iter_dumps(har, log, with_content, kwargs):
+    # type: (HarObject, HarLog, bool, Dict[str, Any]) -> Iterator[str]
+    '''
+    Yields the JSON text of har in pieces, in which each entry of log is
+    the text cached by HarObject.dumps, indented to its place.
+    '''
+    marker = '@entries:%s@' % binascii.hexlify(os.urandom(8)).decode()
+    entries = log.entries
+    log.entries = marker
+    try:
+        s = jsonlib.dumps(har.to_json(dict_class=JSON_DICT), **kwargs)
+    finally:
+        log.entries = entries
+    head, tail = s.split(jsonlib.dumps(marker), 1)
+    yield head
+    if not len(entries):
+        yield '[]'
+        yield tail
+        return
+    indent = kwargs.get('indent')
+    separators = kwargs.get('separators')
+    if separators:
+        separator = separators[0]
+    else:
+        # as json.dumps, which drops the space after commas when indenting
+        separator = ',' if indent is not None and six.PY3 else ', '
+    if indent is None:
+        start, separator, end = '[', separator, ']'
+        fragment_newline = None
+    else:
+        if not isinstance(indent, six.string_types):
+            indent = ' ' * indent
+        line = head[head.rfind('\n') + 1:]
+        outer = line[:len(line) - len(line.lstrip())]
+        # strings in JSON have no raw newlines, so they are all indents
+        fragment_newline = '\n' + outer + indent
+        start, separator, end = ('[' + fragment_newline,
+                                 separator + fragment_newline,
+                                 '\n' + outer + ']')
+    yield start
+    for pos, fragment in enumerate(_entry_fragments(
+            entries, with_content, kwargs)):
+        if pos:
+            yield separator
+        if fragment_newline is not None:
+            fragment = fragment.replace('\n', fragment_newline)
+        yield fragment
+    yield end
+    yield tail
+
+
 class HarLog(HarObject):
 
     _required = [
@@ -250,17 +357,46 @@ class HarLog(HarObject):
         'pages': [HarPage],
     }
 
-    def __init__(self, obj=None):
+    def __init__(self, obj=None, lazy=False, trusted=False):
+        if trusted and isinstance(obj, Mapping):
+            self._adopt(obj)
+            return
+
         import harlib
         har = dict()
         har['version'] = '1.2'
         har['creator'] = dict()
         har['creator']['name'] = harlib.__title__
         har['creator']['version'] = harlib.__version__
-        har['entries'] = self.parse_entries(obj)
+        shared = None
+        if isinstance(obj, HarLog):
+            # lazy lists stay lazy, see HarObject.adopt
+            shared = shared_copy(obj.entries)
+        har['entries'] = [] if lazy or shared is not None \
+            else self.parse_entries(obj)
+        # pages are kept for pageref, see pages_with_entries, so unlike
+        # the other log fields they are also in to_json round trips
+        if isinstance(obj, Mapping) and obj.get('pages'):
+            har['pages'] = obj['pages']
+        elif isinstance(obj, HarLog) and obj.pages:
+            har['pages'] = shared_copy(obj.pages)
 
         super(HarObject, self).__init__(har)
 
+        if shared is not None:
+            self.entries = shared
+        # entries are built from their dicts on first access
+        elif lazy:
+            self.entries = HarLazyList(self.parse_entries(obj), HarEntry)
+
+    def _reads_models(self, name):
+        return name == 'entries' or super(HarLog, self)._reads_models(name)
+
+    def _adopt_value(self, name, value):
+        if name == 'entries':
+            return HarLazyList(value, HarEntry, trusted=True)
+        return super(HarLog, self)._adopt_value(name, value)
+
     def parse_entries(self, obj):
         har = None
 
@@ -274,10 +410,10 @@ class HarLog(HarObject):
                 har.extend(self.parse_entries(entry))
 
         elif isinstance(obj, HarEntry):
-            har = [obj.to_json()]
+            har = [HarEntry.adopt(obj)]
 
         elif isinstance(obj, HarLog):
-            har = [entry.to_json() for entry in obj.entries]
+            har = shared_copy(list(obj.entries))
 
         elif obj is None:
             return []
@@ -287,17 +423,163 @@ class HarLog(HarObject):
 
         return har
 
+    def _to_json_without_entries(self, dict_class):
+        entries = self.entries
+        self.entries = []
+        try:
+            return super(HarLog, self).to_json(dict_class=dict_class)
+        finally:
+            self.entries = entries
+
+    def header_to_json(self, dict_class=OrderedDict):
+        '''
+        Converts every field of the log except entries
+        '''
+        har = self._to_json_without_entries(dict_class)
+        har.pop('entries', None)
+        return har
+
+    def to_json(self, dict_class=OrderedDict, with_content=True):
+        entries = self.entries
+        if not isinstance(entries, HarLazyList):
+            return super(HarLog, self).to_json(dict_class=dict_class)
+
+        har = self._to_json_without_entries(dict_class)
+        har['entries'] = entries.to_json(dict_class=dict_class)
+        return har
+
+    def to_columns(self):
+        # type: () -> Any
+        '''
+        Fixed fields of the entries as arrays, see harlib.columnar
+        '''
+        from harlib.columnar import HarColumns
+        return HarColumns.from_log(self)
+
+    def _index(self, index_class, names):
+        # type: (type, Tuple[str, ...]) -> Any
+        fields = self.__dict__
+        indexes = fields.get('_indexes')
+        if indexes is None:
+            indexes = fields['_indexes'] = {}
+            # kept out of the JSON of the log, as other reserved names
+            reserved = getattr(self, '_reserved', None)
+            if isinstance(reserved, list) and '_indexes' not in reserved:
+                reserved.append('_indexes')
+        index = indexes.get((index_class, names))
+        if index is None:
+            index = indexes[index_class, names] = index_class(self, names)
+        return index
+
+    def index(self, *names):
+        # type: (*str) -> Any
+        '''
+        Positions of the entries by the value of a field, or the tuple of
+        values of several fields, such as index('host', 'status'), built
+        once and kept up to date with appended entries, see harlib.indexes
+        '''
+        from harlib.indexes import HashIndex
+        return self._index(HashIndex, names)
+
+    def range_index(self, name):
+        # type: (str) -> Any
+        '''
+        Positions of the entries sorted by a field, such as startedDateTime
+        or time, for range queries, see harlib.indexes
+        '''
+        from harlib.indexes import RangeIndex
+        return self._index(RangeIndex, (name,))
+
+    def time_index(self):
+        # type: () -> Any
+        '''
+        Positions of the entries sorted by startedDateTime, parsed once
+        into nanoseconds since the epoch, for queries of time windows,
+        see RangeIndex in harlib.indexes
+        '''
+        return self.range_index('startedDateTime')
+
+    def pages_with_entries(self):
+        # type: () -> List[Tuple[Any, Any]]
+        '''
+        (page, entries) for each page, with a view of its entries in the
+        order of the log, from the index on pageref, and last (None,
+        entries) for the entries of no known page, if there are any
+        '''
+        index = self.index('pageref')
+        pages = [(page, index.entries(page.id)) for page in self.pages]
+        known = set(page.id for page, _ in pages)
+        orphans = sorted(pos for key in index.keys() if key not in known
+                         for pos in index.positions(key))
+        if orphans:
+            pages.append((None, index.view(orphans)))
+        return pages
+
+    def waterfall(self):
+        # type: () -> List[Dict[str, Any]]
+        '''
+        Start and timings segments of each entry, in milliseconds from the
+        start of its page, by page, see harlib.waterfall
+        '''
+        from harlib.waterfall import from_log
+        return from_log(self)
+
+    def store_bodies(self, store=None):
+        # type: (Any) -> None
+        '''
+        Moves the body texts of every entry into store, the default store
+        if None, so that each distinct text is held once, see harlib.bodies.
+        Entries of lazy lists are built.
+        '''
+        for entry in self.entries:
+            entry.store_bodies(store)
+
+    def reindex(self):
+        # type: () -> None
+        '''
+        Rebuilds the indexes on their next lookup, after entries were
+        changed other than by appending to log.entries
+        '''
+        for index in self.__dict__.get('_indexes', {}).values():
+            index.rebuild()
+
+    def dumps(self, with_content=True, **kwargs):
+        # type: (bool, **Any) -> str
+        '''
+        Only the entries changed since they were last written are
+        converted, see HarObject.dumps
+        '''
+        return ''.join(_iter_dumps(self, self, with_content, kwargs))
+
+    def dump(self, writer, with_content=True, **kwargs):
+        # type: (TextIO, bool, **Any) -> None
+        for chunk in _iter_dumps(self, self, with_content, kwargs):
+            writer.write(chunk)
+
 
 class HarFile(HarObject):
     _required = ['log']
     _types = {'log': HarLog}
 
-    def __init__(self, obj=None):
+    def __init__(self, obj=None, lazy=False, trusted=False):
+        if trusted and isinstance(obj, Mapping):
+            self._adopt(obj)
+            return
+
         har = None
 
         if isinstance(obj, (dict, Mapping)):
             har = obj
 
+        elif isinstance(obj, HarFile):
+            # copied without serializing, see HarObject.adopt
+            self._adopt_object(obj)
+            return
+
+        elif isinstance(obj, HarLog):
+            har = dict()
+            har['log'] = HarLog.adopt(obj)
+
         elif isinstance(obj, (list, Sequence)):
             har = dict()
             har['log'] = obj
@@ -305,4 +587,37 @@ class HarFile(HarObject):
         else:
             raise ValueError('HarFile got %s' % repr(obj))
 
+        if lazy:
+            log = har['log']
+            har = dict(har)
+            har['log'] = {'entries': []}
+
         super(HarObject, self).__init__(har)
+
+        if lazy:
+            self.log = HarLog(log, lazy=True)
+
+    def __enter__(self):
+        # type: () -> HarFile
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        # type: () -> None
+        '''
+        Closes the source of lazy entries, such as the memory map of
+        harlib.api.open_indexed
+        '''
+        if isinstance(self.log.entries, HarLazyList):
+            self.log.entries.close()
+
+    def dumps(self, with_content=True, **kwargs):
+        # type: (bool, **Any) -> str
+        return ''.join(_iter_dumps(self, self.log, with_content, kwargs))
+
+    def dump(self, writer, with_content=True, **kwargs):
+        # type: (TextIO, bool, **Any) -> None
+        for chunk in _iter_dumps(self, self.log, with_content, kwargs):
+            writer.write(chunk)
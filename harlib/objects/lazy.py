@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from collections import Mapping, MutableSequence
+from harlib.compat import OrderedDict
+from six.moves import range
+
+try:
+    from typing import Any, Dict, List, Sequence
+except ImportError:
+    pass
+
+
+class HarLazyList(MutableSequence):
+    '''
+    List of model objects that are built from raw dicts on first access.
+
+    Each slot holds either a built object or the index of its raw dict in
+    the source sequence. Built objects are cached in a table shared with
+    slices, so an entry is built at most once. With trusted=True they are
+    built with item_class.from_trusted.
+    '''
+
+    def __init__(self, raw, item_class, items=None, cache=None,
+                 trusted=False):
+        # type: (Sequence[Dict], type, List, Dict[int, Any], bool) -> None
+        self._raw = raw
+        self._item_class = item_class
+        self._trusted = trusted
+        self._items = list(range(len(raw))) if items is None else items
+        self._cache = {} if cache is None else cache
+
+    @classmethod
+    def adopt(cls, other):
+        # type: (HarLazyList) -> HarLazyList
+        '''
+        Copy of another lazy list over the same raw dicts, in which built
+        items are wrapped with their adopt(), see HarObject.adopt.
+        '''
+        items = []  # type: List[Any]
+        for pos in range(len(other._items)):
+            item = other._items[pos]
+            if isinstance(item, int):
+                item = other._cache.get(item, item)
+            if not isinstance(item, int):
+                item = item.__class__.adopt(item)
+            items.append(item)
+        return cls(other._raw, other._item_class, items,
+                   trusted=other._trusted)
+
+    def _build(self, pos):
+        # type: (int) -> Any
+        item = self._items[pos]
+        if not isinstance(item, int):
+            return item
+        obj = self._cache.get(item)
+        if obj is None:
+            if self._trusted:
+                obj = self._item_class.from_trusted(self._raw[item])
+            else:
+                obj = self._item_class(self._raw[item])
+            self._cache[item] = obj
+        self._items[pos] = obj
+        return obj
+
+    def _coerce(self, value):
+        # type: (Any) -> Any
+        if isinstance(value, Mapping):
+            return self._item_class(value)
+        return value
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return HarLazyList(self._raw, self._item_class,
+                               self._items[index], self._cache, self._trusted)
+        if index < 0:
+            index += len(self._items)
+        return self._build(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [self._coerce(v) for v in value]
+        else:
+            value = self._coerce(value)
+        self._items[index] = value
+
+    def __delitem__(self, index):
+        del self._items[index]
+
+    def __iter__(self):
+        for pos in range(len(self._items)):
+            yield self._build(pos)
+
+    def __repr__(self):
+        # type: () -> str
+        return '<%s of %d %s>' % (self.__class__.__name__,
+                                  len(self._items),
+                                  self._item_class.__name__)
+
+    def insert(self, index, value):
+        # type: (int, Any) -> None
+        self._items.insert(index, self._coerce(value))
+
+    def close(self):
+        # type: () -> None
+        '''
+        Closes the source of the raw dicts if it has a close(), as the
+        entries of harlib.api.open_indexed do. Built items can still be read.
+        '''
+        close = getattr(self._raw, 'close', None)
+        if close is not None:
+            close()
+
+    def is_built(self, index):
+        # type: (int) -> bool
+        return not isinstance(self._items[index], int)
+
+    def raw(self, index):
+        # type: (int) -> Any
+        '''
+        Returns the source dict of an unbuilt item, or the built object.
+        '''
+        item = self._items[index]
+        if isinstance(item, int):
+            obj = self._cache.get(item)
+            return self._raw[item] if obj is None else obj
+        return item
+
+    def to_json(self, dict_class=OrderedDict):
+        # type: (type) -> List[Dict]
+        '''
+        Unbuilt items are emitted as their source dicts, without building.
+        '''
+        har = []
+        for pos in range(len(self._items)):
+            item = self.raw(pos)
+            if isinstance(item, Mapping):
+                har.append(item)
+            else:
+                har.append(item.to_json(dict_class=dict_class))
+        return har
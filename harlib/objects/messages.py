@@ -10,10 +10,91 @@
 from __future__ import absolute_import
 from __future__ import print_function
 from collections import Mapping
-from .metamodel import HarObject
-
+import copy
+import six
+from harlib.bodies import BodyRef, default_store
+from .compact import MODEL_TYPES, HarCompactObject
+from .metamodel import HarObject, _changed
+
+try:
+    from typing import Any, Dict, List, Optional, Tuple
+except ImportError:
+    pass
 
-class HarNameValuePair(HarObject):
+# entries each string table may hold, so that unusual names cannot grow
+# them without bound; past that, strings are simply not shared
+TABLE_SIZE = 4096
+
+# headers whose values repeat enough to be worth sharing
+SHARED_VALUE_HEADERS = frozenset([
+    'Accept',
+    'Accept-Encoding',
+    'Accept-Language',
+    'Access-Control-Allow-Origin',
+    'Cache-Control',
+    'Connection',
+    'Content-Encoding',
+    'Content-Type',
+    'Pragma',
+    'Server',
+    'Transfer-Encoding',
+    'User-Agent',
+    'Vary',
+    'X-Content-Type-Options',
+])
+
+_header_names = {}  # type: Dict[str, Tuple[str, str]]
+_cookie_names = {}  # type: Dict[str, str]
+_header_values = {}  # type: Dict[str, str]
+
+
+def _shared(table, s):
+    # type: (Dict[str, str], str) -> str
+    shared = table.get(s)
+    if shared is None:
+        shared = s
+        if len(table) < TABLE_SIZE:
+            table[s] = s
+    return shared
+
+
+def header_name(name):
+    # type: (str) -> Tuple[str, str]
+    '''
+    Returns the (wire, title case) strings of a header name, which are
+    shared by every header of that name
+    '''
+    names = _header_names.get(name)
+    if names is None:
+        title = name.title()
+        names = (name, _header_names.get(title, (title,))[0])
+        if len(_header_names) < TABLE_SIZE:
+            _header_names[name] = names
+            _header_names.setdefault(names[1], (names[1], names[1]))
+    return names
+
+
+def header_value(name, value):
+    # type: (str, Any) -> Any
+    '''
+    Returns the shared string of a value, for headers in SHARED_VALUE_HEADERS
+    '''
+    if name in SHARED_VALUE_HEADERS and isinstance(value, six.string_types):
+        return _shared(_header_values, value)
+    return value
+
+
+def cookie_name(name):
+    # type: (str) -> str
+    '''
+    Returns the shared string of a cookie name, which keeps its case
+    '''
+    if isinstance(name, six.string_types):
+        return _shared(_cookie_names, name)
+    return name
+
+
+class HarNameValuePair(HarCompactObject):
 
     _required = [
         'name',
@@ -72,6 +153,13 @@ class HarCookie(HarNameValuePair):
         else:
             print(("invalid cookie %s" % repr(obj)))
 
+        if isinstance(har, Mapping) and 'name' in har:
+            name = cookie_name(har['name'])
+            if name is not har['name']:
+                # a copy, so the dict passed in is left as it was
+                har = har.copy()
+                har['name'] = name
+
         super(HarCookie, self).__init__(har)
 
     def to_requests(self):
@@ -80,6 +168,8 @@ class HarCookie(HarNameValuePair):
 
 class HarHeader(HarNameValuePair):
 
+    __slots__ = ('_wire_name',)
+
     _required = HarNameValuePair._required
 
     use_titlecase = True
@@ -96,17 +186,140 @@ class HarHeader(HarNameValuePair):
         else:
             print(("invalid header %s" % repr(obj)))
 
-        if self.use_titlecase:
-            har['name'] = har['name'].title()
+        wire, title = header_name(har['name'])
+        name = title if self.use_titlecase else wire
+        value = header_value(title, har.get('value'))
+        if name is not har['name'] or value is not har.get('value'):
+            # a copy, so the dict passed in keeps its own strings
+            har = har.copy()
+            har['name'] = name
+            if 'value' in har:
+                har['value'] = value
 
         super(HarHeader, self).__init__(har)
+        object.__setattr__(self, '_wire_name', wire)
+
+    @property
+    def wire_name(self):
+        # type: () -> str
+        '''
+        The name as it was sent, before use_titlecase changed its case
+        '''
+        try:
+            wire = self._wire_name
+        except AttributeError:
+            return self.name
+        # unless the name was changed since
+        return wire if wire.lower() == self.name.lower() else self.name
 
     def to_requests(self):
         return self.encode(tuple)
 
 
 class HarMessageBody(HarObject):
-    pass
+    '''
+    Superclass of request and response bodies. Setting text to a BodyRef
+    holds the reference, and text is then read from its store on each
+    access, see store_text and harlib.bodies.
+    '''
+
+    def __init__(self, obj=None):
+        # type: (Any) -> None
+        ref = obj.get('text') if isinstance(obj, Mapping) else None
+        if isinstance(ref, BodyRef):
+            obj = dict(obj)
+            del obj['text']
+        super(HarMessageBody, self).__init__(obj)
+        self._reserved += ['_body']
+        if isinstance(ref, BodyRef):
+            self.text = ref
+
+    def _adopt(self, obj):
+        # type: (Dict) -> None
+        super(HarMessageBody, self)._adopt(obj)
+        ref = obj.get('text')
+        if isinstance(ref, BodyRef):
+            self.text = ref
+
+    def _drop_text(self):
+        # type: () -> None
+        fields = self.__dict__
+        fields.pop('text', None)
+        raw = fields.get('_raw')
+        if raw is not None and 'text' in raw:
+            # the adopted dict may be shared, so copy before removing
+            fields['_raw'] = raw = copy.copy(raw)
+            del raw['text']
+
+    def __getattr__(self, name):
+        # type: (str) -> Any
+        if name == 'text':
+            ref = self.__dict__.get('_body')
+            if ref is not None:
+                return ref.read()
+        return super(HarMessageBody, self).__getattr__(name)
+
+    def __setattr__(self, name, value):
+        # type: (str, Any) -> None
+        if name == 'text':
+            fields = self.__dict__
+            if isinstance(value, BodyRef):
+                self._drop_text()
+                fields['_body'] = value
+                if '_fragment' in fields or '_parent' in fields:
+                    _changed(self)
+                return
+            fields.pop('_body', None)
+        super(HarMessageBody, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        # type: (str) -> None
+        fields = self.__dict__
+        if name == 'text' and fields.pop('_body', None) is not None:
+            if '_fragment' in fields or '_parent' in fields:
+                _changed(self)
+            return
+        super(HarMessageBody, self).__delattr__(name)
+
+    def __getstate__(self):
+        # type: () -> Dict[str, Any]
+        # copies and pickles get the text rather than the store
+        state = super(HarMessageBody, self).__getstate__()
+        ref = state.pop('_body', None)
+        if ref is not None:
+            state['text'] = ref.read()
+        return state
+
+    def _unsorted_items(self):
+        # type: () -> List[Tuple[str, Any]]
+        items = super(HarMessageBody, self)._unsorted_items()
+        ref = self.__dict__.get('_body')
+        if ref is not None:
+            # written as the text, which follows mimeType in HAR
+            names = [name for name, _ in items]
+            pos = names.index('mimeType') + 1 if 'mimeType' in names \
+                else len(items)
+            items.insert(pos, ('text', ref))
+        return items
+
+    def store_text(self, store=None):
+        # type: (Any) -> Optional[BodyRef]
+        '''
+        Moves the text into store, the default store if None, holding the
+        reference to it. Returns the reference, or None if the text is
+        empty or not a text string, as it is then kept.
+        '''
+        ref = self.__dict__.get('_body')
+        if ref is not None and (store is None or ref.store is store):
+            return ref
+        text = getattr(self, 'text', None)
+        if not isinstance(text, six.text_type) or not text:
+            return None
+        if store is None:
+            store = default_store()
+        ref = store.put(text)
+        self.text = ref
+        return ref
 
 
 class HarMessage(HarObject):
@@ -173,7 +386,7 @@ class HarPostDataParam(HarNameValuePair):
 
         if isinstance(obj, Mapping):
             har = obj
-        elif isinstance(obj, HarObject):
+        elif isinstance(obj, MODEL_TYPES):
             har = obj.to_json()
         else:
             har = self.decode(obj)
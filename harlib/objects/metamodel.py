@@ -8,19 +8,41 @@
 # will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
 # modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
 from __future__ import absolute_import
+from collections import Mapping
 from metaobject import MetaObject
+import copy
 import logging
+import six
 import harlib.codecs
-from harlib.compat import OrderedDict
+from harlib import jsonlib
+from harlib.compat import JSON_DICT, OrderedDict
 
 try:
-    from typing import Any, BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+    from typing import (
+        Any, BinaryIO, Callable, Dict, List, NamedTuple, Optional, TextIO,
+        Tuple)
 except ImportError:
     pass
 
 logger = logging.getLogger(__name__)
 
 
+# attributes of trusted objects that are not HAR fields
+_TRUSTED_RESERVED = frozenset(['_ordered', '_defaulted', '_raw', '_parent',
+                               '_fragment', '_indexes', '_body'])
+
+# attributes that hold no model objects, skipped when linking parents
+_UNTRACKED = _TRUSTED_RESERVED.union(['_reserved', '_codecs'])
+
+# declared types whose values are written to JSON as they are
+SCALAR_TYPES = frozenset(six.integer_types + (float, bool, str, six.text_type))
+
+_MISSING = object()
+
+_rank_tables = {}  # type: Dict[type, Tuple[Any, Dict[str, int]]]
+_serializers = {}  # type: Dict[type, Tuple[Any, Callable]]
+
+
 class HarObject(MetaObject):
     # type: NamedTuple('HarObject', [
     #     ('comment', str),
@@ -38,48 +60,210 @@ class HarObject(MetaObject):
         # type: (Dict) -> None
         super(HarObject, self).__init__(obj)
         self._ordered = self._ordered or self._required
-        self._reserved += ['_ordered', '_codecs']
+        self._reserved += ['_ordered', '_codecs', '_parent', '_fragment']
 
-    def items(self):
-        # type: () -> List[Tuple[str, str]]
-        def key(item):
-            # type: (Tuple[str, str]) -> int
-            try:
-                order = self._ordered.index(item[0])
-            except ValueError:
-                order = 9999
-            return order
+    @classmethod
+    def from_trusted(cls, obj):
+        # type: (Dict) -> HarObject
+        '''
+        Adopts a dict that is known to be valid HAR, such as one written by
+        harlib, without checking, defaulting or coercing any of its fields.
+        '''
+        self = cls.__new__(cls)
+        self._adopt(obj)
+        return self
 
-        # if we have a specific order, then sort keys
-        if hasattr(self, '_ordered') and len(self._ordered) > 0:
-            items = self._changed_items()
-            items.sort(key=key)
-            return items
+    @classmethod
+    def adopt(cls, other):
+        # type: (HarObject) -> HarObject
+        '''
+        Copies another model object without serializing it. The model
+        objects and lists in it are copied the same way, while the dicts a
+        trusted object has not read yet are shared, as they are never
+        changed in place, and read on first access. Changing either object
+        never changes the other.
+        '''
+        self = cls.__new__(cls)
+        self._adopt_object(other)
+        return self
 
-        # we want to see private attributes as well
+    def _adopt_object(self, other):
+        # type: (HarObject) -> None
+        unread = other.__dict__.get('_raw') or {}
+        raw = JSON_DICT()
+        copied = []
+        for name, value in other._unsorted_items():
+            if name not in unread or name in other.__dict__ or \
+                    not self._reads_models(name):
+                value = shared_copy(value)
+                copied.append(name)
+            raw[name] = value
+        self._adopt(raw)
+        fields = self.__dict__
+        raw = fields['_raw']
+        for name in copied:
+            if name in raw:  # a message body may keep its text apart
+                fields[name] = raw[name]
+
+    def _adopt(self, obj):
+        # type: (Dict) -> None
+        # fields stay in _raw until first accessed, see __getattr__
+        fields = self.__dict__
+        fields['_ordered'] = self._ordered or self._required
+        fields['_defaulted'] = ()
+        fields['_raw'] = obj
+
+    def _reads_models(self, name):
+        # type: (str) -> bool
+        # whether an adopted value of the field is read as new model
+        # objects, rather than returned as it is
+        kind = self._types.get(name)
+        if isinstance(kind, list):
+            kind = kind[0]
+        return hasattr(kind, 'from_trusted')
+
+    def _adopt_value(self, name, value):
+        # type: (str, Any) -> Any
+        kind = self._types.get(name)
+        if isinstance(kind, list):
+            kind = kind[0]
+            if hasattr(kind, 'from_trusted'):
+                return [kind.from_trusted(v) if isinstance(v, Mapping) else v
+                        for v in value]
+        elif hasattr(kind, 'from_trusted'):
+            if isinstance(value, Mapping):
+                return kind.from_trusted(value)
+        return value
+
+    def __getattr__(self, name):
+        # type: (str) -> Any
+        raw = self.__dict__.get('_raw')
+        if raw is None or name.startswith('__'):
+            raise AttributeError('%s has no attribute %s' % (
+                self.__class__.__name__, repr(name)))
+        if name in raw:
+            value = self._adopt_value(name, raw[name])
+        elif name in self._optional:
+            value = self._adopt_value(
+                name, copy.deepcopy(self._optional[name]))
+            self.__dict__['_defaulted'] += (name,)
+        else:
+            raise AttributeError('%s has no attribute %s' % (
+                self.__class__.__name__, repr(name)))
+        if value is not raw.get(name):
+            fields = self.__dict__
+            fields[name] = value
+            # the new objects and lists are tracked from the next dumps
+            if '_fragment' in fields or '_parent' in fields:
+                _changed(self)
+        return value
+
+    def __setattr__(self, name, value):
+        # type: (str, Any) -> None
+        super(HarObject, self).__setattr__(name, value)
+        fields = self.__dict__
+        if '_fragment' in fields or '_parent' in fields:
+            _changed(self)
+
+    def __delattr__(self, name):
+        # type: (str) -> None
+        fields = self.__dict__
+        if '_fragment' in fields or '_parent' in fields:
+            _changed(self)
+        raw = fields.get('_raw')
+        if raw is None or name not in raw:
+            return super(HarObject, self).__delattr__(name)
+        # the adopted dict may be shared, so copy before removing
+        fields['_raw'] = raw = copy.copy(raw)
+        del raw[name]
+        fields.pop(name, None)
+
+    def __getstate__(self):
+        # type: () -> Dict[str, Any]
+        # copies and pickles get neither the parent, the cached JSON nor
+        # the indexes of a log
+        state = self.__dict__.copy()
+        state.pop('_parent', None)
+        state.pop('_fragment', None)
+        state.pop('_indexes', None)
+        return state
+
+    def _trusted_items(self):
+        # type: () -> List[Tuple[str, Any]]
+        raw = self._raw
+        fields = self.__dict__
+        items = [(name, fields.get(name, value))
+                 for name, value in raw.items()]
+        for name, value in fields.items():
+            if name in raw or name in _TRUSTED_RESERVED:
+                continue
+            if name in self._defaulted and _to_json_value(
+                    value, dict) == self._optional[name]:
+                continue
+            items.append((name, value))
+        return items
+
+    def _unsorted_items(self):
+        # type: () -> List[Tuple[str, Any]]
+        if '_raw' in self.__dict__:
+            return self._trusted_items()
         return self._changed_items()
 
+    def items(self):
+        # type: () -> List[Tuple[str, Any]]
+        items = self._unsorted_items()
+        # if we have a specific order, then sort keys
+        ranks = _rank_table(self.__class__, self._ordered)
+        if ranks:
+            # stable, with fields that are not ordered kept last
+            items.sort(key=lambda item: ranks.get(item[0], len(ranks)))
+        # we want to see private attributes as well
+        return items
+
     def to_json(self, dict_class=OrderedDict, with_content=True):
         # type: (type, bool) -> Dict
-        return super(HarObject, self).to_json(dict_class=dict_class)
+        # for trusted objects, fields never accessed are emitted as the
+        # adopted values
+        serializer = _serializer(self.__class__, self._ordered)
+        return serializer(self._unsorted_items(), dict_class)
+
+    def dumps(self, with_content=True, **kwargs):
+        # type: (bool, **Any) -> str
+        '''
+        The JSON text is cached until this object or any object in it is
+        changed, through setattr or delattr on the object, or by adding,
+        removing or replacing the items of one of its lists. Dicts held
+        as field values must be replaced rather than changed in place.
+        '''
+        key = (with_content, sorted(kwargs.items()))
+        fields = self.__dict__
+        cached = fields.get('_fragment')
+        if cached is not None and cached[0] == key and _unchanged(cached[2]):
+            return cached[1]
+        s = jsonlib.dumps(self.to_json(dict_class=JSON_DICT,
+                                       with_content=with_content), **kwargs)
+        lists = []  # type: List[Tuple[list, Tuple[int, ...], tuple]]
+        _track(self, lists)
+        fields['_fragment'] = (key, s, lists)
+        return s
+
+    def dump(self, writer, **kwargs):
+        # type: (TextIO, **Any) -> None
+        jsonlib.dump(self.to_json(dict_class=JSON_DICT), writer, **kwargs)
 
     def decode(self, raw):
         # type: (Any) -> HarObject
-        mod = raw.__class__.__module__
-        for codec in self._codecs:
-            if mod in codec.modules:
-                har = codec.decode(raw, self.__class__)
-                return har
-        raise ValueError("%s could not be decoded" % raw.__class__)
+        decoder = harlib.codecs.find_decoder(raw.__class__, self.__class__)
+        if decoder is None:
+            raise ValueError("%s could not be decoded" % raw.__class__)
+        return decoder(raw)
 
     def encode(self, raw_class):
         # type: (type) -> Any
-        mod = raw_class.__module__
-        for codec in self._codecs:
-            if mod in codec.modules:
-                raw = codec.encode(self, raw_class)
-                return raw
-        raise ValueError("%s could not be encoded" % raw_class)
+        encoder = harlib.codecs.find_encoder(self.__class__, raw_class)
+        if encoder is None:
+            raise ValueError("%s could not be encoded" % raw_class)
+        return encoder(self)
 
     def serialize(self, io, raw):
         # type: (BinaryIO, Any) -> None
@@ -92,38 +276,158 @@ class HarObject(MetaObject):
         raise ValueError("%s could not be unserialized" % io.__class__)
 
 
+def _rank_table(har_class, ordered):
+    # type: (type, List[str]) -> Dict[str, int]
+    '''
+    Position of each field in the order of har_class, built once per class
+    '''
+    cached = _rank_tables.get(har_class)
+    # instances may order by _required, so the list itself is checked
+    if cached is None or cached[0] is not ordered:
+        ranks = {}  # type: Dict[str, int]
+        for rank, name in enumerate(ordered):
+            ranks.setdefault(name, rank)
+        cached = _rank_tables[har_class] = (ordered, ranks)
+    return cached[1]
+
+
+def _serializer_source(har_class, ordered, names):
+    # type: (type, List[str], Dict[str, Any]) -> str
+    '''
+    Python source of to_json for the unsorted items of har_class, which
+    emits the ordered fields first and then the rest as they come.
+    '''
+    cls = har_class.__name__
+    lines = [
+        'def to_json_%s(items, dict_class):' % cls,
+        '    fields = dict(items)',
+        '    pop = fields.pop',
+        '    d = dict_class()',
+    ]
+    for name in _rank_table(har_class, ordered):
+        kind = har_class._types.get(name)
+        lines.append('    v = pop(%r, MISSING)' % name)
+        if isinstance(kind, type) and kind in SCALAR_TYPES:
+            lines += [
+                '    if v is not MISSING:',
+                '        d[%r] = v' % name,
+            ]
+        else:
+            lines += [
+                '    if v is not MISSING:',
+                '        d[%r] = to_json_value(v, dict_class)' % name,
+            ]
+    lines += [
+        '    if fields:',
+        '        for name, v in items:',
+        '            if name in fields:',
+        '                d[name] = to_json_value(v, dict_class)',
+        '    return d',
+    ]
+    names['MISSING'] = _MISSING
+    names['to_json_value'] = _to_json_value
+    return '\n'.join(lines) + '\n'
+
+
+def _serializer(har_class, ordered):
+    # type: (type, List[str]) -> Callable
+    cached = _serializers.get(har_class)
+    if cached is None or cached[0] is not ordered:
+        names = {}  # type: Dict[str, Any]
+        source = _serializer_source(har_class, ordered, names)
+        six.exec_(compile(source, '<to_json %s>' % har_class.__name__,
+                          'exec'), names)
+        cached = _serializers[har_class] = (
+            ordered, names['to_json_%s' % har_class.__name__])
+    return cached[1]
+
+
+def _changed(obj):
+    # type: (Any) -> None
+    '''
+    Drops the cached JSON of obj and of every object that contains it
+    '''
+    while obj is not None:
+        fields = obj.__dict__
+        fields.pop('_fragment', None)
+        obj = fields.get('_parent')
+
+
+def _link(value, parent):
+    # type: (Any, Any) -> None
+    if isinstance(value, HarObject):
+        value.__dict__['_parent'] = parent
+    elif hasattr(value, '_parent'):  # compact objects
+        object.__setattr__(value, '_parent', parent)
+
+
+def _track(obj, lists):
+    # type: (HarObject, List[Tuple[list, Tuple[int, ...], tuple]]) -> None
+    '''
+    Links every model object in obj to its parent, so changes clear the
+    cached JSON of obj, and collects the lists in obj with their items.
+    '''
+    for name, value in list(obj.__dict__.items()):
+        if name in _UNTRACKED:
+            continue
+        if isinstance(value, list):
+            items = tuple(value)
+            lists.append((value, tuple(map(id, items)), items))
+        else:
+            items = (value,)
+        for item in items:
+            _link(item, obj)
+            if isinstance(item, HarObject):
+                _track(item, lists)
+
+
+def _unchanged(lists):
+    # type: (List[Tuple[list, Tuple[int, ...], tuple]]) -> bool
+    # the items are kept with their ids, so no id can be reused
+    for value, ids, items in lists:
+        if tuple(map(id, value)) != ids:
+            return False
+    return True
+
+
+def shared_copy(value):
+    # type: (Any) -> Any
+    '''
+    Returns a copy of a model object, lazy list or list of them,
+    see HarObject.adopt. Dicts are copied, other values returned as is.
+    '''
+    if value is None or value.__class__ in SCALAR_TYPES:
+        return value
+    adopt = getattr(value.__class__, 'adopt', None)
+    if adopt is not None:
+        return adopt(value)
+    if isinstance(value, list):
+        return [shared_copy(v) for v in value]
+    if isinstance(value, dict):
+        return copy.deepcopy(value)
+    return value
+
+
+def _to_json_value(value, dict_class):
+    # type: (Any, type) -> Any
+    if hasattr(value, 'to_json'):
+        return value.to_json(dict_class=dict_class)
+    if isinstance(value, list):
+        return [_to_json_value(v, dict_class) for v in value]
+    return value
+
+
 def initialize_codecs():
     # type: () -> None
     if hasattr(HarObject, '_codecs'):
         return
 
-    HarObject._codecs = []
-
-    try:
-        import harlib.codecs.requests
-        HarObject._codecs.append(harlib.codecs.requests.Urllib3Codec())
-        HarObject._codecs.append(harlib.codecs.requests.RequestsCodec())
-    except Exception as err:
-        logger.warning("no requests/urllib3: %s" % repr(err), exc_info=True)
-
-    try:
-        import harlib.codecs.httplib
-        HarObject._codecs.append(harlib.codecs.httplib.Urllib2Codec())
-        HarObject._codecs.append(harlib.codecs.httplib.HttplibCodec())
-    except Exception as err:
-        logger.warning("no urllib/httplib: %s" % repr(err), exc_info=True)
-
-    try:
-        import harlib.codecs.django
-        HarObject._codecs.append(harlib.codecs.django.DjangoCodec())
-    except Exception as err:
-        logger.warning("no django: %s" % repr(err), exc_info=True)
-
-    try:
-        import harlib.codecs.default
-        HarObject._codecs.append(harlib.codecs.default.DefaultCodec())
-    except Exception as err:
-        logger.warning("no default: %s" % repr(err), exc_info=True)
+    # kept for code that reads the codecs from here, see harlib.codecs
+    HarObject._codecs = harlib.codecs._codecs
+
+    # each is imported on first use, with the libraries it converts
+    for path, modules in harlib.codecs.BUILTIN_CODECS:
+        harlib.codecs.register_lazy_codec(path, modules)
 
 
 initialize_codecs()
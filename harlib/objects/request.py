@@ -9,7 +9,7 @@
 # modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
 from __future__ import absolute_import
 from collections import Mapping
-from .metamodel import HarObject
+from .compact import MODEL_TYPES
 from .messages import (
     HarCookie,
     HarHeader,
@@ -53,7 +53,11 @@ class HarRequestBody(HarMessageBody):
 
         if isinstance(obj, Mapping):
             har = obj
-        elif isinstance(obj, HarObject):
+        elif isinstance(obj, self.__class__):
+            # copied without serializing, see HarObject.adopt
+            self._adopt_object(obj)
+            return
+        elif isinstance(obj, MODEL_TYPES):
             har = obj.to_json()
         else:
             har = self.decode(obj)
@@ -134,7 +138,11 @@ class HarRequest(HarMessage):
 
         if isinstance(obj, Mapping):
             har = obj
-        elif isinstance(obj, HarObject):
+        elif isinstance(obj, self.__class__):
+            # copied without serializing, see HarObject.adopt
+            self._adopt_object(obj)
+            return
+        elif isinstance(obj, MODEL_TYPES):
             har = obj.to_json()
         else:
             har = self.decode(obj)
@@ -10,7 +10,7 @@
 
 from __future__ import absolute_import
 import collections
-from .metamodel import HarObject
+from .compact import MODEL_TYPES
 
 from .messages import (
     HarCookie,
@@ -45,7 +45,11 @@ class HarResponseBody(HarMessageBody):
 
         if isinstance(obj, collections.Mapping):
             har = obj
-        elif isinstance(obj, HarObject):
+        elif isinstance(obj, self.__class__):
+            # copied without serializing, see HarObject.adopt
+            self._adopt_object(obj)
+            return
+        elif isinstance(obj, MODEL_TYPES):
             har = obj.to_json()
         else:
             har = self.decode(obj)
@@ -108,7 +112,11 @@ class HarResponse(HarMessage):
 
         if isinstance(obj, collections.Mapping):
             har = obj
-        elif isinstance(obj, HarObject):
+        elif isinstance(obj, self.__class__):
+            # copied without serializing, see HarObject.adopt
+            self._adopt_object(obj)
+            return
+        elif isinstance(obj, MODEL_TYPES):
             har = obj.to_json()
         else:
             har = self.decode(obj)
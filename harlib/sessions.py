@@ -11,12 +11,13 @@ from __future__ import absolute_import
 import logging
 import os
 import hashlib
+import time
 import six
 from .codecs.requests import RequestsCodec
 from .compat import OrderedDict
 from .compat import requests
 from .compat import DEFAULT_STREAM
-from . import objects, utils
+from . import bodies, compression, jsonl, objects, streaming, utils
 from six.moves import map
 
 try:
@@ -29,6 +30,13 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def _extra_data(extra):
+    # type: (Any) -> Dict[str, Any]
+    if isinstance(extra, dict):
+        return extra
+    return extra.to_json()
+
+
 class HarSessionMixin(object):
 
     def __init__(self, filename=None):
@@ -43,6 +51,31 @@ class HarSessionMixin(object):
         self.keep_client_options = False
         self.keep_server_options = False
         self.keep_socket_options = False
+        # 'har', 'jsonl' to append as captured, or 'compact' to write each
+        # distinct body text once, see harlib.bodies
+        self.output_format = 'har'
+        self.body_store = None  # BodyStore to hold the captured bodies
+        # True for the pack next to the file, or a BodyStore or path, to
+        # write body texts of blob_threshold characters or more out of line
+        self.blobs = None
+        self.blob_threshold = bodies.BLOB_THRESHOLD
+        self.compression = None  # from the file extension by default
+        self.compress_level = None
+        # whether dump() and flush() write the request and response bodies
+        self.with_content = False
+        # the _metadata of each entry as it is kept, like dump(extra=...)
+        # which cannot change the entries already flushed
+        self.extra = None
+        # flush the kept entries to the file, dropping them from memory,
+        # once flush_entries are kept, their JSON reaches flush_bytes
+        # characters, or flush_seconds passed since the last flush
+        self.flush_entries = None
+        self.flush_bytes = None
+        self.flush_seconds = None
+        self._appender = None  # HarFileAppender started by flush
+        self._flushed = 0
+        self._pending_bytes = 0
+        self._flushed_at = time.time()
 
     def from_har(self, obj):
         # type: (Dict) -> HarSessionMixin
@@ -57,6 +90,73 @@ class HarSessionMixin(object):
     def clear(self):
         # type: () -> None
         self._entries = []
+        self._pending_bytes = 0
+
+    def flush(self, with_content=None):
+        # type: (Optional[bool]) -> int
+        '''
+        Writes the kept entries to the file and drops them from memory,
+        returning how many. The first flush starts the file and later ones
+        append to it, so it is a complete HAR file after each flush, and
+        dump() appends the entries kept since. The bodies are written if
+        with_content is true, by default if self.with_content is.
+        '''
+        if with_content is None:
+            with_content = self.with_content
+        self._check_flush()
+        entries = self._entries
+        if not self._filename or not entries:
+            return 0
+        # jsonl entries were already appended by _keep_entries
+        if self.output_format != 'jsonl':
+            if self._appender is None:
+                dirname = os.path.dirname(self._filename)
+                if dirname and not os.path.exists(dirname):
+                    os.makedirs(dirname)
+                self._appender = streaming.HarFileAppender(
+                    self._filename, objects.HarLog().header_to_json())
+            self._appender.append(entries, with_content)
+        self._entries = []
+        self._flushed += len(entries)
+        self._pending_bytes = 0
+        self._flushed_at = time.time()
+        return len(entries)
+
+    def _check_flush(self):
+        # type: () -> None
+        '''
+        Raises ValueError if the output is compressed, compact or has its
+        bodies in blobs, which dump() writes whole and flush cannot append to.
+        '''
+        if (self.output_format == 'compact' or
+                self.output_format == 'har' and (
+                    self.blobs is not None or
+                    self.compression is not None or
+                    compression.detect_compression(
+                        filename=self._filename) is not None)):
+            raise ValueError('only uncompressed har or jsonl output can be '
+                             'flushed, not %s' % self._filename)
+
+    def _has_flush_policy(self):
+        # type: () -> bool
+        return (self.flush_entries is not None or
+                self.flush_bytes is not None or
+                self.flush_seconds is not None)
+
+    def _should_flush(self, new_entries):
+        # type: (List[objects.HarEntry]) -> bool
+        if self.flush_bytes is not None:
+            # the JSON is cached, so flush does not convert them again
+            self._pending_bytes += sum(
+                len(entry.dumps(with_content=self.with_content))
+                for entry in new_entries)
+            if self._pending_bytes >= self.flush_bytes:
+                return True
+        if (self.flush_entries is not None and
+                len(self._entries) >= self.flush_entries):
+            return True
+        return (self.flush_seconds is not None and
+                time.time() - self._flushed_at >= self.flush_seconds)
 
     def _dump_metadata(
             self, with_content=False,
@@ -64,14 +164,28 @@ class HarSessionMixin(object):
             extra=None, cache=True,
             with_io=False, **kwargs):
         # type: (bool, Optional[int], Any, bool, bool, **Any) -> None
+        if extra is None:
+            extra = self.extra
         if extra is not None:
-            if isinstance(extra, dict):
-                extra_data = extra
-            else:
-                extra_data = extra.to_json()
+            extra_data = _extra_data(extra)
             for entry in self._entries:
                 entry._metadata = extra_data
 
+    def _dump_check_flushed(
+            self, extra=None, cache=True,
+            with_io=False, **kwargs):
+        # type: (Any, bool, bool, **Any) -> None
+        if kwargs:
+            raise ValueError('%s cannot be applied to the entries flushed '
+                             'to %s' % (', '.join(sorted(kwargs)),
+                                        self._filename))
+        if extra is not None and (
+                self.extra is None or
+                _extra_data(extra) != _extra_data(self.extra)):
+            raise ValueError('extra cannot be applied to the entries flushed '
+                             'to %s, set it as the extra of the session '
+                             'before they are' % self._filename)
+
     def _dump_check_dir(
             self, with_content=False,
             logging_level=None,
@@ -88,7 +202,8 @@ class HarSessionMixin(object):
             extra=None, cache=True,
             with_io=False, **kwargs):
         # type: (bool, Optional[int], Any, bool, bool, **Any) -> None
-        if cache:
+        # the hash would only cover the entries not yet flushed
+        if cache and self._appender is None:
             content_hash = self.get_content_hash()
             cache_dir = os.path.join(
                 os.path.dirname(self._filename), '.harlib')
@@ -115,11 +230,25 @@ class HarSessionMixin(object):
             extra=None, cache=True,
             with_io=False, **kwargs):
         # type: (bool, Optional[int], Any, bool, bool, **Any) -> None
-        har = self.to_har(with_content=with_content)
-        har_dump = har.dumps(**kwargs)
-        with open(self._filename, 'w') as f:
-            f.write(har_dump)
-        if cache:
+        if self._appender is not None:
+            # the file was started by flush, so the rest is appended to it
+            self.flush(with_content)
+        # jsonl entries were already appended by _keep_entries
+        elif self.output_format != 'jsonl':
+            blobs = self.blobs
+            if blobs is True:
+                blobs = bodies.blobs_path(self._filename)
+            if self.output_format == 'compact' or blobs is not None:
+                har_dump = bodies.dumps_compact(
+                    self.to_har(with_content=with_content), blobs=blobs,
+                    threshold=self.blob_threshold,
+                    inline=self.output_format != 'compact', **kwargs)
+            else:
+                har_dump = self.dumps(with_content=with_content, **kwargs)
+            with compression.open_writer(self._filename, self.compression,
+                                         self.compress_level) as f:
+                f.write(har_dump)
+        if cache and self._appender is None:
             with open(self._cache_filename, 'w') as writer:
                 writer.write(self._filename)
 
@@ -136,14 +265,25 @@ class HarSessionMixin(object):
         if VIRTUAL_ENV and filename and filename.startswith(VIRTUAL_ENV):
             filename = '${VIRTUAL_ENV}' + filename[len(VIRTUAL_ENV):]
         logger.log(logging_level, 'Dumped %d responses to %s' %
-                   (len(self._entries), filename), extra=extra)
+                   (self._flushed + len(self._entries), filename),
+                   extra=extra)
 
-    def dump(self, with_content=False,
+    def dump(self, with_content=None,
              logging_level=None, **kwargs):
-        # type: (bool, Optional[int], **Any) -> None
+        # type: (Optional[bool], Optional[int], **Any) -> None
+        '''
+        Writes the kept entries to the file. Once entries were flushed, the
+        rest are appended as flush writes them, so keyword arguments for
+        the format (indent, ...) and an extra other than self.extra raise
+        ValueError, as they cannot apply to the entries already written.
+        '''
+        if with_content is None:
+            with_content = self.with_content
         if logging_level is None:
             logging_level = logging.DEBUG
-        if self._filename and self._entries:
+        if self._appender is not None:
+            self._dump_check_flushed(**kwargs)
+        if self._filename and (self._entries or self._appender is not None):
             try:
                 # Refactored this because of its original complexity.
                 # C901 'HarSessionMixin.dump' is too complex (16)
@@ -161,8 +301,12 @@ class HarSessionMixin(object):
         return str(self._filename)
 
     def dumps(self, with_content=False, **kwargs):
-        har = self.to_har(with_content=with_content)
-        s = har.dumps(**kwargs)
+        # the entries are written as they are, so each keeps the JSON it
+        # cached in previous dumps, see HarObject.dumps
+        har = objects.HarFile([])
+        if self._filename:
+            har.log.entries = self._entries
+        s = har.dumps(with_content=with_content, **kwargs)
         return s
 
     def to_json(self, with_content=False, dict_class=OrderedDict, indent=None):
@@ -180,7 +324,10 @@ class HarSessionMixin(object):
         '''
         har = objects.HarFile([])
         if self._filename:
-            har.log.entries = self._entries
+            # copies, so deleting their content below leaves it
+            # in the entries of the session
+            har.log.entries = [objects.HarEntry.adopt(entry)
+                               for entry in self._entries]
 
         if with_content:
             return har
@@ -278,10 +425,18 @@ class HarSessionMixin(object):
     def _keep_entries(self, resp):
         # type: (requests.Response) -> None
         if self._filename is not None:
+            if self._has_flush_policy():
+                # before the entries are kept, so that they are never
+                # held without bound when the file cannot be appended to
+                self._check_flush()
             new_entries = objects.HarLog(resp).entries
             for entry in new_entries:
+                if self.extra is not None:
+                    entry._metadata = _extra_data(self.extra)
                 if not self.keep_content:
                     self._delete_content(entry)
+                elif self.body_store is not None:
+                    entry.store_bodies(self.body_store)
                 if self.keep_socket_options and len(self._kept_sockopts) > 0:
                     entry._socketOptions = list(map(
                         objects.HarSocketOption, self._kept_sockopts))
@@ -290,6 +445,35 @@ class HarSessionMixin(object):
                         decode_HarClientOptions_from_Session(self)
                     entry._clientOptions.__dict__.update(clientOptions)
             self._entries.extend(new_entries)
+            if self.output_format == 'jsonl':
+                self._append_jsonl(new_entries)
+            if self._should_flush(new_entries):
+                try:
+                    self.flush()
+                except (IOError, OSError) as err:
+                    logger.warning('%s %s' % (type(err), repr(err)))
+
+    def _append_jsonl(self, entries):
+        # type: (List[objects.HarEntry]) -> None
+        '''
+        Appends one line per entry, starting a new file with the log header
+        '''
+        if not self._filename:
+            return
+        try:
+            dirname = os.path.dirname(self._filename)
+            if dirname and not os.path.exists(dirname):
+                os.makedirs(dirname)
+            is_new = (not os.path.exists(self._filename) or
+                      not os.path.getsize(self._filename))
+            with open(self._filename, 'a') as writer:
+                if is_new:
+                    header = objects.HarLog().header_to_json()
+                    writer.write(jsonl.dumps_line({'log': header}))
+                for entry in entries:
+                    writer.write(jsonl.dumps_line(entry))
+        except (IOError, OSError) as err:
+            logger.warning('%s %s' % (type(err), repr(err)))
 
     def _update_entry(self, attr, value, index=-1):
         # type: (str, Any, int) -> None
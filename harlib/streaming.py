@@ -0,0 +1,388 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+import codecs
+import os
+import re
+import six
+from . import jsonlib
+from .compat import OrderedDict
+
+try:
+    from typing import (
+        Any, Dict, Iterable, Iterator, List, Optional, TextIO,
+        Tuple, Union)
+except ImportError:
+    pass
+
+CHUNK_SIZE = 1 << 16
+
+
+class _Syntax(object):
+    '''
+    Compiled JSON lexemes, for either text or bytes buffers.
+    '''
+
+    def __init__(self, convert):
+        self.string = re.compile(convert(r'"[^"\\]*(?:\\.[^"\\]*)*"'), re.S)
+        self.token = re.compile(convert(r'["{}\[\]]'))
+        self.scalar_end = re.compile(convert(r'[,:}\]\s]'))
+        self.whitespace = re.compile(convert(r'[ \t\n\r]*'))
+        self.quote = convert('"')
+        self.openers = (convert('{'), convert('['))
+
+
+_TEXT_SYNTAX = _Syntax(six.text_type)
+_BYTES_SYNTAX = _Syntax(lambda s: s.encode('ascii'))
+
+
+def _syntax(buf):
+    if isinstance(buf, six.text_type):
+        return _TEXT_SYNTAX
+    return _BYTES_SYNTAX
+
+
+def skip_value(buf, pos):
+    # type: (Union[str, bytes], int) -> int
+    '''
+    Returns the offset just past the JSON value starting at buf[pos],
+    or -1 if buf ends before the value does. Works on text, bytes and mmap.
+    '''
+    syntax = _syntax(buf)
+    first = buf[pos:pos + 1]
+    if first == syntax.quote:
+        match = syntax.string.match(buf, pos)
+        return match.end() if match else -1
+    if first in syntax.openers:
+        depth = 0
+        while True:
+            match = syntax.token.search(buf, pos)
+            if match is None:
+                return -1
+            token = match.group()
+            if token == syntax.quote:
+                match = syntax.string.match(buf, match.start())
+                if match is None:
+                    return -1
+            elif token in syntax.openers:
+                depth += 1
+            else:
+                depth -= 1
+            pos = match.end()
+            if depth == 0:
+                return pos
+    match = syntax.scalar_end.search(buf, pos)
+    return match.start() if match else -1
+
+
+def skip_whitespace(buf, pos):
+    # type: (Union[str, bytes], int) -> int
+    return _syntax(buf).whitespace.match(buf, pos).end()
+
+
+class HarStreamReader(object):
+    '''
+    Incremental reader for HAR documents.
+
+    Only one element of log.entries is held in memory at a time. The other
+    fields of the log object are collected into self.log as they are passed,
+    so fields that follow "entries" only show up once it has been consumed.
+    With decode=False the reader is read as raw UTF-8 bytes, which is what
+    makes self.span usable as file offsets.
+    '''
+
+    def __init__(self, reader, chunk_size=CHUNK_SIZE, decode=True):
+        # type: (TextIO, int, bool) -> None
+        self._reader = reader
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._decode = decode
+        self._buf = u'' if decode else b''
+        self._pos = 0
+        self._offset = 0
+        self._eof = False
+        self._events = self._walk()
+        self._started = False
+        self.log = OrderedDict()  # type: Dict[str, Any]
+        self.span = (0, 0)
+
+    def _fill(self):
+        # type: () -> bool
+        if self._eof:
+            return False
+        # read at least as much as is pending, so that a value spanning
+        # many chunks is not rescanned once per chunk
+        pending = len(self._buf) - self._pos
+        chunk = self._reader.read(max(self._chunk_size, pending))
+        if not self._decode:
+            chunk = chunk or b''
+            self._eof = not chunk
+        elif not chunk:
+            self._eof = True
+            chunk = self._decoder.decode(b'', True)
+        elif not isinstance(chunk, six.text_type):
+            chunk = self._decoder.decode(chunk)
+        elif not self._buf and chunk.startswith(u'\ufeff'):
+            chunk = chunk[1:]
+        self._offset += self._pos
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        if (not self._decode and not self._offset and
+                self._buf.startswith(codecs.BOM_UTF8)):
+            self._pos = len(codecs.BOM_UTF8)
+        return not self._eof or bool(chunk)
+
+    def _peek(self):
+        # type: () -> str
+        while True:
+            self._pos = skip_whitespace(self._buf, self._pos)
+            if self._pos < len(self._buf):
+                char = self._buf[self._pos:self._pos + 1]
+                return char if self._decode else char.decode('latin-1')
+            if not self._fill():
+                return u''
+
+    def _expect(self, chars):
+        # type: (str) -> str
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError('expected %s but got %s in HAR document' % (
+                ' or '.join(map(repr, chars)), repr(char) if char else 'EOF'))
+        self._pos += 1
+        return char
+
+    def _scan(self):
+        # type: () -> str
+        self._peek()
+        while True:
+            end = skip_value(self._buf, self._pos)
+            if end != -1 and (end < len(self._buf) or self._eof):
+                break
+            if not self._fill():
+                if end == -1:
+                    raise ValueError('truncated HAR document')
+        text = self._buf[self._pos:end]
+        self.span = (self._offset + self._pos, self._offset + end)
+        self._pos = end
+        return text
+
+    def _value(self):
+        # type: () -> Any
+        return jsonlib.loads(self._scan())
+
+    def _members(self):
+        # type: () -> Iterator[str]
+        if self._peek() == u'}':
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(u':')
+            yield key
+            if self._expect(u',}') == u'}':
+                return
+
+    def _elements(self):
+        # type: () -> Iterator[None]
+        if self._peek() == u']':
+            self._pos += 1
+            return
+        while True:
+            yield
+            if self._expect(u',]') == u']':
+                return
+
+    def _walk(self):
+        # type: () -> Iterator[Optional[str]]
+        self._expect(u'{')
+        for key in self._members():
+            if key != 'log':
+                self._scan()
+                continue
+            self._expect(u'{')
+            for name in self._members():
+                if name != 'entries':
+                    self.log[name] = self._value()
+                    continue
+                self._expect(u'[')
+                yield None
+                for _ in self._elements():
+                    yield self._scan()
+
+    def read_header(self, complete=False):
+        # type: (bool) -> Dict[str, Any]
+        '''
+        Reads the log fields up to "entries", or through the end of the
+        document if complete is true (skipping entries without parsing them).
+        '''
+        if not self._started:
+            self._started = True
+            next(self._events, None)
+        if complete:
+            for _ in self._events:
+                pass
+        return self.log
+
+    def iter_raw(self):
+        # type: () -> Iterator[str]
+        '''
+        Yields the JSON text of each element of log.entries.
+        '''
+        self.read_header()
+        for text in self._events:
+            yield text
+
+    def iter_spans(self):
+        # type: () -> Iterator[Tuple[int, int]]
+        '''
+        Yields the (start, end) offsets of each element of log.entries,
+        in bytes if decode is false, otherwise in characters.
+        '''
+        for _ in self.iter_raw():
+            yield self.span
+
+    def iter_dicts(self):
+        # type: () -> Iterator[Dict[str, Any]]
+        for text in self.iter_raw():
+            yield jsonlib.loads(text)
+
+    def iter_entries(self):
+        # type: () -> Iterator[Any]
+        from .objects import HarEntry
+        for d in self.iter_dicts():
+            yield HarEntry(d)
+
+
+class HarStreamWriter(object):
+    '''
+    Incremental writer for HAR documents, the counterpart of HarStreamReader.
+
+    The log fields in header are written first, then each entry as it is
+    passed, one per line. Fields passed to close() follow "entries", the way
+    HarStreamReader collects fields that come after it.
+    '''
+
+    def __init__(self, writer, header=None, **kwargs):
+        # type: (TextIO, Optional[Dict[str, Any]], **Any) -> None
+        self._writer = writer
+        self._header = header
+        self._kwargs = kwargs
+        self._started = False
+        self._closed = False
+        self.count = 0
+
+    def __enter__(self):
+        # type: () -> HarStreamWriter
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def _fields(self, log):
+        # type: (Dict[str, Any]) -> List[str]
+        return [u'%s: %s' % (jsonlib.dumps(name),
+                             jsonlib.dumps(value, **self._kwargs))
+                for name, value in log.items() if name != 'entries']
+
+    def _start(self):
+        # type: () -> None
+        if not self._started:
+            self._started = True
+            fields = self._fields(self._header or {}) + [u'"entries": [']
+            self._writer.write(u'{"log": {%s' % u', '.join(fields))
+
+    def write_entry(self, entry):
+        # type: (Any) -> None
+        '''
+        Writes one entry, either a HarEntry or its dict.
+        '''
+        if self._closed:
+            raise ValueError('write to closed HarStreamWriter')
+        self._start()
+        if hasattr(entry, 'to_json'):
+            entry = entry.to_json()
+        self._writer.write(u',\n' if self.count else u'\n')
+        self._writer.write(jsonlib.dumps(entry, **self._kwargs))
+        self.count += 1
+
+    def close(self, log=None):
+        # type: (Optional[Dict[str, Any]]) -> None
+        if self._closed:
+            return
+        self._start()
+        fields = [u'\n]'] + self._fields(log or {})
+        self._writer.write(u'%s}}\n' % u', '.join(fields))
+        self._closed = True
+
+
+class HarFileAppender(object):
+    '''
+    Appender of entries to a HAR file, which is complete after each append.
+
+    The first append starts the file with the log fields in header, as
+    HarStreamWriter writes it. Each append then writes over the closing
+    brackets at the end of the file and writes them again after the new
+    entries, so the file is a complete HAR document between appends.
+    '''
+
+    TAIL = b'\n]}}\n'
+
+    def __init__(self, path, header=None, **kwargs):
+        # type: (str, Optional[Dict[str, Any]], **Any) -> None
+        self.path = path
+        self._header = header
+        self._kwargs = kwargs
+        self._started = False
+        self.count = 0
+
+    def _start(self):
+        # type: () -> None
+        writer = six.StringIO()
+        HarStreamWriter(writer, self._header, **self._kwargs).close()
+        with open(self.path, 'wb') as f:
+            f.write(writer.getvalue().encode('utf-8'))
+        self._started = True
+
+    def _dumps(self, entry, with_content):
+        # type: (Any, bool) -> str
+        # a HarEntry reuses the JSON it cached, see HarObject.dumps
+        if hasattr(entry, 'dumps'):
+            return entry.dumps(with_content=with_content, **self._kwargs)
+        if not with_content:
+            from .objects.entry import _without_content
+            entry = _without_content(entry)
+        return jsonlib.dumps(entry, **self._kwargs)
+
+    def append(self, entries, with_content=True):
+        # type: (Iterable[Any], bool) -> int
+        '''
+        Writes entries, each a HarEntry or its dict, and returns how many.
+        With with_content false, the request and response bodies are left
+        out, as in HarEntry.to_json.
+        '''
+        if not self._started:
+            self._start()
+        texts = [self._dumps(entry, with_content) for entry in entries]
+        if not texts:
+            return 0
+        text = (u',\n' if self.count else u'\n') + u',\n'.join(texts)
+        with open(self.path, 'r+b') as f:
+            f.seek(-len(self.TAIL), os.SEEK_END)
+            if f.read() != self.TAIL:
+                raise ValueError('%s was changed since it was appended to'
+                                 % self.path)
+            f.seek(-len(self.TAIL), os.SEEK_END)
+            f.write(text.encode('utf-8') + self.TAIL)
+        self.count += len(texts)
+        return len(texts)
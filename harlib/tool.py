@@ -13,8 +13,7 @@ harlib - HTTP Archive (HAR) format library
 from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
-import json
-from harlib.compat import OrderedDict
+from harlib import compression, jsonlib
 
 
 def by_name(har):
@@ -58,17 +57,35 @@ def sorted_har(har):
 
 
 def har_sort(reader, writer):
-    d = json.load(reader, object_pairs_hook=OrderedDict)
+    d = jsonlib.load(reader, ordered=True)
     d = sorted_har(d)
-    print(json.dumps(d, indent=2, default=str,
-                     separators=(',', ': ')), file=writer)
+    print(jsonlib.dumps(d, indent=2, default=str,
+                        separators=(',', ': ')), file=writer)
 
 
 def har_sort_main():
     import sys
     filename = sys.argv[1]
-    with open(filename, 'r') as reader:
-        har_sort(reader, sys.stdout)
+    output = sys.argv[2] if len(sys.argv) > 2 else sys.stdout
+    with compression.open_reader(filename) as reader:
+        with compression.open_writer(output) as writer:
+            har_sort(reader, writer)
+
+
+def har_to_jsonl_main():
+    import sys
+    from harlib.jsonl import har_to_jsonl
+    filename = sys.argv[1]
+    with compression.open_reader(filename) as reader:
+        har_to_jsonl(reader, sys.stdout)
+
+
+def jsonl_to_har_main():
+    import sys
+    from harlib.jsonl import jsonl_to_har
+    filename = sys.argv[1]
+    with compression.open_reader(filename) as reader:
+        jsonl_to_har(reader, sys.stdout)
 
 
 main = har_sort_main
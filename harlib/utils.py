@@ -11,6 +11,7 @@
 harlib - HTTP Archive (HAR) format library
 '''
 from __future__ import absolute_import
+import re
 import socket
 import struct
 import json
@@ -34,6 +35,143 @@ def parse_http_version(s):
     return int(float(s.split('/', 1)[1]) * 10.0)
 
 
+_ISO_DATETIME = re.compile(
+    r'(\d{4})-(\d\d)-(\d\d)[Tt ](\d\d):(\d\d)(?::(\d\d)(?:[.,](\d+))?)?'
+    r' ?([Zz]|[+-]\d\d(?::?\d\d)?)?$')
+
+
+def _days_from_civil(year, month, day):
+    '''
+    Days from 1970-01-01 to a date of the proleptic Gregorian calendar
+    '''
+    if month <= 2:
+        year -= 1
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = (year_of_era * 365 + year_of_era // 4 - year_of_era // 100 +
+                  day_of_year)
+    return era * 146097 + day_of_era - 719468
+
+
+# nanoseconds since the epoch of 'YYYY-MM-DDTHH:MM' prefixes, which the
+# entries of a capture share few of
+_ISO_MINUTE = re.compile(r'(\d{4})-(\d\d)-(\d\d)[Tt ](\d\d):(\d\d)$')
+_minutes = {}
+_MINUTES_SIZE = 1 << 14
+
+
+def _parse_minute_ns(s):
+    '''
+    Nanoseconds since the epoch of YYYY-MM-DDTHH:MM:SS[.fraction] with Z
+    or a +HH:MM offset, from the cache of its minute, or None for any
+    other form
+    '''
+    tail = s[16:]
+    shift = 0
+    if tail[-1:] in ('Z', 'z'):
+        tail = tail[:-1]
+    elif tail[-6:-5] in ('+', '-') and tail[-3:-2] == ':' and \
+            tail[-5:-3].isdigit() and tail[-2:].isdigit():
+        shift = int(tail[-5:-3]) * 3600 + int(tail[-2:]) * 60
+        if tail[-6] == '+':
+            shift = -shift
+        tail = tail[:-6]
+    else:
+        return None
+    if tail[:1] != ':' or len(tail) < 3:
+        return None
+    second = tail[1:3]
+    fraction = tail[4:]
+    if not second.isdigit() or tail[3:] and not (
+            tail[3] in '.,' and fraction.isdigit()):
+        return None
+    base = _minutes.get(s[:16])
+    if base is None:
+        match = _ISO_MINUTE.match(s[:16])
+        if match is None:
+            return None
+        year, month, day, hour, minute = [int(v) for v in match.groups()]
+        if not (1 <= month <= 12 and 1 <= day <= 31):
+            return None
+        if len(_minutes) >= _MINUTES_SIZE:
+            _minutes.clear()
+        base = _minutes[s[:16]] = (
+            _days_from_civil(year, month, day) * 86400 + hour * 3600 +
+            minute * 60) * 1000000000
+    try:
+        return base + (int(second) + shift) * 1000000000 + int(
+            (fraction + '00000000')[:9])
+    except ValueError:  # digits that int does not take
+        return None
+
+
+def parse_iso_datetime_ns(s):
+    '''
+    Function from .startedDateTime to nanoseconds since the epoch, or
+    None if it is not an ISO 8601 date and time. Times without an offset
+    are taken as UTC. Digits past nanoseconds are dropped.
+    '''
+    if not isinstance(s, six.string_types):
+        return None
+    ns = _parse_minute_ns(s)
+    if ns is not None:
+        return ns
+    match = _ISO_DATETIME.match(s)
+    if match is None:
+        return None
+    year, month, day, hour, minute, second, fraction, offset = \
+        match.groups()
+    month, day = int(month), int(day)
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return None
+    seconds = (_days_from_civil(int(year), month, day) * 86400 +
+               int(hour) * 3600 + int(minute) * 60 + int(second or 0))
+    if offset and offset not in 'Zz':
+        digits = offset[1:].replace(':', '')
+        shift = int(digits[:2]) * 3600 + int(digits[2:] or 0) * 60
+        seconds += -shift if offset[0] == '+' else shift
+    return seconds * 1000000000 + int((fraction or '')[:9].ljust(9, '0'))
+
+
+def parse_iso_datetime_us(s):
+    '''
+    Function from .startedDateTime to microseconds since the epoch, see
+    parse_iso_datetime_ns
+    '''
+    ns = parse_iso_datetime_ns(s)
+    return None if ns is None else ns // 1000
+
+
+def get_item(obj, name):
+    '''
+    Field of a dict, or None, also if obj is None
+    '''
+    return obj.get(name) if obj is not None else None
+
+
+def get_attr(obj, name):
+    '''
+    Field of a model object, or None, also if obj is None
+    '''
+    return getattr(obj, name, None)
+
+
+def url_host(url):
+    '''
+    Lower case host and port of a URL, without user info
+    '''
+    start = url.find('://')
+    start = 0 if start < 0 else start + 3
+    end = len(url)
+    for char in '/?#':
+        pos = url.find(char, start, end)
+        if pos >= 0:
+            end = pos
+    netloc = url[start:end]
+    return netloc[netloc.rfind('@') + 1:].lower()
+
+
 def parse_pair(item):
     if '=' not in item:
         item += '='
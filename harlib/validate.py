@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Schema validation of raw HAR dicts, without building model objects. The
+_required, _optional and _types declarations of each model class are
+compiled into one Python function per class, the first time it is needed.
+
+A field is missing if it is in _required and has no _optional default.
+Typed fields must hold a JSON value their type can be built from (None is
+accepted where that is the default); other fields are not checked.
+'''
+from __future__ import absolute_import
+from __future__ import print_function
+from multiprocessing import Pool
+import six
+from . import jsonlib
+from .compat import OrderedDict
+from .compression import open_reader
+from .objects import HarEntry, HarFile, HarLog
+
+try:
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+except ImportError:
+    pass
+
+NUMBER_TYPES = six.integer_types + (float,)
+STRING_TYPES = (str, six.text_type)
+
+# JSON value types that each declared Python type can be built from
+JSON_TYPES = {
+    bool: (bool,),
+    int: NUMBER_TYPES,
+    float: NUMBER_TYPES,
+    dict: (dict,),
+    list: (list,),
+}
+
+_NO_DEFAULT = object()
+
+_validators = {}  # type: Dict[type, Callable]
+
+
+def render_path(path):
+    # type: (Any) -> str
+    '''
+    Renders a path as built by validators, nested (parent, key) pairs
+    from a root of ((), None), as in log.entries[812].response.headers[3]
+    '''
+    keys = []
+    while path:
+        path, key = path
+        if key is not None:
+            keys.append(key)
+    s = ''
+    for key in reversed(keys):
+        if isinstance(key, six.integer_types):
+            s += '[%d]' % key
+        else:
+            s += '.%s' % key if s else key
+    return s
+
+
+def _is_model(kind):
+    # type: (Any) -> bool
+    return isinstance(kind, type) and hasattr(kind, 'from_trusted')
+
+
+def _missing(har_class):
+    # type: (type) -> List[str]
+    return [name for name in har_class._required
+            if name not in har_class._optional]
+
+
+def _shallow(har_class):
+    # type: (type) -> bool
+    '''
+    True if a class has no typed fields, so a dict with all its required
+    fields is valid, as for headers, cookies and query parameters.
+    '''
+    return not har_class._types
+
+
+def _source(har_class, names):
+    # type: (type, Dict[str, Any]) -> str
+    '''
+    Python source of the validator of har_class. Everything it refers to
+    is put into names.
+    '''
+    cls = har_class.__name__
+    lines = [
+        'def validate_%s(d, parent, key, errors):' % cls,
+        '    if not isinstance(d, dict):',
+        '        errors.append(((parent, key), "expected an object"))',
+        '        return',
+    ]
+    missing = _missing(har_class)
+    if missing:
+        names['REQUIRED_%s' % cls] = frozenset(missing)
+        names['MISSING_%s' % cls] = missing
+        lines += [
+            '    if not REQUIRED_%s.issubset(d):' % cls,
+            '        for name in MISSING_%s:' % cls,
+            '            if name not in d:',
+            '                errors.append((((parent, key), name),',
+            '                               "missing required field"))',
+        ]
+    for name, kind in sorted(har_class._types.items()):
+        default = har_class._optional.get(name, _NO_DEFAULT)
+        lines.append('    v = d.get(%r, d)' % name)
+        if default is None:
+            lines.append('    if v is not d and v is not None:')
+        else:
+            lines.append('    if v is not d:')
+        if isinstance(kind, list):
+            item = kind[0]
+            lines += [
+                '        if not isinstance(v, list):',
+                '            errors.append((((parent, key), %r),' % name,
+                '                           "expected an array"))',
+                '        else:',
+            ]
+            if _is_model(item):
+                names['validate_%s' % item.__name__] = _compile(item)
+                check = 'validate_%s(x, items, i, errors)' % item.__name__
+                if _shallow(item) and _missing(item):
+                    # inline the check of name/value pairs, and only call
+                    # the validator to report what is wrong
+                    names['REQUIRED_%s' % item.__name__] = frozenset(
+                        _missing(item))
+                    lines += [
+                        '            items = ((parent, key), %r)' % name,
+                        '            for i, x in enumerate(v):',
+                        '                if (type(x) is not dict or not',
+                        '                        REQUIRED_%s.issubset(x)):'
+                        % item.__name__,
+                        '                    ' + check,
+                    ]
+                else:
+                    lines += [
+                        '            items = ((parent, key), %r)' % name,
+                        '            for i, x in enumerate(v):',
+                        '                ' + check,
+                    ]
+            else:
+                lines.append('            pass')
+        elif _is_model(kind):
+            names['validate_%s' % kind.__name__] = _compile(kind)
+            lines.append('        validate_%s(v, (parent, key), %r, errors)'
+                         % (kind.__name__, name))
+        else:
+            json_types = JSON_TYPES.get(kind, STRING_TYPES)
+            if default is not None and default is not _NO_DEFAULT:
+                json_types += (type(default),)
+            names['TYPES_%s_%s' % (cls, name)] = json_types
+            lines += [
+                '        if type(v) not in TYPES_%s_%s:' % (cls, name),
+                '            errors.append((((parent, key), %r),' % name,
+                '                           "expected %s, got %%s" %%'
+                % kind.__name__,
+                '                           type(v).__name__))',
+            ]
+    return '\n'.join(lines) + '\n'
+
+
+def _compile(har_class):
+    # type: (type) -> Callable
+    validator = _validators.get(har_class)
+    if validator is None:
+        names = {}  # type: Dict[str, Any]
+        # registered first, for classes that contain themselves
+        _validators[har_class] = lambda d, parent, key, errors: validator(
+            d, parent, key, errors)
+        source = _source(har_class, names)
+        six.exec_(compile(source, '<validate %s>' % har_class.__name__,
+                          'exec'), names)
+        validator = names['validate_%s' % har_class.__name__]
+        _validators[har_class] = validator
+    return validator
+
+
+def get_validator(har_class):
+    # type: (type) -> Callable
+    '''
+    Returns validate(d, parent, key, errors) for har_class, which appends
+    a (path, message) pair to errors for every problem in d. Paths are only
+    built for errors, see render_path.
+    '''
+    return _compile(har_class)
+
+
+def _detect_class(d):
+    # type: (Dict[str, Any]) -> type
+    if 'log' in d:
+        return HarFile
+    elif 'entries' in d:
+        return HarLog
+    return HarEntry
+
+
+def validate(d, har_class=None):
+    # type: (Dict[str, Any], Optional[type]) -> List[Tuple[str, str]]
+    '''
+    Returns every (JSON path, message) error in a raw HAR dict, which is a
+    HAR file unless har_class says otherwise.
+    '''
+    if har_class is None:
+        har_class = _detect_class(d) if isinstance(d, dict) else HarFile
+    errors = []  # type: List[Tuple[Any, str]]
+    _compile(har_class)(d, (), None, errors)
+    return [(render_path(path), message) for path, message in errors]
+
+
+def validate_file(path):
+    # type: (str) -> List[Tuple[str, str]]
+    '''
+    Validates a HAR file, which may be compressed. Errors reading or
+    parsing it are reported at the empty path.
+    '''
+    try:
+        with open_reader(path) as reader:
+            d = jsonlib.load(reader)
+    except (IOError, OSError, ValueError) as err:
+        return [('', '%s: %s' % (type(err).__name__, err))]
+    return validate(d)
+
+
+def validate_many(paths, processes=None):
+    # type: (Iterable[str], Optional[int]) -> Dict[str, List[Tuple[str, str]]]
+    '''
+    Validates HAR files in a pool of worker processes, returning the
+    errors of each file in the order given.
+    '''
+    paths = list(paths)
+    results = OrderedDict()  # type: Dict[str, List[Tuple[str, str]]]
+    pool = Pool(processes)
+    try:
+        for path, errors in zip(paths, pool.imap(validate_file, paths)):
+            results[path] = errors
+    finally:
+        pool.close()
+        pool.join()
+    return results
+
+
+def main():
+    # type: () -> None
+    import sys
+    failed = False
+    for path, errors in validate_many(sys.argv[1:]).items():
+        for where, message in errors:
+            print('%s: %s: %s' % (path, where or '-', message))
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+
+Waterfall geometry of the entries of each page: when each entry starts,
+in milliseconds from the start of its page, and the segment of each of
+its timings phases, as drawn by HAR viewers. Rows are dicts of JSON
+values, so they can be returned as they are by a web backend:
+
+    {'index': 3, 'url': 'https://example.com/app.js', 'method': 'GET',
+     'status': 200, 'start': 120.5, 'end': 180.5,
+     'segments': [['blocked', 120.5, 121.5], ['wait', 121.5, 170.5],
+                  ['receive', 170.5, 180.5]]}
+
+Phases of -1 are left out, and as in HAR 1.2 the ssl segment is the end
+of the connect segment, which includes it. Entries whose page is not
+known are placed from the start of the first of them, in the order they
+are read, and entries that start before their page have negative starts.
+'''
+from __future__ import absolute_import
+import six
+from . import compression
+from .compat import OrderedDict
+from .objects.metamodel import JSON_DICT
+from .streaming import HarStreamReader
+from .utils import get_attr, get_item, parse_iso_datetime_us
+
+try:
+    from typing import Any, Dict, Iterable, Iterator, List, Optional
+except ImportError:
+    pass
+
+# timings phases in the order they happen, ssl being part of connect
+SEQUENTIAL_PHASES = ['blocked', 'dns', 'connect', 'send', 'wait', 'receive']
+
+
+_NUMBER_TYPES = frozenset(six.integer_types + (float,))
+
+
+def _milliseconds(value):
+    # type: (Any) -> Optional[float]
+    '''
+    A timing as a float, or None if it is missing, -1 or not a number
+    '''
+    if value.__class__ in _NUMBER_TYPES and value >= 0:
+        return float(value)
+    return None
+
+
+def _getter(obj):
+    # type: (Any) -> Any
+    return get_item if isinstance(obj, dict) else get_attr
+
+
+class WaterfallBuilder(object):
+    '''
+    Rows of pages and entries, one at a time, in which the start of each
+    page is parsed once when the page is added
+    '''
+
+    def __init__(self, pages=()):
+        # type: (Iterable[Any]) -> None
+        self._starts = {}  # type: Dict[Any, int]
+        for page in pages:
+            self.add_page(page)
+
+    def add_page(self, page):
+        # type: (Any) -> Dict[str, Any]
+        '''
+        Returns the row of a page dict or HarPage, without entries
+        '''
+        get = _getter(page)
+        timings = get(page, 'pageTimings')
+        get_timing = _getter(timings)
+        started = parse_iso_datetime_us(get(page, 'startedDateTime'))
+        page_id = get(page, 'id')
+        if started is not None:
+            self._starts[page_id] = started
+        row = JSON_DICT()
+        row['id'] = page_id
+        row['title'] = get(page, 'title') or ''
+        row['startedDateTime'] = get(page, 'startedDateTime')
+        row['onContentLoad'] = _milliseconds(
+            get_timing(timings, 'onContentLoad'))
+        row['onLoad'] = _milliseconds(get_timing(timings, 'onLoad'))
+        return row
+
+    def entry_row(self, entry, index=None):
+        # type: (Any, Optional[int]) -> Dict[str, Any]
+        '''
+        Row of an entry dict or HarEntry, at index in its log
+        '''
+        get = _getter(entry)
+        request = get(entry, 'request')
+        timings = get(entry, 'timings')
+        get_timing = _getter(timings)
+        row = JSON_DICT()
+        row['index'] = index
+        row['url'] = get(request, 'url')
+        row['method'] = get(request, 'method')
+        row['status'] = get(get(entry, 'response'), 'status')
+        row['start'] = row['end'] = None
+        row['segments'] = segments = []
+        started = parse_iso_datetime_us(get(entry, 'startedDateTime'))
+        if started is None:
+            return row
+        pageref = get(entry, 'pageref')
+        base = self._starts.get(pageref)
+        if base is None:
+            base = self._starts[pageref] = started
+        offset = (started - base) / 1000.0
+        end = offset
+        for phase in SEQUENTIAL_PHASES:
+            duration = _milliseconds(get_timing(timings, phase))
+            if duration is None:
+                continue
+            segments.append([phase, end, end + duration])
+            end += duration
+            if phase == 'connect':
+                ssl = _milliseconds(get_timing(timings, 'ssl'))
+                if ssl is not None and ssl <= duration:
+                    segments.append(['ssl', end - ssl, end])
+        time = _milliseconds(get(entry, 'time'))
+        row['start'] = offset
+        row['end'] = end if time is None else offset + time
+        return row
+
+
+def iter_rows(entries, pages=()):
+    # type: (Iterable[Any], Iterable[Any]) -> Iterator[Dict[str, Any]]
+    '''
+    Yields the row of each entry dict or HarEntry in turn, indexed by its
+    position in entries, so entries may be a generator over a large file
+    '''
+    builder = WaterfallBuilder(pages)
+    for index, entry in enumerate(entries):
+        yield builder.entry_row(entry, index)
+
+
+def _page_rows(builder, pages):
+    # type: (WaterfallBuilder, Iterable[Any]) -> OrderedDict
+    rows = OrderedDict()  # type: Dict[Any, Dict[str, Any]]
+    for page in pages:
+        row = builder.add_page(page)
+        row['entries'] = []
+        rows.setdefault(row['id'], row)
+    return rows
+
+
+def _add_entry(rows, pageref, row):
+    # type: (Dict[Any, Dict[str, Any]], Any, Dict[str, Any]) -> None
+    page = rows.get(pageref)
+    if page is None:
+        page = rows[pageref] = JSON_DICT()
+        page['id'] = pageref
+        page['title'] = ''
+        page['startedDateTime'] = page['onContentLoad'] = \
+            page['onLoad'] = None
+        page['entries'] = []
+    page['entries'].append(row)
+
+
+def from_log(log):
+    # type: (Any) -> List[Dict[str, Any]]
+    '''
+    Rows of the pages of a HarLog, each with the rows of its entries in
+    the order of the log, from its index on pageref, see
+    HarLog.pages_with_entries. Unbuilt entries of a lazy list are read
+    from their dicts.
+    '''
+    builder = WaterfallBuilder()
+    rows = OrderedDict()  # type: Dict[Any, Dict[str, Any]]
+    entries = log.entries
+    read = getattr(entries, 'raw', entries.__getitem__)
+    for page, view in log.pages_with_entries():
+        if page is not None:
+            row = rows[page.id] = builder.add_page(page)
+            row['entries'] = [builder.entry_row(read(pos), pos)
+                              for pos in view.positions]
+            continue
+        # entries without a page, in the order of the log
+        for pos in view.positions:
+            entry = read(pos)
+            _add_entry(rows, _getter(entry)(entry, 'pageref'),
+                       builder.entry_row(entry, pos))
+    return list(rows.values())
+
+
+def from_file(path):
+    # type: (Any) -> List[Dict[str, Any]]
+    '''
+    Rows of the pages of a HAR file, which may be compressed, reading one
+    entry dict at a time. The entries of pages written after the entries,
+    which harlib does not do, are placed as those of unknown pages.
+    '''
+    with compression.open_reader(path) as stream:
+        reader = HarStreamReader(stream)
+        builder = WaterfallBuilder()
+        rows = _page_rows(builder, reader.read_header().get('pages') or [])
+        known = set(rows)
+        for index, entry in enumerate(reader.iter_dicts()):
+            _add_entry(rows, entry.get('pageref'),
+                       builder.entry_row(entry, index))
+        for page in reader.log.get('pages') or []:
+            if page.get('id') in known:
+                continue
+            row = builder.add_page(page)
+            other = rows.get(row['id'])
+            row['entries'] = [] if other is None else other['entries']
+            rows[row['id']] = row
+    return list(rows.values())
+
+
+def waterfall(source):
+    # type: (Any) -> List[Dict[str, Any]]
+    '''
+    Rows of the pages of a HarFile, HarLog or path to a HAR file, by
+    page, then entries without a page, each with an 'entries' list
+    '''
+    if isinstance(source, six.string_types):
+        return from_file(source)
+    return from_log(getattr(source, 'log', source))
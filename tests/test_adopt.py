@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import (
+    HarEntry, HarFile, HarHeader, HarLazyList, HarLog, HarRequest)
+from harlib.sessions import HarSessionMixin
+import harlib.api
+import json
+
+
+class AdoptTests(TestUtils):
+
+    def setUp(self):
+        with open('tests/data/chrome.har') as reader:
+            self.data = json.load(reader)
+        self.entry = HarEntry(self.data['log']['entries'][0])
+
+    def test_1_copy_on_write(self):
+        before = self.entry.to_json()
+        entry = HarEntry(self.entry)
+        self.assertEqual(entry.to_json(), before)
+        entry.request.url = 'http://example.com/'
+        entry.request.headers[0].value = 'changed'
+        entry.request.headers.append(HarHeader(('X-New', '1')))
+        del entry.response.content.text
+        self.assertEqual(self.entry.to_json(), before)
+        self.assertEqual(entry.request.url, 'http://example.com/')
+        self.assertNotIn('text', entry.to_json()['response']['content'])
+
+        request = HarRequest(self.entry.request)
+        request.method = 'PATCH'
+        self.assertEqual(self.entry.request.method,
+                         before['request']['method'])
+
+    def test_2_change_original(self):
+        for entry in (self.entry, HarEntry.from_trusted(
+                self.data['log']['entries'][0])):
+            before = entry.to_json()
+            copied = HarEntry(entry)
+            entry.request.url = 'http://changed/'
+            entry.response.headers.append(HarHeader(('X-New', '1')))
+            entry.response.headers[0].value = 'changed'
+            del entry.response.content.text
+            self.assertEqual(copied.to_json(), before)
+            self.assertTrue(isinstance(copied.request, HarRequest))
+            # and a copy of the copy
+            again = HarEntry(copied)
+            copied.request.method = 'PATCH'
+            self.assertEqual(again.to_json(), before)
+
+    def test_3_lazy_log(self):
+        har = harlib.api.loadd(self.data, lazy=True)
+        har.log.entries[0].comment = 'first'
+        log = HarLog(har.log)
+        self.assertTrue(isinstance(log.entries, HarLazyList))
+        self.assertFalse(log.entries.is_built(1))
+        self.assertEqual(log.entries[0].comment, 'first')
+        log.entries[0].comment = 'changed'
+        self.assertEqual(har.log.entries[0].comment, 'first')
+        har.log.entries[0].request.url = 'http://changed/'
+        self.assertNotEqual(log.entries[0].request.url, 'http://changed/')
+        self.assertEqual(len(log.to_json()['entries']),
+                         len(self.data['log']['entries']))
+
+    def test_4_file_from_log(self):
+        log = HarLog(self.data['log'])
+        har = HarFile(log)
+        self.assertEqual(dict(har.to_json()['log']), dict(log.to_json()))
+        self.assertEqual(HarFile(har).to_json(), har.to_json())
+
+    def test_5_session_keeps_content(self):
+        session = HarSessionMixin('/tmp/harlib-test-adopt.har')
+        session.from_har(self.entry)
+        text = self.entry.response.content.text
+        har = session.to_har(with_content=False)
+        self.assertNotIn('text', har.to_json()['log']['entries'][0][
+            'response']['content'])
+        self.assertEqual(self.entry.response.content.text, text)
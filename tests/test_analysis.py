@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib import analysis, columnar
+import harlib.api
+import json
+import math
+import six
+import sys
+
+HAR_PATH = 'tests/data/chrome.har'
+
+
+def make_entry(host, wait, dns=-1, status=200):
+    return {
+        'startedDateTime': '2017-07-31T20:28:29.360Z',
+        'time': wait + 1,
+        'request': {'method': 'GET', 'url': 'http://%s/' % host},
+        'response': {'status': status},
+        'timings': {'send': 0, 'wait': wait, 'receive': 1, 'dns': dns},
+    }
+
+
+def same(a, b):
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return sorted(a) == sorted(b) and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    if isinstance(a, float):
+        return abs(a - b) <= 1e-9 * max(1, abs(a))
+    return a == b
+
+
+class AnalysisTests(TestUtils):
+
+    def setUp(self):
+        with open(HAR_PATH) as reader:
+            self.data = json.load(reader)
+        self.entries = [make_entry('a', wait) for wait in range(1, 101)] + [
+            make_entry('b', 10, dns=5), make_entry('b', 20, status=404)]
+        self.columns = columnar.HarColumns.from_entries(self.entries)
+
+    def test_1_groups(self):
+        rows = analysis.timings(HAR_PATH)
+        self.assertEqual(sum(row['count'] for row in rows),
+                         len(self.data['log']['entries']))
+        keys = [(row['host'], row['method'], row['status']) for row in rows]
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertIn(('www.google.com', 'GET', 200), keys)
+
+        rows = analysis.timings(harlib.api.loadd(self.data), by=())
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(list(rows[0])[:2], ['count', 'time'])
+
+    def test_2_percentiles(self):
+        rows = analysis.timings(self.columns, by=['host'])
+        a, b = rows
+        self.assertEqual((a['host'], a['count']), ('a', 100))
+        self.assertEqual(a['wait']['p50'], 50.5)
+        self.assertAlmostEqual(a['wait']['p90'], 90.1)
+        self.assertAlmostEqual(a['wait']['p99'], 99.01)
+        self.assertEqual(a['wait']['max'], 100)
+        self.assertEqual(a['time']['max'], 101)
+
+        # -1 is "not available", not a timing
+        self.assertEqual(a['dns']['count'], 0)
+        self.assertTrue(math.isnan(a['dns']['p50']))
+        self.assertEqual(b['dns']['count'], 1)
+        self.assertEqual(b['dns']['p99'], 5)
+        self.assertEqual(a['ssl']['count'], 0)
+
+        rows = analysis.timings(self.columns, by=['host', 'status'],
+                                percentiles=[25])
+        self.assertEqual([(r['host'], r['status']) for r in rows],
+                         [('a', 200), ('b', 200), ('b', 404)])
+        self.assertEqual(list(rows[0]['wait']), ['count', 'p25', 'max'])
+
+    def test_3_without_numpy(self):
+        numpy, columnar.numpy = columnar.numpy, None
+        try:
+            columns = columnar.HarColumns.from_entries(self.entries)
+            python = analysis.timings(columns, by=['host', 'status'])
+            chrome = analysis.timings(HAR_PATH)
+        finally:
+            columnar.numpy = numpy
+        if numpy is not None:
+            self.assertTrue(same(python, analysis.timings(
+                self.columns, by=['host', 'status'])))
+            self.assertTrue(same(chrome, analysis.timings(HAR_PATH)))
+        self.assertEqual(python[0]['wait']['p50'], 50.5)
+
+    def test_4_main(self):
+        stdout, sys.stdout = sys.stdout, six.StringIO()
+        try:
+            analysis.main(['--by', 'host', '--phases', 'time,wait',
+                           HAR_PATH, HAR_PATH])
+            output = sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+        lines = output.splitlines()
+        self.assertEqual(lines[0].split(),
+                         ['host', 'phase', 'count', 'p50', 'p90', 'p99',
+                          'max'])
+        google = [line.split() for line in lines
+                  if line.startswith('www.google.com')]
+        self.assertEqual([line[1] for line in google], ['time', 'wait'])
+        self.assertEqual(google[0][2], '18')
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.bodies import BodyPack, BodyRef, BodyStore, blobs_path
+from harlib.sessions import HarSessionMixin
+import harlib.api
+import copy
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+HAR_PATH = 'tests/data/chrome.har'
+
+# characters from which texts of chrome.har are written out of line
+THRESHOLD = 10000
+
+
+class BlobTests(TestUtils):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'chrome.har')
+        with open(HAR_PATH) as reader:
+            self.data = json.load(reader)
+        self.har = harlib.api.loadd(copy.deepcopy(self.data))
+        self.expected = json.loads(self.har.dumps())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def content(self, pos):
+        return self.data['log']['entries'][pos]['response']['content']
+
+    def test_1_pack(self):
+        path = os.path.join(self.tmpdir, 'pack')
+        pack = BodyPack(path)
+        texts = (u'caf\xe9', u'x' * 100, u'caf\xe9')
+        refs = [pack.put(text) for text in texts]
+        self.assertTrue(refs[0] is refs[2])
+        # each after a line of its digest and size
+        self.assertEqual(os.path.getsize(path), 67 + 5 + 69 + 100)
+        self.assertEqual(refs[0].read(), u'caf\xe9')
+
+        # another pack on the file finds the texts, and appends only new ones
+        other = BodyPack(path)
+        self.assertTrue(refs[1].digest in other)
+        self.assertEqual(other.get(refs[1].digest), u'x' * 100)
+        other.put(u'x' * 100)
+        ref = other.put(u'new')
+        self.assertEqual(pack.get(ref.digest), u'new')
+        other.close()
+
+        # a text not written in full is left out
+        with open(path, 'ab') as writer:
+            writer.write(b'0' * 64 + b' 10\nabc')
+        pack.close()
+        self.assertEqual(len(pack._index()), 3)
+
+    def test_2_dump_load(self):
+        harlib.api.dump(self.har, self.path, blobs=True, threshold=THRESHOLD)
+        with open(self.path) as reader:
+            written = json.load(reader)
+        content = written['log']['entries'][0]['response']['content']
+        self.assertFalse('text' in content)
+        self.assertEqual(content['_textSize'], len(
+            self.content(0)['text'].encode('utf-8')))
+        self.assertEqual(written['log']['entries'][1]['response']['content'],
+                         self.content(1))
+        self.assertTrue(os.path.getsize(self.path) < THRESHOLD * 10)
+
+        for lazy in (False, True):
+            har = harlib.api.load(self.path, lazy=lazy)
+            raw = har.log.entries.raw(0) if lazy else None
+            if raw is not None:
+                # nothing is read until the text is used
+                har.log.waterfall()
+                ref = raw['response']['content']['text']
+                self.assertTrue(isinstance(ref, BodyRef))
+                self.assertEqual(ref.store._offsets, None)
+            self.assertEqual(har.log.entries[0].response.content.text,
+                             self.content(0)['text'])
+            self.assertEqual(json.loads(har.dumps()), self.expected)
+
+    def test_3_blob_directory(self):
+        blobs = os.path.join(self.tmpdir, 'blobs') + os.sep
+        harlib.api.dump_compact(self.har, self.path, blobs=blobs,
+                                threshold=THRESHOLD)
+        self.assertFalse(os.path.exists(blobs_path(self.path)))
+        with open(self.path) as reader:
+            written = json.load(reader)
+        self.assertTrue('_bodies' in written['log'])
+        self.assertRaises(ValueError, harlib.api.load_compact, self.path)
+        store = BodyStore()
+        har = harlib.api.load_compact(self.path, lazy=True, trusted=True,
+                                      bodies=store, blobs=blobs)
+        self.assertEqual(json.loads(har.dumps()), self.expected)
+        self.assertEqual(len(store), len(written['log']['_bodies']))
+
+    def test_4_session(self):
+        session = HarSessionMixin(self.path)
+        session.from_har(self.har)
+        session.blobs = True
+        session.blob_threshold = THRESHOLD
+        session.dump(with_content=True, cache=False)
+        self.assertTrue(os.path.exists(blobs_path(self.path)))
+        har = harlib.api.load(self.path)
+        self.assertEqual(har.log.entries[0].response.content.text,
+                         self.content(0)['text'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.bodies import BodyStore, dumps_compact
+import harlib.api
+import copy
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+HAR_PATH = 'tests/data/chrome.har'
+
+# entries of the log with a copy of the first, so two bodies are equal
+COPIES = 3
+
+
+class BodyTests(TestUtils):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        with open(HAR_PATH) as reader:
+            self.data = json.load(reader)
+        entries = self.data['log']['entries']
+        entries.extend(copy.deepcopy(entries[0]) for _ in range(COPIES))
+        self.text = entries[0]['response']['content']['text']
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_1_store(self):
+        text = u'{"caf\xe9": "\ud83d"}'
+        for store in (BodyStore(), BodyStore(self.tmpdir)):
+            ref = store.put(text)
+            self.assertTrue(store.put(u'' + text) is ref)
+            self.assertEqual(len(store), 1)
+            self.assertTrue(ref.digest in store)
+            self.assertEqual(ref.read(), text)
+            self.assertEqual(ref.size, 16)
+        self.assertEqual(store.put(u'{}').digest,
+                         hashlib.sha256(b'{}').hexdigest())
+        self.assertTrue(os.path.exists(os.path.join(
+            self.tmpdir, ref.digest[:2], ref.digest[2:])))
+        # stores on the same directory share their files
+        self.assertEqual(BodyStore(self.tmpdir).get(ref.digest), text)
+        self.assertRaises(KeyError, BodyStore().get, ref.digest)
+
+    def test_2_store_bodies(self):
+        for trusted in (False, True):
+            har = harlib.api.loadd(copy.deepcopy(self.data), trusted=trusted)
+            expected = json.loads(har.dumps())
+            store = BodyStore(self.tmpdir if trusted else None)
+            har.log.store_bodies(store)
+            entries = har.log.entries
+            refs = [entry.response.content.__dict__['_body']
+                    for entry in (entries[0], entries[-1])]
+            self.assertTrue(refs[0] is refs[1])
+            self.assertEqual(entries[-1].response.content.text, self.text)
+            self.assertEqual(json.loads(har.dumps()), expected)
+
+            # copies and pickles get the text
+            content = pickle.loads(pickle.dumps(entries[0])).response.content
+            self.assertFalse('_body' in content.__dict__)
+            self.assertEqual(content.text, self.text)
+
+            content = entries[-1].response.content
+            content.text = u'changed'
+            self.assertEqual(content.to_json()['text'], u'changed')
+            del entries[0].response.content.text
+            self.assertFalse('text' in entries[0].to_json()['response'][
+                'content'])
+            self.assertEqual(entries[1].response.content.text,
+                             self.data['log']['entries'][1]['response'][
+                                 'content']['text'])
+
+    def test_3_compact(self):
+        har = harlib.api.loadd(copy.deepcopy(self.data), lazy=True)
+        s = dumps_compact(har)
+        self.assertEqual(s.count(json.dumps(self.text)[1:-1]), 1)
+        d = json.loads(s)
+        digest = d['log']['entries'][0]['response']['content']['_textRef']
+        self.assertEqual(d['log']['_bodies'][digest], self.text)
+
+        path = os.path.join(self.tmpdir, 'compact.har.gz')
+        harlib.api.dump_compact(har, path)
+        store = BodyStore()
+        loaded = harlib.api.load_compact(path, lazy=True, bodies=store)
+        self.assertEqual(loaded.to_json(), har.to_json())
+        self.assertTrue(digest in store)
+        texts = [loaded.log.entries.raw(pos)['response']['content']['text']
+                 for pos in (0, -1)]
+        self.assertTrue(texts[0] is texts[1])
+
+    def test_4_load_shared(self):
+        store = BodyStore()
+        s = json.dumps(self.data)
+        for lazy in (False, True):
+            har = harlib.api.loads(s, lazy=lazy, bodies=store)
+            entries = har.log.entries
+            self.assertTrue(entries[0].response.content.text is
+                            entries[-1].response.content.text)
+        # the second load shares the texts of the first
+        self.assertEqual(len(store), len(set(
+            e['response']['content'].get('text') or None
+            for e in self.data['log']['entries']) - set([None])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import HarPostDataParam
+import harlib.codecs
+
+
+class Pair(object):
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+class PairCodec(object):
+
+    modules = [__name__]
+
+    def decode_HarPostDataParam_from_Pair(self, raw):
+        return {'name': raw.name, 'value': raw.value}
+
+    def encode_HarPostDataParam_to_Pair(self, har):
+        return Pair(har.name, har.value)
+
+
+class CodecTests(TestUtils):
+
+    def setUp(self):
+        self.codec = harlib.codecs.register_codec(PairCodec())
+
+    def tearDown(self):
+        harlib.codecs.unregister_codec(self.codec)
+
+    def test_1_register(self):
+        param = HarPostDataParam(Pair('accept', '*/*'))
+        self.assertEqual(param.to_json(), {'name': 'accept', 'value': '*/*'})
+        pair = param.encode(Pair)
+        self.assertTrue(isinstance(pair, Pair))
+        self.assertEqual((pair.name, pair.value), ('accept', '*/*'))
+
+    def test_2_cached(self):
+        decoder = harlib.codecs.find_decoder(Pair, HarPostDataParam)
+        self.assertEqual(decoder, self.codec.decode_HarPostDataParam_from_Pair)
+        self.assertTrue(harlib.codecs.find_decoder(Pair, HarPostDataParam)
+                        is decoder)
+        harlib.codecs.unregister_codec(self.codec)
+        self.assertEqual(
+            harlib.codecs.find_decoder(Pair, HarPostDataParam), None)
+        self.assertRaises(ValueError, HarPostDataParam, Pair('a', 'b'))
+        harlib.codecs.register_codec(self.codec, first=True)
+        self.assertTrue(harlib.codecs.get_codecs()[0] is self.codec)
+
+    def test_3_builtin_modules(self):
+        # the modules of lazy codecs are given before they are imported,
+        # from the list the codec classes take theirs from
+        for path, modules in harlib.codecs.BUILTIN_CODECS:
+            try:
+                codec = harlib.codecs.LazyCodec(path, modules).load()
+            except ImportError:
+                continue
+            self.assertEqual(modules, codec.modules)
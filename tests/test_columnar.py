@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.utils import parse_iso_datetime_us
+from harlib import columnar
+import harlib.api
+import json
+import unittest
+
+HAR_PATH = 'tests/data/chrome.har'
+
+
+class ColumnarTests(TestUtils):
+
+    def setUp(self):
+        with open(HAR_PATH) as reader:
+            self.data = json.load(reader)
+        self.log = harlib.api.loadd(self.data, lazy=True).log
+
+    def test_1_parse_iso_datetime(self):
+        self.assertEqual(parse_iso_datetime_us('1970-01-01T00:00:00Z'), 0)
+        self.assertEqual(parse_iso_datetime_us('2017-07-31T20:28:29.360Z'),
+                         1501532909360000)
+        self.assertEqual(
+            parse_iso_datetime_us('2017-07-31T22:28:29.1234567+02:00'),
+            1501532909123456)
+        self.assertEqual(parse_iso_datetime_us('1969-12-31T23:59:59.5Z'),
+                         -500000)
+        self.assertEqual(parse_iso_datetime_us('2000-02-29T00:00-0530'),
+                         951802200000000)
+        for s in ('', 'yesterday', '2017-13-01T00:00:00Z', None):
+            self.assertEqual(parse_iso_datetime_us(s), None)
+
+    def test_2_url_host(self):
+        self.assertEqual(columnar.url_host('https://u:p@Example.COM:8443/a'),
+                         'example.com:8443')
+        self.assertEqual(columnar.url_host('http://a.b?q=/x'), 'a.b')
+        self.assertEqual(columnar.url_host(''), '')
+
+    def test_3_columns(self):
+        columns = self.log.to_columns()
+        entries = self.data['log']['entries']
+        self.assertEqual(len(columns), len(entries))
+        self.assertFalse(self.log.entries.is_built(0))
+        self.assertEqual(list(columns['status']),
+                         [e['response']['status'] for e in entries])
+        self.assertEqual(list(columns['wait']),
+                         [e['timings']['wait'] for e in entries])
+        self.assertEqual(columns.decode('url'),
+                         [e['request']['url'] for e in entries])
+        self.assertEqual(columns['startedDateTime'][0], 1501532909360000)
+        self.assertEqual(columns.categories['host'][0], 'www.google.com')
+        self.assertEqual(columns.code('method', 'NONE'), -1)
+
+        streamed = columnar.HarColumns.from_file(HAR_PATH)
+        self.assertEqual(streamed.categories, columns.categories)
+        for name in columns.columns:
+            self.assertEqual(list(streamed[name]), list(columns[name]))
+
+    def check_queries(self):
+        columns = self.log.to_columns()
+        statuses = list(columns['status'])
+        hosts = columns.decode('host')
+        ok = columns.where(method='GET', status=200)
+        self.assertEqual(len(ok), statuses.count(200))
+        google = columns.filter(columns.mask('host', 'www.google.com'))
+        self.assertEqual(len(google), hosts.count('www.google.com'))
+        self.assertEqual(set(google.decode('host')), set(['www.google.com']))
+
+        groups = columns.group_by('host')
+        self.assertEqual(sorted(groups), sorted(set(hosts)))
+        for host, group in groups.items():
+            self.assertEqual(len(group), hosts.count(host))
+        totals = columns.aggregate('host', 'responseBodySize', sum)
+        self.assertEqual(sum(totals.values()),
+                         sum(columns['responseBodySize']))
+        by_status = columns.group_by('status')
+        self.assertEqual(list(by_status), sorted(set(statuses)))
+        return totals
+
+    @unittest.skipIf(not columnar.HAS_NUMPY, 'needs numpy')
+    def test_4_numpy(self):
+        import numpy
+        columns = self.log.to_columns()
+        self.assertTrue(isinstance(columns['time'], numpy.ndarray))
+        self.assertEqual(columns['startedDateTime'].dtype, numpy.int64)
+        slow = columns.filter(columns['time'] > 10)
+        self.assertEqual(len(slow), int((columns['time'] > 10).sum()))
+        self.check_queries()
+
+    def test_5_without_numpy(self):
+        numpy, columnar.numpy = columnar.numpy, None
+        try:
+            columns = self.log.to_columns()
+            self.assertEqual(columns['time'].typecode, 'd')
+            totals = self.check_queries()
+        finally:
+            columnar.numpy = numpy
+        if numpy is not None:
+            self.assertEqual(totals, self.check_queries())
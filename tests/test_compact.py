@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import (
+    HarCompactObject, HarCookie, HarEntry, HarHeader, HarObject,
+    HarPostDataParam)
+from harlib.objects.compact import MODEL_TYPES
+import harlib.api
+import copy
+import json
+import pickle
+
+
+class CompactTests(TestUtils):
+
+    def test_1_slots(self):
+        header = HarHeader({'name': 'content-type', 'value': 'text/html'})
+        self.assertTrue(isinstance(header, HarCompactObject))
+        self.assertFalse(hasattr(header, '__dict__'))
+        self.assertEqual(header.name, 'Content-Type')
+        self.assertEqual(header.value, 'text/html')
+        self.assertEqual(header.comment, '')
+        header.value = 'text/plain'
+        self.assertEqual(header.to_json(),
+                         {'name': 'Content-Type', 'value': 'text/plain'})
+        self.assertRaises(ValueError, HarHeader, {'name': 'Accept'})
+
+    def test_2_cookie_fields(self):
+        d = {'name': 'sid', 'value': '1', 'path': '/', 'secure': True}
+        cookie = HarCookie(d)
+        self.assertEqual(cookie.domain, None)
+        self.assertEqual(list(cookie.to_json().keys()),
+                         ['name', 'value', 'path', 'secure'])
+        self.assertEqual(cookie, HarCookie(cookie))
+        self.assertNotEqual(cookie, HarCookie({'name': 'sid', 'value': '2'}))
+
+    def test_3_extra_fields(self):
+        header = HarHeader({'name': 'Accept', 'value': '*/*', '_order': 1})
+        self.assertEqual(header._order, 1)
+        header._source = 'wire'
+        self.assertEqual(header.to_json()['_source'], 'wire')
+        del header._source
+        self.assertRaises(AttributeError, getattr, header, '_source')
+
+        param = HarPostDataParam({'name': 'file', '_headers': [
+            {'name': 'content-type', 'value': 'text/plain'}]})
+        self.assertTrue(isinstance(param._headers[0], HarHeader))
+        self.assertEqual(param.to_json()['_headers'][0]['name'],
+                         'Content-Type')
+
+    def test_4_copy_and_pickle(self):
+        with open('tests/data/chrome.har') as reader:
+            d = json.load(reader)['log']['entries'][0]
+        entry = HarEntry(d)
+        for clone in (pickle.loads(pickle.dumps(entry, 2)),
+                      copy.deepcopy(entry)):
+            self.assertEqual(clone.to_json(), entry.to_json())
+            self.assertTrue(isinstance(clone.request.headers[0], HarHeader))
+
+    def test_5_shared_strings(self):
+        # built at run time, so that equal strings are distinct objects
+        first = HarHeader({'name': ''.join(['content-', 'type']),
+                           'value': ''.join(['text/', 'html'])})
+        second = HarHeader({'name': ''.join(['Content-', 'Type']),
+                            'value': ''.join(['text/', 'html'])})
+        self.assertEqual(first.name, 'Content-Type')
+        self.assertTrue(first.name is second.name)
+        self.assertTrue(first.value is second.value)
+        self.assertEqual(first.wire_name, 'content-type')
+        self.assertEqual(second.wire_name, 'Content-Type')
+        first.name = 'Accept'
+        self.assertEqual(first.wire_name, 'Accept')
+
+        cookies = [HarCookie({'name': ''.join(['S', 'ID']), 'value': '1'})
+                   for _ in range(2)]
+        self.assertEqual(cookies[0].name, 'SID')
+        self.assertTrue(cookies[0].name is cookies[1].name)
+        # the dicts passed in keep their own strings
+        d = {'name': ''.join(['S', 'ID']), 'value': '1'}
+        name = d['name']
+        self.assertTrue(HarCookie(d).name is cookies[0].name)
+        self.assertTrue(d['name'] is name)
+        d = {'name': 'accept', 'value': '*/*'}
+        self.assertEqual(HarHeader(d).name, 'Accept')
+        self.assertEqual(d['name'], 'accept')
+
+    def test_6_model_types(self):
+        header = HarHeader({'name': 'Accept', 'value': '*/*'})
+        self.assertTrue(isinstance(header, MODEL_TYPES))
+        self.assertEqual(json.loads(harlib.api.dumps(header)),
+                         {'name': 'Accept', 'value': '*/*'})
+        self.assertEqual(harlib.api.dumpd(header), header.to_json())
+        # mutable and compared by value, so unhashable like a dict
+        self.assertRaises(TypeError, hash, header)
+        self.assertFalse(isinstance(header, HarObject))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.compression import detect_compression, lzma, open_reader
+import harlib.api
+import json
+import os
+import shutil
+import six
+import tempfile
+import zlib
+
+EXTENSIONS = ['.gz', '.bz2', '.zz'] + (['.xz'] if lzma else [])
+
+
+class CompressionTests(TestUtils):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        with open('tests/data/firefox.har') as reader:
+            self.text = reader.read()
+        self.har = harlib.api.loads(self.text)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_1_round_trip(self):
+        for ext in EXTENSIONS:
+            path = os.path.join(self.tmpdir, 'firefox.har' + ext)
+            harlib.api.dump(self.har, path)
+            with open(path, 'rb') as reader:
+                head = reader.read(6)
+            self.assertEqual(detect_compression(head),
+                             detect_compression(filename=path))
+            self.assertEqual(harlib.api.load(path).to_json(),
+                             self.har.to_json())
+
+    def test_2_detect_by_magic(self):
+        # the extension is only used when the content cannot be peeked
+        path = os.path.join(self.tmpdir, 'firefox.har')
+        with open(path, 'wb') as writer:
+            writer.write(zlib.compress(self.text.encode('utf-8')))
+        self.assertEqual(detect_compression(filename=path), None)
+        with open(path, 'rb') as reader:
+            entries = list(harlib.api.iter_entries(reader))
+            self.assertFalse(reader.closed)
+        self.assertEqual(len(entries), len(self.har.log.entries))
+
+    def test_3_level(self):
+        data = six.BytesIO(zlib.compress(self.text.encode('utf-8'), 9))
+        with open_reader(data) as reader:
+            self.assertEqual(json.loads(reader.read().decode('utf-8')),
+                             json.loads(self.text))
+        sizes = []
+        for level in (1, 9):
+            path = os.path.join(self.tmpdir, '%d.har.gz' % level)
+            harlib.api.dump(self.har, path, level=level)
+            sizes.append(os.path.getsize(path))
+        self.assertTrue(sizes[0] > sizes[1], sizes)
+
+    def test_4_text_passthrough(self):
+        writer = six.StringIO()
+        harlib.api.dump(self.har, writer)
+        self.assertEqual(json.loads(writer.getvalue()),
+                         json.loads(self.har.dumps()))
+        har = harlib.api.load(six.StringIO(writer.getvalue()))
+        self.assertEqual(har.to_json(), self.har.to_json())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import HarEntry
+from harlib.sessions import HarSessionMixin
+from harlib.streaming import HarFileAppender, HarStreamWriter
+import harlib.api
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+HAR_PATH = 'tests/data/chrome.har'
+
+
+class FlushTests(TestUtils):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'capture', 'flushed.har')
+        with open(HAR_PATH) as reader:
+            self.data = json.load(reader)
+        self.entries = self.data['log']['entries'][:3]
+        self.urls = [entry['request']['url'] for entry in self.entries]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def written(self):
+        # the entries in the file, which must be complete
+        with open(self.path) as reader:
+            return json.load(reader)['log']['entries']
+
+    def read(self):
+        return [entry['request']['url'] for entry in self.written()]
+
+    def keep(self, session, entries):
+        # as requests are captured, one entry each
+        for entry in entries:
+            session._keep_entries({'entries': [entry]})
+
+    def test_1_appender(self):
+        path = os.path.join(self.tmpdir, 'appended.har')
+        header = {'version': '1.2', 'creator': {'name': 'harlib'}}
+        appender = HarFileAppender(path, header)
+        self.assertEqual(appender.append([]), 0)
+        with open(path) as reader:
+            self.assertEqual(json.load(reader)['log']['entries'], [])
+        entries = self.entries[:1] + [HarEntry(entry)
+                                      for entry in self.entries[1:]]
+        self.assertEqual(appender.append(entries[:1]), 1)
+        self.assertEqual(appender.append(entries[1:]), 2)
+
+        # the same text as written in one go
+        writer = io.StringIO()
+        with HarStreamWriter(writer, header) as stream:
+            for entry in entries:
+                stream.write_entry(entry)
+        with io.open(path, encoding='utf-8') as reader:
+            self.assertEqual(reader.read(), writer.getvalue())
+
+        with open(path, 'ab') as writer:
+            writer.write(b' ')
+        self.assertRaises(ValueError, appender.append, self.entries)
+
+    def test_2_flush_entries(self):
+        session = HarSessionMixin(self.path)
+        session.flush_entries = 2
+        self.keep(session, self.entries[:1])
+        self.assertFalse(os.path.exists(self.path))
+        self.keep(session, self.entries[1:])
+        # the file is complete at each flush, and memory holds the rest
+        self.assertEqual(self.read(), self.urls[:2])
+        self.assertEqual(len(session._entries), 1)
+        self.assertEqual(len(harlib.api.load(self.path).log.entries), 2)
+
+        session.dump(cache=False)
+        self.assertEqual(self.read(), self.urls)
+        self.assertEqual(session._entries, [])
+        self.keep(session, self.entries[:2])
+        self.assertEqual(self.read(), self.urls + self.urls[:2])
+
+    def test_3_flush_bytes_seconds(self):
+        session = HarSessionMixin(self.path)
+        session.flush_bytes = 1
+        self.keep(session, self.entries)
+        self.assertEqual(self.read(), self.urls)
+        self.assertEqual(session._entries, [])
+
+        session = HarSessionMixin(self.path)
+        session.flush_seconds = 3600
+        self.keep(session, self.entries)
+        self.assertEqual(len(session._entries), len(self.entries))
+        session.flush_seconds = 0
+        self.keep(session, self.entries[:1])
+        self.assertEqual(self.read(), self.urls + self.urls[:1])
+
+        # compressed output is written whole by dump, never flushed, so a
+        # policy is refused before any entry is kept
+        session = HarSessionMixin(self.path + '.gz')
+        session.flush_entries = 1
+        self.assertRaises(ValueError, self.keep, session, self.entries)
+        self.assertEqual(session._entries, [])
+        self.assertEqual(session.flush_entries, 1)
+        self.assertRaises(ValueError, session.flush)
+        session = HarSessionMixin(self.path)
+        session.output_format = 'compact'
+        session.flush_bytes = 1
+        self.assertRaises(ValueError, self.keep, session, self.entries)
+
+    def test_4_content_and_metadata(self):
+        for with_content in (False, True):
+            session = HarSessionMixin(self.path)
+            session.with_content = with_content
+            session.extra = {'run': 1}
+            session.flush_entries = 2
+            self.keep(session, self.entries)
+            # options that cannot apply to the entries flushed
+            self.assertRaises(ValueError, session.dump, indent=2)
+            self.assertRaises(ValueError, session.dump, extra={'run': 2})
+            session.dump(extra={'run': 1}, cache=False)
+            written = self.written()
+            self.assertEqual(len(written), len(self.entries))
+            # as dump writes them without a policy
+            self.assertEqual(
+                ['text' in entry['response']['content']
+                 for entry in written],
+                [with_content and 'text' in entry['response']['content']
+                 for entry in self.entries])
+            self.assertEqual([entry['_metadata'] for entry in written],
+                             [{'run': 1}] * len(self.entries))
+            # and appends still follow
+            self.keep(session, self.entries[:2])
+            self.assertEqual(self.read(), self.urls + self.urls[:2])
+
+    def test_5_cache(self):
+        # the content hash would only cover the entries not yet flushed
+        for i in range(2):
+            session = HarSessionMixin(self.path)
+            session.flush_entries = 1
+            self.keep(session, self.entries[i:i + 1])
+            session.dump()
+            self.assertEqual(session._cache_filename, '')
+        cache_dir = os.path.join(os.path.dirname(self.path), '.harlib')
+        self.assertFalse(os.path.exists(cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import (
+    HarEntry, HarFile, HarHeader, HarQueryStringParam)
+from harlib.sessions import HarSessionMixin
+from harlib import jsonlib
+import harlib.api
+import copy
+import json
+
+
+class FragmentTests(TestUtils):
+
+    def setUp(self):
+        with open('tests/data/chrome.har') as reader:
+            self.data = json.load(reader)
+
+    def assertFresh(self, har, **kwargs):
+        self.assertEqual(har.dumps(**kwargs),
+                         jsonlib.dumps(har.to_json(), **kwargs))
+
+    def test_1_same_text(self):
+        for kwargs in ({}, {'indent': 2}, {'separators': (',', ':')},
+                       {'indent': 4, 'sort_keys': True}):
+            for har in (HarFile(self.data),
+                        harlib.api.loadd(self.data, lazy=True),
+                        harlib.api.loadd(self.data, trusted=True)):
+                har.dumps(**kwargs)
+                self.assertFresh(har, **kwargs)
+                self.assertFresh(har.log, **kwargs)
+
+    def test_2_cached(self):
+        entry = HarEntry(self.data['log']['entries'][0])
+        s = entry.dumps()
+        self.assertTrue(entry.dumps() is s)
+        self.assertFalse(entry.dumps(indent=2) is s)
+        entry.dumps(indent=2)
+        self.assertEqual(entry.dumps(), s)
+
+    def test_3_nested_edits(self):
+        har = HarFile(self.data)
+        har.dumps()
+        entry = har.log.entries[3]
+        before = entry.dumps()
+
+        entry.response.headers[0].value = 'changed'
+        self.assertNotEqual(entry.dumps(), before)
+        self.assertIn('"value": "changed"', entry.dumps())
+        self.assertFresh(har)
+
+        entry.timings.wait = 12345
+        self.assertIn('"wait": 12345', entry.dumps())
+        self.assertFresh(har)
+
+        del entry.response.content.text
+        self.assertFresh(har)
+
+        entry.response.headers[0].value = 'again'
+        self.assertIn('"value": "again"', entry.dumps())
+        self.assertFresh(har, indent=2)
+
+    def test_4_list_edits(self):
+        har = harlib.api.loadd(self.data, trusted=True)
+        har.dumps()
+        entry = har.log.entries[2]
+        headers = entry.response.headers
+        headers.append(HarHeader(('X-Added', '1')))
+        self.assertIn('X-Added', entry.dumps())
+        self.assertFresh(har)
+
+        headers[0] = HarHeader(('X-Replaced', '2'))
+        self.assertIn('X-Replaced', entry.dumps())
+        del headers[0]
+        self.assertNotIn('X-Replaced', entry.dumps())
+        self.assertFresh(har)
+
+        # built after the entry was cached
+        entry.request.queryString.append(HarQueryStringParam(
+            {'name': 'q', 'value': 'v'}))
+        self.assertIn('"q"', entry.dumps())
+        self.assertFresh(har)
+
+    def test_5_without_content(self):
+        har = HarFile(self.data)
+        entry = har.log.entries[0]
+        text = entry.response.content.text
+        s = har.dumps(with_content=False)
+        self.assertEqual(json.loads(s), json.loads(jsonlib.dumps(
+            {'log': dict(har.log.to_json(),
+                         entries=[e.to_json(with_content=False)
+                                  for e in har.log.entries])})))
+        self.assertNotIn('text', json.loads(s)['log']['entries'][0][
+            'response']['content'])
+        self.assertEqual(entry.response.content.text, text)
+        self.assertEqual(json.loads(har.dumps())['log']['entries'][0][
+            'response']['content']['text'], text)
+
+    def test_6_session_redump(self):
+        session = HarSessionMixin('/tmp/harlib-test-fragments.har')
+        entries = HarFile(self.data).log.entries
+        session.from_har(entries[0])
+        first = session.dumps()
+        cached = session._entries[0].dumps(with_content=False)
+        session.from_har(entries[1])
+        self.assertTrue(session._entries[0].dumps(with_content=False)
+                        is cached)
+        self.assertTrue(session.dumps().startswith(first[:-3]))
+        self.assertEqual(session.dumps(), session.to_har().dumps())
+
+    def test_7_copies(self):
+        entry = HarEntry(self.data['log']['entries'][0])
+        entry.dumps()
+        request = copy.deepcopy(entry.request)
+        self.assertFalse('_parent' in request.__dict__)
+        request.method = 'PATCH'
+        self.assertFalse('_fragment' in request.__dict__)
+        self.assertTrue('_fragment' in entry.__dict__)
+        self.assertEqual(entry.request.method, 'GET')
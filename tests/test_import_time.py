@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+import os
+import subprocess
+import sys
+import unittest
+
+# cumulative import time allowed for a bare "import harlib.api"
+BUDGET_MS = float(os.environ.get('HARLIB_IMPORT_BUDGET_MS') or 250)
+
+# libraries that only codecs and sessions need
+HEAVY_MODULES = ['requests', 'urllib3', 'django', 'http.client']
+
+
+def import_times(statement):
+    '''
+    Returns {module: cumulative microseconds} from python -X importtime
+    '''
+    proc = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _, err = proc.communicate()
+    times = {}
+    for line in err.decode('utf-8', 'replace').splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'needs -X importtime')
+class ImportTimeTests(TestUtils):
+
+    def test_1_no_http_libraries(self):
+        times = import_times('import harlib.api')
+        self.assertIn('harlib.api', times)
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, times)
+
+    def test_2_budget(self):
+        # the best of a few runs, as the first fills the bytecode caches
+        best = min(import_times('import harlib.api')['harlib.api']
+                   for _ in range(3))
+        self.assertLess(best / 1000.0, BUDGET_MS)
+
+    def test_3_codecs_on_demand(self):
+        # codecs are loaded with importlib, which -X importtime leaves out
+        out = subprocess.check_output([sys.executable, '-c', (
+            'import harlib, requests, sys; '
+            'harlib.HarRequest(requests.Request("GET", "http://a/")); '
+            'print(" ".join(sys.modules))')])
+        modules = out.decode('utf-8').split()
+        self.assertIn('harlib.codecs.requests', modules)
+        self.assertNotIn('harlib.codecs.django', modules)
+
+    def test_4_version_on_demand(self):
+        out = subprocess.check_output([sys.executable, '-c', (
+            'import harlib; '
+            'print("__version__" in vars(harlib)); '
+            'print(harlib.__version__ == '
+            'harlib._version_metadata()["__version__"])')])
+        self.assertEqual(out.decode('utf-8').split(), ['False', 'True'])
+
+    def test_5_version_metadata(self):
+        # as pbr records it for an installed harlib, which is used instead
+        # of the checkout
+        out = subprocess.check_output([sys.executable, '-c', (
+            'import harlib; '
+            'harlib._distribution_version = lambda: "1.2.3"; '
+            'print(harlib.__version__, harlib.__download_url__)')])
+        self.assertEqual(out.decode('utf-8').split(), [
+            '1.2.3', 'https://github.com/andydude/harlib/archive/1.2.3.zip'])
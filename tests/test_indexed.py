@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.indexed import HarIndex, get_index
+import harlib.api
+import json
+import os
+import shutil
+import tempfile
+
+
+class IndexedTests(TestUtils):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'firefox.har')
+        shutil.copy('tests/data/firefox.har', self.path)
+        with open(self.path) as reader:
+            self.data = json.load(reader)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_1_open_indexed(self):
+        har_file = harlib.api.open_indexed(self.path)
+        entries = har_file.log.entries
+        raw_entries = self.data['log']['entries']
+        self.assertTrue(os.path.exists(self.path + '.harx'))
+        self.assertEqual(len(entries), len(raw_entries))
+        self.assertEqual(entries[5].request.url,
+                         raw_entries[5]['request']['url'])
+        self.assertEqual(entries[-1].request.url,
+                         raw_entries[-1]['request']['url'])
+        self.assertFalse(entries.is_built(0))
+
+    def test_2_index_roundtrip(self):
+        index = get_index(self.path)
+        loaded = HarIndex.load(self.path + '.harx')
+        self.assertEqual(list(loaded.offsets), list(index.offsets))
+        self.assertEqual(loaded.header['pages'], self.data['log']['pages'])
+        self.assertTrue(loaded.is_current(self.path))
+
+    def test_3_rebuild_when_stale(self):
+        get_index(self.path)
+        self.data['log']['entries'] = self.data['log']['entries'][:3]
+        with open(self.path, 'w') as writer:
+            json.dump(self.data, writer)
+        har_file = harlib.api.open_indexed(self.path)
+        self.assertEqual(len(har_file.log.entries), 3)
+        self.assertEqual(len(HarIndex.load(self.path + '.harx')), 3)
+
+    def test_4_close(self):
+        with harlib.api.open_indexed(self.path) as har_file:
+            entries = har_file.log.entries
+            url = entries[0].request.url
+        # the memory map is closed, and only built entries can be read
+        self.assertEqual(entries._raw._buf, None)
+        self.assertEqual(entries[0].request.url, url)
+        self.assertRaises(ValueError, entries.__getitem__, 1)
+        har_file.close()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.utils import (
+    parse_iso_datetime_ns, parse_iso_datetime_us, url_host)
+from harlib import objects
+import harlib.api
+import copy
+import datetime
+import json
+import random
+import unittest
+
+HAR_PATH = 'tests/data/chrome.har'
+
+
+class IndexTests(TestUtils):
+
+    def setUp(self):
+        with open(HAR_PATH) as reader:
+            self.data = json.load(reader)
+        self.entries = self.data['log']['entries']
+        self.log = harlib.api.loadd(self.data, lazy=True).log
+
+    def scan(self, func):
+        keys = {}
+        for pos, entry in enumerate(self.entries):
+            keys.setdefault(func(entry), []).append(pos)
+        return keys
+
+    def test_1_hash_index(self):
+        index = self.log.index('host')
+        expected = self.scan(lambda e: url_host(e['request']['url']))
+        self.assertEqual(sorted(index.keys()), sorted(expected))
+        for host, positions in expected.items():
+            self.assertIn(host, index)
+            self.assertEqual(index.positions(host), positions)
+        self.assertEqual(index.positions('nowhere'), [])
+        self.assertFalse(self.log.entries.is_built(0))
+        self.assertIs(self.log.index('host'), index)
+
+        host = max(sorted(expected), key=lambda h: len(expected[h]))
+        view = index.entries(host)
+        self.assertEqual(len(view), len(expected[host]))
+        self.assertEqual(url_host(view[-1].request.url), host)
+        self.assertTrue(self.log.entries.is_built(expected[host][-1]))
+        self.assertFalse(self.log.entries.is_built(expected[host][0]))
+
+        self.assertRaises(ValueError, self.log.index, 'colour')
+
+    def test_2_composite_index(self):
+        index = self.log.index('host', 'method', 'status')
+        expected = self.scan(lambda e: (url_host(e['request']['url']),
+                                        e['request']['method'],
+                                        e['response']['status']))
+        self.assertEqual(index.counts(), dict(
+            (key, len(positions)) for key, positions in expected.items()))
+        pages = self.log.index('pageref')
+        self.assertEqual(pages.counts(), dict(
+            (key, len(positions)) for key, positions in
+            self.scan(lambda e: e.get('pageref')).items()))
+
+    def test_3_appends(self):
+        for log in (self.log, objects.HarLog(self.data['log'])):
+            index = log.index('status')
+            ranges = log.range_index('time')
+            count = len(index.positions(200))
+            entry = copy.deepcopy(self.entries[0])
+            entry['response']['status'] = 200
+            entry['time'] = 1e9
+            log.entries.append(objects.HarEntry(entry))
+            end = len(log.entries) - 1
+            self.assertEqual(len(index.positions(200)), count + 1)
+            self.assertEqual(index.positions(200)[-1], end)
+            self.assertEqual(ranges.between(1e9 - 1), [end])
+
+            # changes in place are only seen after reindex
+            log.entries[end].response.status = 599
+            self.assertEqual(index.positions(599), [])
+            log.reindex()
+            self.assertEqual(index.positions(599), [end])
+
+            # replaced or shortened entries are reindexed
+            del log.entries[end]
+            self.assertEqual(index.positions(599), [])
+            log.entries = log.entries[:1]
+            self.assertEqual(len(ranges), 1)
+
+    def test_4_range_index(self):
+        index = self.log.range_index('time')
+        times = sorted((e['time'], pos) for pos, e in enumerate(self.entries))
+        self.assertEqual(index.between(), [pos for _, pos in times])
+        low, high = times[2][0], times[-3][0]
+        self.assertEqual(index.between(low, high), [
+            pos for time, pos in times if low <= time <= high])
+        self.assertEqual(index.between(high + 1, low), [])
+
+        started = self.log.range_index('startedDateTime')
+        first = self.entries[0]['startedDateTime']
+        self.assertEqual(started.between(first, first)[0], 0)
+        moment = datetime.datetime.utcfromtimestamp(
+            parse_iso_datetime_us(first) / 1e6)
+        self.assertEqual(started.between(high=moment),
+                         started.between(high=first))
+        self.assertRaises(ValueError, started.between, 'yesterday')
+
+        # appended out of order, then sorted once on the next lookup
+        entry = copy.deepcopy(self.entries[0])
+        entry['startedDateTime'] = '1999-01-01T00:00:00Z'
+        self.log.entries.append(objects.HarEntry(entry))
+        self.assertEqual(started.between()[0], len(self.log.entries) - 1)
+        self.assertEqual(started.between('2000-01-01T00:00:00Z'),
+                         started.between()[1:])
+
+    def test_5_not_written(self):
+        for log in (harlib.api.loadd(self.data, trusted=True).log,
+                    objects.HarLog(self.data['log'])):
+            expected = log.dumps()
+            log.index('host').keys()
+            log.range_index('time').between()
+            self.assertEqual(log.dumps(), expected)
+            self.assertNotIn('_indexes', log.to_json())
+            self.assertNotIn('_indexes', objects.HarLog(log).to_json())
+
+    def test_6_parse_ns(self):
+        for s, ns in [
+                ('2017-07-31T20:28:29.123456789Z', 1501532909123456789),
+                ('2017-07-31T20:28:29.1234567891Z', 1501532909123456789),
+                ('2017-07-31T22:28:29.5+02:00', 1501532909500000000),
+                ('2017-07-31T15:58:29-04:30', 1501532909000000000),
+                ('2017-07-31T20:28:29,25z', 1501532909250000000),
+                ('2017-07-31T20:28Z', 1501532880000000000),
+                ('1969-12-31T23:59:59.999999999Z', -1)]:
+            self.assertEqual(parse_iso_datetime_ns(s), ns)
+            self.assertEqual(parse_iso_datetime_us(s), ns // 1000)
+        for s in ('2017-07-31T20:28:29.Z', '2017-07-32T20:28:29Z',
+                  '2017-07-31T20:28:2xZ', '2017-07-31T20:28:29+2:00'):
+            self.assertEqual(parse_iso_datetime_ns(s), None)
+
+    def test_7_time_index(self):
+        index = self.log.time_index()
+        self.assertIs(index, self.log.range_index('startedDateTime'))
+        started = sorted((parse_iso_datetime_ns(e['startedDateTime']), pos)
+                         for pos, e in enumerate(self.entries))
+        middle, _ = started[len(started) // 2]
+        self.assertEqual(index.before(middle),
+                         [pos for ns, pos in started if ns < middle])
+        self.assertEqual(index.before(middle, inclusive=True),
+                         [pos for ns, pos in started if ns <= middle])
+        self.assertEqual(index.after(middle),
+                         [pos for ns, pos in started if ns > middle])
+        self.assertEqual(index.after(middle, inclusive=True),
+                         [pos for ns, pos in started if ns >= middle])
+        self.assertEqual(index.nearest(middle + 1), started[
+            [ns for ns, _ in started].index(middle)][1])
+        self.assertEqual(index.nearest('1970-01-01T00:00:00Z'),
+                         started[0][1])
+        self.assertEqual(index.nearest('2100-01-01T00:00:00Z'),
+                         started[-1][1])
+        self.assertEqual(objects.HarLog().time_index().nearest(0), None)
+
+        # appends in order and out of order
+        log = objects.HarLog()
+        index = log.time_index()
+        rng = random.Random(0)
+        times = [rng.randint(0, 10 ** 6) * 10 ** 6 for _ in range(300)]
+        times[100:200] = sorted(times[100:200])
+        for ns in times[:100]:
+            log.entries.append(self.entry_at(ns))
+            index.update()
+        for ns in times[100:200]:
+            log.entries.append(self.entry_at(ns))
+        index.update()
+        for ns in times[200:]:
+            log.entries.append(self.entry_at(ns))
+            if ns % 3 == 0:
+                index.update()
+        self.assertEqual(index.between(), [
+            pos for _, pos in sorted((ns, pos)
+                                     for pos, ns in enumerate(times))])
+
+        # at the same distance, the first in the log
+        for times, first in (([6, 2, 2], 0), ([2, 6, 6], 0), ([6, 2], 0),
+                             ([2, 6], 0), ([6, 6, 2], 0), ([6, 3], 1)):
+            log = objects.HarLog()
+            for seconds in times:
+                log.entries.append(self.entry_at(seconds * 10 ** 9))
+            self.assertEqual(log.time_index().nearest(4 * 10 ** 9), first)
+
+    def entry_at(self, ns):
+        entry = copy.deepcopy(self.entries[0])
+        entry['startedDateTime'] = datetime.datetime.utcfromtimestamp(
+            ns // 10 ** 9).isoformat() + '.%09dZ' % (ns % 10 ** 9)
+        return entry
+
+
+if __name__ == '__main__':
+    unittest.main()
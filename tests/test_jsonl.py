@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import HarEntry
+from harlib.jsonl import har_to_jsonl, jsonl_to_har, iter_jsonl_lines
+from harlib.sessions import HarSessionMixin
+from harlib.streaming import HarStreamWriter
+import harlib.api
+import json
+import os
+import shutil
+import six
+import tempfile
+
+
+class JsonlTests(TestUtils):
+
+    def setUp(self):
+        with open('tests/data/firefox.har') as reader:
+            self.text = reader.read()
+        self.data = json.loads(self.text)
+
+    def test_1_round_trip(self):
+        lines = six.StringIO()
+        count = har_to_jsonl(six.StringIO(self.text), lines)
+        self.assertEqual(count, len(self.data['log']['entries']))
+        self.assertEqual(len(lines.getvalue().splitlines()), count + 1)
+
+        lines.seek(0)
+        writer = six.StringIO()
+        jsonl_to_har(lines, writer)
+        self.assertEqual(json.loads(writer.getvalue()), self.data)
+
+    def test_2_dump_and_iter(self):
+        har = harlib.api.loads(self.text)
+        writer = six.StringIO()
+        count = harlib.api.dump_jsonl(har, writer)
+        writer.seek(0)
+        entries = list(harlib.api.iter_jsonl(writer))
+        self.assertEqual(len(entries), count)
+        for entry, d in zip(entries, self.data['log']['entries']):
+            self.assertTrue(isinstance(entry, HarEntry))
+            self.assertEqual(entry.request.url, d['request']['url'])
+
+    def test_3_trailing_fields(self):
+        s = ('{"log": {"version": "1.2", "entries": [{"a": 1}], '
+             '"comment": "x"}}')
+        lines = six.StringIO()
+        har_to_jsonl(six.StringIO(s), lines)
+        lines.seek(0)
+        self.assertEqual(list(iter_jsonl_lines(lines)), [
+            {'log': {'version': '1.2'}}, {'a': 1}, {'log': {'comment': 'x'}}])
+        lines.seek(0)
+        writer = six.StringIO()
+        jsonl_to_har(lines, writer)
+        self.assertEqual(json.loads(writer.getvalue()), json.loads(s))
+
+    def test_4_stream_writer_empty(self):
+        writer = six.StringIO()
+        with HarStreamWriter(writer, {'version': '1.2'}) as stream:
+            pass
+        self.assertEqual(json.loads(writer.getvalue()),
+                         {'log': {'version': '1.2', 'entries': []}})
+        with self.assertRaises(ValueError):
+            stream.write_entry({})
+
+    def test_5_session_appends(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tempdir, 'session.jsonl')
+            session = HarSessionMixin(filename)
+            session.output_format = 'jsonl'
+            entries = [HarEntry(d) for d in self.data['log']['entries']]
+            session._append_jsonl(entries[:1])
+            session._append_jsonl(entries[1:])
+            with open(filename) as reader:
+                lines = list(iter_jsonl_lines(reader))
+            self.assertIn('log', lines[0])
+            self.assertEqual(len(lines), len(entries) + 1)
+            self.assertEqual(lines[-1]['request']['url'],
+                             entries[-1].request.url)
+        finally:
+            shutil.rmtree(tempdir)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib import jsonlib
+import json
+
+
+class JsonlibTests(TestUtils):
+
+    samples = [
+        {'a': [], 'b': {}, 'c': [1, {'d': None}], 'e': True},
+        {'text': u'caf\xe9 \x7f / \n\t\x01', 'size': 12},
+        {'small': 0.00001, 'large': 1e16, 'plain': 85.75000055134296},
+        {'nan': float('nan'), 'inf': float('inf')},
+        {'big': 2 ** 70, 1: 'int key'},
+        [u' ', -0.0, 0.1, 100.0],
+    ]
+
+    kwargs = [
+        {},
+        {'indent': 2},
+        {'separators': (',', ':')},
+        {'indent': 2, 'sort_keys': True, 'default': str},
+        {'indent': 2, 'ensure_ascii': False},
+    ]
+
+    def test_1_dumps_identical(self):
+        for name, backend in jsonlib.available_backends().items():
+            for obj in self.samples:
+                for kwargs in self.kwargs:
+                    if 1 in obj and kwargs.get('sort_keys'):
+                        continue
+                    expected = json.dumps(obj, **kwargs)
+                    s = backend.dumps(obj, **kwargs)
+                    if s is not None:
+                        self.assertEqual(s, expected, (name, obj, kwargs))
+
+    def test_2_loads_identical(self):
+        s = json.dumps(self.samples[:3] + self.samples[5:])
+        for name, backend in jsonlib.available_backends().items():
+            self.assertEqual(backend.loads(s), json.loads(s), name)
+        s = '[NaN, 1e400, 123456789012345678901234567890]'
+        for name, backend in jsonlib.available_backends().items():
+            self.assertEqual(repr(backend.loads(s)), repr(json.loads(s)),
+                             name)
+
+    def test_3_set_backend(self):
+        previous = jsonlib.get_backend()
+        try:
+            self.assertEqual(jsonlib.set_backend('json').name, 'json')
+            self.assertEqual(jsonlib.dumps({'a': 1}), '{"a": 1}')
+            with self.assertRaises(ValueError):
+                jsonlib.set_backend('nosuchjson')
+        finally:
+            jsonlib._backend = previous
+
+    def test_4_ordered(self):
+        d = jsonlib.loads('{"b": 1, "a": 2, "c": 3}', ordered=True)
+        self.assertEqual(list(d.keys()), ['b', 'a', 'c'])
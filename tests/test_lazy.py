@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import HarFile, HarEntry, HarLazyList
+import harlib.api
+import json
+
+
+class LazyTests(TestUtils):
+
+    def setUp(self):
+        with open('tests/data/chrome.har') as reader:
+            self.data = json.load(reader)
+        self.raw_entries = self.data['log']['entries']
+
+    def test_1_lazy_len(self):
+        har_file = harlib.api.loadd(self.data, lazy=True)
+        entries = har_file.log.entries
+        self.assertTrue(isinstance(entries, HarLazyList))
+        self.assertEqual(len(entries), len(self.raw_entries))
+        self.assertFalse(any(entries.is_built(i) for i in range(len(entries))))
+
+    def test_2_lazy_getitem(self):
+        entries = HarFile(self.data, lazy=True).log.entries
+        entry = entries[3]
+        self.assertTrue(isinstance(entry, HarEntry))
+        self.assertTrue(entries[3] is entry)
+        self.assertTrue(entries[-1] is entries[len(entries) - 1])
+        self.assertEqual(entry.request.url, self.raw_entries[3]['request']['url'])
+        self.assertEqual(sum(entries.is_built(i)
+                             for i in range(len(entries))), 2)
+
+    def test_3_lazy_slice(self):
+        entries = HarFile(self.data, lazy=True).log.entries
+        first = entries[2]
+        part = entries[2:5]
+        self.assertTrue(isinstance(part, HarLazyList))
+        self.assertEqual(len(part), 3)
+        self.assertTrue(part[0] is first)
+        self.assertTrue(part[1] is entries[3])
+
+    def test_4_lazy_to_json(self):
+        har_file = HarFile(self.data, lazy=True)
+        entries = har_file.log.entries
+        entries[0].comment = 'changed'
+        d = har_file.to_json()
+        self.assertEqual(len(d['log']['entries']), len(self.raw_entries))
+        self.assertEqual(d['log']['entries'][0]['comment'], 'changed')
+        self.assertTrue(d['log']['entries'][1] is self.raw_entries[1])
+        self.assertFalse(entries.is_built(1))
+
+    def test_5_lazy_append(self):
+        entries = HarFile(self.data, lazy=True).log.entries
+        entries.append(self.raw_entries[0])
+        self.assertEqual(len(entries), len(self.raw_entries) + 1)
+        self.assertTrue(isinstance(entries[-1], HarEntry))
+        del entries[0]
+        self.assertEqual(len(entries), len(self.raw_entries))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import HarFile, HarLog
+import harlib.api
+import json
+import os
+import shutil
+import tempfile
+
+PATHS = ['tests/data/chrome.har', 'tests/data/test.har']
+
+
+class LoadManyTests(TestUtils):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.bad = os.path.join(self.tmpdir, 'bad.har')
+        with open(self.bad, 'w') as writer:
+            writer.write('{"log": [')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_1_load_many(self):
+        errors = {}
+        hars = harlib.api.load_many(PATHS + [self.bad], workers=2,
+                                    errors=errors)
+        self.assertEqual(len(hars), 3)
+        self.assertEqual(hars[2], None)
+        self.assertEqual(list(errors), [self.bad])
+        for har, path in zip(hars, PATHS):
+            self.assertTrue(isinstance(har, HarFile))
+            with open(path) as reader:
+                data = json.load(reader)
+            self.assertEqual(len(har.log.entries),
+                             len(data['log']['entries']))
+
+    def test_2_merge(self):
+        log = harlib.api.load_many(reversed(PATHS), workers=1, merge=True)
+        self.assertTrue(isinstance(log, HarLog))
+        times = [entry.startedDateTime for entry in log.entries]
+        self.assertEqual(times, sorted(times))
+        self.assertEqual(len(times), sum(
+            len(har.log.entries) for har in harlib.api.load_many(PATHS)))
+
+    def test_3_merge_offsets(self):
+        # 22:00+02:00 is before 21:00Z, though not as strings
+        with open(PATHS[0]) as reader:
+            data = json.load(reader)
+        paths = []
+        for started in ('2017-07-31T21:00:00Z', '2017-07-31T22:00:00+02:00'):
+            data['log']['entries'] = [dict(data['log']['entries'][0],
+                                           startedDateTime=started)]
+            paths.append(os.path.join(self.tmpdir, '%d.har' % len(paths)))
+            with open(paths[-1], 'w') as writer:
+                json.dump(data, writer)
+        log = harlib.api.load_many(paths + [self.bad], workers=1, merge=True)
+        self.assertEqual([entry.startedDateTime for entry in log.entries],
+                         ['2017-07-31T22:00:00+02:00', '2017-07-31T21:00:00Z'])
+
+    def test_4_validated(self):
+        # as by load, unless trusted
+        with open(PATHS[0]) as reader:
+            data = json.load(reader)
+        del data['log']['entries'][0]['request']['method']
+        invalid = os.path.join(self.tmpdir, 'invalid.har')
+        with open(invalid, 'w') as writer:
+            json.dump(data, writer)
+        errors = {}
+        hars = harlib.api.load_many([invalid] + PATHS[:1], workers=1,
+                                    errors=errors)
+        self.assertEqual(hars[0], None)
+        self.assertTrue(isinstance(hars[1], HarFile))
+        self.assertEqual(list(errors), [invalid])
+        self.assertRaises(ValueError, harlib.api.load_many, [invalid],
+                          workers=1, merge=True)
+        hars = harlib.api.load_many([invalid], workers=1, trusted=True)
+        self.assertTrue(isinstance(hars[0], HarFile))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import HarEntry
+from harlib.objects.metamodel import _serializer
+import harlib.api
+import json
+
+
+class SerializeTests(TestUtils):
+
+    def setUp(self):
+        with open('tests/data/chrome.har') as reader:
+            self.data = json.load(reader)
+
+    def test_1_field_order(self):
+        entry = HarEntry(self.data['log']['entries'][0])
+        d = entry.to_json()
+        names = [name for name, _ in entry.items()]
+        self.assertEqual(list(d.keys()), names)
+        ordered = [name for name in HarEntry._ordered if name in d]
+        self.assertEqual(names[:len(ordered)], ordered)
+        self.assertEqual(list(d['request'].keys()),
+                         [name for name, _ in entry.request.items()])
+
+    def test_2_plain_dicts(self):
+        har = harlib.api.loadd(self.data)
+        plain = har.to_json(dict_class=dict)
+        self.assertEqual(type(plain['log']['entries'][0]), dict)
+        self.assertEqual(json.dumps(plain), json.dumps(har.to_json()))
+        self.assertEqual(har.dumps(), json.dumps(har.to_json()))
+
+    def test_3_compiled_once(self):
+        entry = HarEntry(self.data['log']['entries'][0])
+        entry.to_json()
+        serializer = _serializer(HarEntry, entry._ordered)
+        HarEntry(self.data['log']['entries'][1]).to_json()
+        self.assertTrue(_serializer(HarEntry, entry._ordered) is serializer)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import HarEntry
+from harlib.streaming import HarStreamReader, skip_value
+import harlib.api
+import json
+import six
+
+
+class StreamingTests(TestUtils):
+
+    def setUp(self):
+        with open('tests/data/firefox.har') as reader:
+            self.text = reader.read()
+        self.data = json.loads(self.text)
+
+    def test_1_iter_entries(self):
+        entries = list(harlib.api.iter_entries(six.StringIO(self.text)))
+        self.assertEqual(len(entries), len(self.data['log']['entries']))
+        for entry, d in zip(entries, self.data['log']['entries']):
+            self.assertTrue(isinstance(entry, HarEntry))
+            self.assertEqual(entry.request.url, d['request']['url'])
+
+    def test_2_small_chunks_and_bytes(self):
+        reader = six.BytesIO(self.text.encode('utf-8'))
+        stream = HarStreamReader(reader, chunk_size=7)
+        dicts = list(stream.iter_dicts())
+        self.assertEqual(dicts, self.data['log']['entries'])
+
+    def test_3_load_header(self):
+        header = harlib.api.load_header(six.StringIO(self.text))
+        self.assertNotIn('entries', header)
+        self.assertEqual(header['creator'], self.data['log']['creator'])
+        self.assertEqual(header['pages'], self.data['log']['pages'])
+
+    def test_4_trailing_fields(self):
+        s = '{"log": {"entries": [{"a": "]}"}, 1], "pages": [], "comment": ""}}'
+        stream = HarStreamReader(six.StringIO(s), chunk_size=3)
+        self.assertEqual(stream.read_header(), {})
+        self.assertEqual(list(stream.iter_dicts()), [{"a": "]}"}, 1])
+        self.assertEqual(stream.log, {'pages': [], 'comment': ''})
+
+    def test_5_truncated(self):
+        s = '{"log": {"entries": [{"a": 1}, {"b": '
+        stream = HarStreamReader(six.StringIO(s))
+        with self.assertRaises(ValueError):
+            list(stream.iter_dicts())
+
+    def test_6_skip_value(self):
+        s = '{"a": ["\\"", {"b": null}]}, 12'
+        end = s.index('}, 12') + 1
+        self.assertEqual(skip_value(s, 0), end)
+        self.assertEqual(skip_value(s.encode('ascii'), 0), end)
+        self.assertEqual(skip_value(s[:end - 1], 0), -1)
+        self.assertEqual(skip_value(s, s.index('12')), -1)
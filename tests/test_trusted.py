@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import HarEntry, HarFile, HarHeader, HarLazyList
+import harlib.api
+import json
+
+
+class TrustedTests(TestUtils):
+
+    def setUp(self):
+        with open('tests/data/firefox.har') as reader:
+            self.text = reader.read()
+        self.data = json.loads(self.text)
+
+    def test_1_round_trip(self):
+        har = harlib.api.loads(self.text, trusted=True)
+        self.assertTrue(isinstance(har, HarFile))
+        self.assertEqual(json.loads(json.dumps(har.to_json())), self.data)
+
+    def test_2_lazy_access(self):
+        har = harlib.api.loadd(self.data, trusted=True)
+        entries = har.log.entries
+        self.assertTrue(isinstance(entries, HarLazyList))
+        self.assertFalse(entries.is_built(0))
+        entry = entries[0]
+        self.assertTrue(isinstance(entry, HarEntry))
+        self.assertTrue(isinstance(entry.request.headers[0], HarHeader))
+        self.assertEqual(entry.request.url,
+                         self.data['log']['entries'][0]['request']['url'])
+        self.assertFalse(entries.is_built(1))
+
+    def test_3_defaults(self):
+        d = self.data['log']['entries'][0]
+        d.pop('comment', None)
+        entry = HarEntry(d, trusted=True)
+        self.assertEqual(entry.comment, '')
+        self.assertNotIn('comment', entry.to_json())
+        entry.comment = 'changed'
+        self.assertEqual(entry.to_json()['comment'], 'changed')
+
+    def test_4_copy_on_delete(self):
+        d = self.data['log']['entries'][0]
+        entry = HarEntry(d, trusted=True)
+        del entry.response.content.text
+        self.assertNotIn('text', entry.to_json()['response']['content'])
+        self.assertIn('text', d['response']['content'])
+
+        entry = HarEntry(d, trusted=True)
+        entry.to_json(with_content=False)
+        self.assertIn('text', d['response']['content'])
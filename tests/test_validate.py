@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib.objects import HarHeader
+from harlib.validate import validate, validate_many
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+
+class ValidateTests(TestUtils):
+
+    def setUp(self):
+        with open('tests/data/chrome.har') as reader:
+            self.data = json.load(reader)
+
+    def test_1_valid(self):
+        self.assertEqual(validate(self.data), [])
+        self.assertEqual(validate(self.data['log']['entries'][0]), [])
+
+    def test_2_error_paths(self):
+        entries = self.data['log']['entries']
+        del entries[1]['response']['headers'][3]['value']
+        entries[2]['request']['headers'] = {}
+        entries[2]['time'] = '12'
+        entries[3]['response']['content'] = None
+        del self.data['log']['creator']
+        self.assertEqual(validate(self.data), [
+            ('log.creator', 'missing required field'),
+            ('log.entries[1].response.headers[3].value',
+             'missing required field'),
+            ('log.entries[2].request.headers', 'expected an array'),
+            ('log.entries[2].time', 'expected float, got str'),
+            ('log.entries[3].response.content', 'expected an object'),
+        ])
+
+    def test_3_har_class(self):
+        self.assertEqual(validate({'name': 'Host'}, HarHeader),
+                         [('value', 'missing required field')])
+        self.assertEqual(validate([], HarHeader),
+                         [('', 'expected an object')])
+
+    def test_4_validate_many(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            good = os.path.join(tmpdir, 'good.har.gz')
+            with gzip.open(good, 'wb') as writer:
+                writer.write(json.dumps(self.data).encode('utf-8'))
+            bad = os.path.join(tmpdir, 'bad.har')
+            with open(bad, 'w') as writer:
+                writer.write('{"log": ')
+            results = validate_many([bad, good], processes=2)
+            self.assertEqual(list(results), [bad, good])
+            self.assertEqual(results[good], [])
+            self.assertEqual(len(results[bad]), 1)
+            self.assertEqual(results[bad][0][0], '')
+        finally:
+            shutil.rmtree(tmpdir)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# harlib
+# Copyright (c) 2014-2017, Andrew Robbins, All rights reserved.
+#
+# This library ("it") is free software; it is distributed in the hope that it
+# will be useful, but WITHOUT ANY WARRANTY; you can redistribute it and/or
+# modify it under the terms of LGPLv3 <https://www.gnu.org/licenses/lgpl.html>.
+'''
+harlib - HTTP Archive (HAR) format library
+'''
+from __future__ import absolute_import
+from harlib.test_utils import TestUtils
+from harlib import objects, waterfall
+import harlib.api
+import copy
+import json
+import unittest
+
+HAR_PATH = 'tests/data/chrome.har'
+
+PAGE = {
+    'startedDateTime': '2017-07-31T20:28:29.000Z',
+    'id': 'p',
+    'title': 'Page',
+    'pageTimings': {'onContentLoad': 150, 'onLoad': -1},
+}
+
+TIMINGS = {'blocked': 1, 'dns': -1, 'connect': 20, 'ssl': 8, 'send': 2,
+           'wait': 30, 'receive': 7}
+
+
+class WaterfallTests(TestUtils):
+
+    def setUp(self):
+        with open(HAR_PATH) as reader:
+            self.data = json.load(reader)
+        self.log = harlib.api.loadd(self.data, lazy=True).log
+
+    def entry(self, **fields):
+        entry = copy.deepcopy(self.data['log']['entries'][0])
+        entry.update(startedDateTime='2017-07-31T20:28:29.100Z', time=60,
+                     timings=dict(TIMINGS), pageref='p')
+        entry.update(fields)
+        return entry
+
+    def test_1_pages_with_entries(self):
+        pages = self.log.pages_with_entries()
+        self.assertEqual([page.id for page, _ in pages], ['page_2'])
+        self.assertEqual(list(pages[0][1].positions),
+                         list(range(len(self.data['log']['entries']))))
+
+        self.log.entries.append(objects.HarEntry(self.entry()))
+        pages = self.log.pages_with_entries()
+        self.assertEqual(pages[-1][0], None)
+        self.assertEqual(list(pages[-1][1].positions),
+                         [len(self.log.entries) - 1])
+        self.assertEqual(pages[-1][1][0].pageref, 'p')
+
+    def test_2_geometry(self):
+        builder = waterfall.WaterfallBuilder([PAGE])
+        row = builder.entry_row(self.entry(), 0)
+        self.assertEqual(row['start'], 100.0)
+        self.assertEqual(row['end'], 160.0)
+        self.assertEqual(row['segments'], [
+            ['blocked', 100.0, 101.0],
+            ['connect', 101.0, 121.0],
+            ['ssl', 113.0, 121.0],
+            ['send', 121.0, 123.0],
+            ['wait', 123.0, 153.0],
+            ['receive', 153.0, 160.0],
+        ])
+        page = builder.add_page(PAGE)
+        self.assertEqual((page['onContentLoad'], page['onLoad']),
+                         (150.0, None))
+
+        # the same from model objects
+        entry = objects.HarEntry(self.entry())
+        self.assertEqual(builder.entry_row(entry, 0), row)
+
+        # entries of unknown pages start from the first of them
+        rows = list(waterfall.iter_rows(
+            self.entry(pageref='q', startedDateTime=started)
+            for started in ('2017-07-31T20:28:30Z', '2017-07-31T20:28:31Z')))
+        self.assertEqual([r['start'] for r in rows], [0.0, 1000.0])
+        self.assertEqual([r['index'] for r in rows], [0, 1])
+
+    def test_3_waterfall(self):
+        pages = self.log.waterfall()
+        self.assertFalse(self.log.entries.is_built(0))
+        self.assertEqual(len(pages), 1)
+        page = pages[0]
+        self.assertEqual(page['id'], 'page_2')
+        self.assertEqual(page['onLoad'], 286.6329997777939)
+        entries = self.data['log']['entries']
+        self.assertEqual([row['url'] for row in page['entries']],
+                         [e['request']['url'] for e in entries])
+        self.assertEqual(page['entries'][0]['start'], 0.0)
+        for row, entry in zip(page['entries'], entries):
+            self.assertAlmostEqual(row['end'] - row['start'], entry['time'])
+            for _, start, end in row['segments']:
+                self.assertTrue(row['start'] <= start <= end <= row['end'])
+
+        self.assertEqual(json.loads(json.dumps(waterfall.waterfall(HAR_PATH))),
+                         json.loads(json.dumps(pages)))
+        # built timings are whole milliseconds, see HarTimings
+        built = waterfall.waterfall(harlib.api.loadd(self.data))
+        self.assertEqual([row['start'] for row in built[0]['entries']],
+                         [row['start'] for row in page['entries']])
+
+    def test_4_pages_kept(self):
+        # HarLog(dict) keeps the pages, so they are in to_json round trips
+        # (it used to drop them, as it still drops other log fields)
+        har_file = objects.HarFile(self.data)
+        self.assertEqual(har_file.to_json()['log']['pages'],
+                         self.data['log']['pages'])
+        self.assertEqual(objects.HarLog(har_file.log).to_json()['pages'],
+                         self.data['log']['pages'])
+        data = dict(self.data['log'], pages=[])
+        self.assertNotIn('pages', objects.HarLog(data).to_json())
+
+
+if __name__ == '__main__':
+    unittest.main()